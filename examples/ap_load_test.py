@@ -0,0 +1,261 @@
+"""
+Pico Access Point Load Test
+
+This script load-tests the web server of 06_access_point_web.py with many
+simultaneous clients. Besides regular clients it can open "stalled"
+clients that connect, send half a request and then hang, like a browser on
+a phone that went out of range. The server should keep answering the
+regular clients and drop the stalled ones after its request timeout.
+
+Run it from a computer connected to the Pico's access point, or against
+the server running on the computer itself (see the access point docs).
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src' / 'pico_scripts' / 'lib'))
+
+from http_client import HTTPClient  # noqa: E402
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# The LED page is about 5 KB
+RESPONSE_BUFFER_SIZE = 16384
+
+
+def _quantile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def regular_client(host, port, path, requests_count, keep_alive, results):
+    """
+    Send requests one after the other and record each latency and status.
+
+    Args:
+        host (str): Server host
+        port (int): Server port
+        path (str): Request path
+        requests_count (int): Number of requests
+        keep_alive (bool): Reuse the connection between requests
+        results (dict): Shared result lists and counters
+    """
+    client = HTTPClient(host, port, timeout=10, buffer_size=RESPONSE_BUFFER_SIZE)
+    try:
+        for _ in range(requests_count):
+            started = time.perf_counter()
+            try:
+                status, _ = await client.get(path)
+            except OSError as error:
+                results['errors'][type(error).__name__] = (
+                    results['errors'].get(type(error).__name__, 0) + 1
+                )
+                await client.close()
+                continue
+            results['latencies'].append((time.perf_counter() - started) * 1000)
+            results['statuses'][status] = results['statuses'].get(status, 0) + 1
+            if not keep_alive:
+                await client.close()
+    finally:
+        results['connections'] += client.connect_count
+        await client.close()
+
+
+async def stalled_client(host, port, results):
+    """
+    Connect, send half a request and wait until the server gives up.
+
+    Args:
+        host (str): Server host
+        port (int): Server port
+        results (dict): Shared result lists and counters
+    """
+    started = time.perf_counter()
+    try:
+        reader, writer = await asyncio.open_connection(host, port)
+    except OSError:
+        results['stalled_refused'] += 1
+        return
+
+    writer.write(b'GET / HTTP/1.1\r\nHost: ')
+    await writer.drain()
+    try:
+        await asyncio.wait_for(reader.read(), 60)
+        results['stalled_dropped_after'].append(time.perf_counter() - started)
+    except asyncio.TimeoutError:
+        results['stalled_kept'] += 1
+    finally:
+        writer.close()
+
+
+async def run_load_test(url, clients, requests_count, stalled, keep_alive):
+    """
+    Run regular and stalled clients at the same time.
+
+    Returns:
+        dict: Load test report
+    """
+    parts = urlsplit(url)
+    host, port = parts.hostname, parts.port or 80
+    path = parts.path or '/'
+
+    results = {
+        'latencies': [],
+        'statuses': {},
+        'errors': {},
+        'connections': 0,
+        'stalled_refused': 0,
+        'stalled_kept': 0,
+        'stalled_dropped_after': [],
+    }
+
+    # Stalled clients connect first so they hold their slots
+    stalled_tasks = [asyncio.create_task(stalled_client(host, port, results))
+                     for _ in range(stalled)]
+    await asyncio.sleep(0.2)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        regular_client(host, port, path, requests_count, keep_alive, results)
+        for _ in range(clients)
+    ))
+    duration = time.perf_counter() - started
+    await asyncio.gather(*stalled_tasks)
+
+    latencies = results['latencies']
+    dropped = results['stalled_dropped_after']
+    return {
+        'url': url,
+        'clients': clients,
+        'stalled_clients': stalled,
+        'keep_alive': keep_alive,
+        'requests': clients * requests_count,
+        'responses': len(latencies),
+        'duration_seconds': duration,
+        'throughput_rps': len(latencies) / duration if duration else 0.0,
+        'latency_ms': {
+            'p50': _quantile(latencies, 0.5),
+            'p90': _quantile(latencies, 0.9),
+            'max': max(latencies),
+            'mean': statistics.fmean(latencies),
+        } if latencies else None,
+        'statuses': {str(code): count for code, count in sorted(results['statuses'].items())},
+        'errors': results['errors'],
+        'connections_opened': results['connections'],
+        'stalled_dropped': len(dropped),
+        'stalled_dropped_after_seconds': max(dropped) if dropped else None,
+        'stalled_kept': results['stalled_kept'],
+        'stalled_refused': results['stalled_refused'],
+    }
+
+
+def print_report(report):
+    """
+    Print a run_load_test() report.
+
+    Args:
+        report (dict): Result of run_load_test()
+    """
+    print("=" * 60)
+    print(f"Load test: {report['url']}")
+    print("=" * 60)
+    print(f"Clients: {report['clients']} regular, {report['stalled_clients']} stalled "
+          f"(keep-alive {'on' if report['keep_alive'] else 'off'})")
+    print(f"Responses: {report['responses']}/{report['requests']} "
+          f"in {report['duration_seconds']:.2f}s ({report['throughput_rps']:.1f} req/s)")
+    latency = report['latency_ms']
+    if latency:
+        print(f"Latency: p50 {latency['p50']:.1f}ms | p90 {latency['p90']:.1f}ms | "
+              f"max {latency['max']:.1f}ms")
+    statuses = ', '.join(f"{code}: {count}" for code, count in report['statuses'].items())
+    print(f"Status codes: {statuses or '-'}")
+    for kind, count in report['errors'].items():
+        print(f"  {kind}: {count}")
+    print(f"Connections opened: {report['connections_opened']}")
+    if report['stalled_clients']:
+        after = report['stalled_dropped_after_seconds']
+        print(f"Stalled clients dropped by server: {report['stalled_dropped']}"
+              + (f" (after {after:.1f}s)" if after is not None else ""))
+    print("=" * 60)
+
+
+def main():
+    """
+    Main entry point for the load test.
+    """
+    parser = argparse.ArgumentParser(
+        description='Load-test the Pico access point web server',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+Examples:
+  # 4 clients with 25 requests each against the Pico
+  %(prog)s --url http://192.168.4.1/ --clients 4 --requests 25
+
+  # Same, while 2 stalled clients hang on to their connections
+  %(prog)s --url http://192.168.4.1/ --clients 4 --stalled 2
+
+  # A new connection for every request
+  %(prog)s --url http://192.168.4.1/ --no-keep-alive
+        '''
+    )
+
+    parser.add_argument(
+        '--url',
+        default='http://192.168.4.1/',
+        help='URL to request (default: http://192.168.4.1/)'
+    )
+    parser.add_argument(
+        '--clients',
+        type=int,
+        default=4,
+        help='Simultaneous regular clients (default: 4)'
+    )
+    parser.add_argument(
+        '--requests',
+        type=int,
+        default=25,
+        help='Requests per regular client (default: 25)'
+    )
+    parser.add_argument(
+        '--stalled',
+        type=int,
+        default=0,
+        help='Clients that send half a request and hang (default: 0)'
+    )
+    parser.add_argument(
+        '--no-keep-alive',
+        action='store_true',
+        help='Open a new connection for every request'
+    )
+    parser.add_argument(
+        '--json',
+        action='store_true',
+        help='Print the report as JSON'
+    )
+
+    args = parser.parse_args()
+
+    report = asyncio.run(run_load_test(args.url, args.clients, args.requests,
+                                       args.stalled, not args.no_keep_alive))
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == '__main__':
+    main()
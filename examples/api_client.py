@@ -6,10 +6,25 @@ Shows different API endpoints and how to process the responses.
 """
 
 import argparse
+import asyncio
+import csv
+import gzip
+import json
 import logging
+import queue
+import random
+import statistics
 import sys
+import threading
 import time
+from collections import deque
+from dataclasses import dataclass, fields, replace
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlsplit
+
 import requests
+from requests.adapters import HTTPAdapter
 
 # Configure logging
 logging.basicConfig(
@@ -18,97 +33,1169 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Latencies kept per instance by monitor_many(), the most recent ones
+MONITOR_MANY_LATENCY_SAMPLES = 1000
+
+
+class _Response:
+    """Base class for typed API responses."""
+
+    __slots__ = ()
+
+    @classmethod
+    def from_json(cls, data):
+        """
+        Build a response object from decoded JSON.
+
+        Args:
+            data (dict): Decoded JSON body; unknown keys are ignored
+
+        Returns:
+            _Response: Typed response object
+        """
+        return cls(**{field.name: data[field.name] for field in fields(cls)})
+
+
+@dataclass(frozen=True, slots=True)
+class NumberInfo(_Response):
+    """Response of ``GET /api/number``."""
+
+    number: int
+    timestamp: str
+    unix_timestamp: float
+    next_change_in: float
+    cycle_position: int
+    total_cycles: int
+
+
+@dataclass(frozen=True, slots=True)
+class SequenceInfo(_Response):
+    """Response of ``GET /api/sequence``."""
+
+    sequence: list
+    length: int
+    interval_seconds: float
+    description: str
+
+
+@dataclass(frozen=True, slots=True)
+class StatusInfo(_Response):
+    """Response of ``GET /api/status``."""
+
+    status: str
+    uptime_seconds: float
+    current_number: int
+    api_version: str
+    service: str
+
+
+@dataclass(slots=True)
+class _CacheEntry:
+    """One cached API response."""
+
+    value: _Response
+    fetched_at: float
+    expires_at: float
+    etag: Optional[str] = None
+
+
+class _PendingLoad:
+    """A fetch in progress that other threads can wait for."""
+
+    __slots__ = ('done', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.error = None
+
+
+class ResponseCache:
+    """
+    Thread-safe cache of API responses, keyed by URL.
+
+    One instance can be shared by several clients and threads. When an
+    entry is missing or expired, only one thread fetches it; the others wait
+    for that result instead of sending their own identical request. If the
+    fetch fails, they all get its exception, so an outage costs one set of
+    retries, not one per waiting thread.
+    """
+
+    def __init__(self):
+        """Create an empty cache."""
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._loading = {}
+
+    def clear(self):
+        """Drop all cached responses."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_or_load(self, key, load):
+        """
+        Return the cached entry for key, loading it if it has expired.
+
+        Args:
+            key (str): Cache key, usually the request URL
+            load (callable): Called with the expired entry (or None) and
+                returns a new _CacheEntry
+
+        Returns:
+            _CacheEntry: A fresh entry
+
+        Raises:
+            Exception: Whatever load raised, in this thread or in the thread
+                whose fetch this one waited for
+        """
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and time.monotonic() < entry.expires_at:
+                    return entry
+                pending = self._loading.get(key)
+                loading = pending is None
+                if loading:
+                    pending = self._loading[key] = _PendingLoad()
+
+            if not loading:
+                # Another thread is fetching; share its result or its error
+                pending.done.wait()
+                if pending.error is not None:
+                    raise pending.error
+                continue
+
+            try:
+                entry = load(entry)
+                with self._lock:
+                    self._entries[key] = entry
+                return entry
+            except Exception as error:
+                pending.error = error
+                raise
+            finally:
+                with self._lock:
+                    del self._loading[key]
+                pending.done.set()
+
+
+class RunningStats:
+    """Count, mean, standard deviation and maximum of a stream in constant memory."""
+
+    __slots__ = ('count', 'mean', 'max', '_m2')
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.max = float('-inf')
+        self._m2 = 0.0
+
+    def add(self, value):
+        """
+        Add one value (Welford's algorithm).
+
+        Args:
+            value (float): New value
+        """
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if value > self.max:
+            self.max = value
+
+    @property
+    def stdev(self):
+        """Population standard deviation of the values so far."""
+        return (self._m2 / self.count) ** 0.5 if self.count else 0.0
+
 
 class NumberTransmitterClient:
     """Client for interacting with the Number Transmitter API."""
 
-    def __init__(self, base_url='http://localhost:5001'):
+    def __init__(self, base_url='http://localhost:5001', pool_size=10,
+                 retries=3, backoff=0.1, timeout=5, cache=None,
+                 sequence_ttl=60):
         """
         Initialize the API client.
 
+        All requests share one keep-alive session, so repeated calls reuse
+        the same TCP connection instead of opening a new one each time.
+
+        ``/api/number`` answers are cached until the number changes, so
+        repeated calls within one second are answered locally.
+        ``/api/sequence`` is cached for ``sequence_ttl`` seconds and then
+        revalidated with its ETag.
+
         Args:
             base_url (str): Base URL of the API server
+            pool_size (int): Maximum number of pooled connections
+            retries (int): Retries after a connection error or timeout
+            backoff (float): Base delay in seconds for exponential backoff
+            timeout (float): Default per-call timeout in seconds
+            cache (ResponseCache): Cache to share with other clients; a
+                private one is created if None, and False disables caching
+            sequence_ttl (float): Seconds before the sequence is revalidated
         """
         self.base_url = base_url.rstrip('/')
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.cache = ResponseCache() if cache is None else cache
+        self.sequence_ttl = sequence_ttl
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
         logger.info(f"API Client initialized for {self.base_url}")
 
-    def get_current_number(self):
+    def close(self):
+        """Close all pooled connections."""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _request(self, path, timeout=None, headers=None):
+        """
+        Send a GET request, retrying on connection errors and timeouts.
+
+        Args:
+            path (str): Endpoint path, e.g. ``/api/number``
+            timeout (float): Timeout for this call, defaults to ``self.timeout``
+            headers (dict): Extra request headers
+
+        Returns:
+            requests.Response: Successful (2xx or 304) response
+
+        Raises:
+            requests.RequestException: If the request still fails after all retries
+        """
+        timeout = self.timeout if timeout is None else timeout
+        url = f"{self.base_url}{path}"
+
+        for attempt in range(self.retries + 1):
+            try:
+                response = self.session.get(url, timeout=timeout, headers=headers)
+                response.raise_for_status()
+                return response
+            except (requests.ConnectionError, requests.Timeout) as error:
+                if attempt == self.retries:
+                    raise
+                # Full jitter keeps many clients from retrying in lockstep
+                delay = random.uniform(0, self.backoff * 2 ** attempt)
+                logger.debug(f"GET {path} failed ({error}), retrying in {delay:.3f}s")
+                time.sleep(delay)
+
+    def _get(self, path, timeout=None):
+        """
+        Send a GET request and decode the JSON answer.
+
+        Args:
+            path (str): Endpoint path, e.g. ``/api/number``
+            timeout (float): Timeout for this call, defaults to ``self.timeout``
+
+        Returns:
+            dict: Decoded JSON response
+
+        Raises:
+            requests.RequestException: If the request still fails after all retries
+        """
+        return self._request(path, timeout).json()
+
+    def _load_number(self, timeout):
+        """Fetch /api/number into a cache entry that expires at the next change."""
+        sent = time.monotonic()
+        info = NumberInfo.from_json(self._get('/api/number', timeout))
+        # The server answered somewhere between sending and now; assuming
+        # the earliest moment means the entry never outlives its number
+        return _CacheEntry(info, sent, sent + info.next_change_in)
+
+    def _load_sequence(self, stale, timeout):
+        """Fetch or revalidate /api/sequence into a cache entry."""
+        headers = None
+        if stale is not None and stale.etag:
+            headers = {'If-None-Match': stale.etag}
+
+        response = self._request('/api/sequence', timeout, headers)
+        now = time.monotonic()
+        if response.status_code == 304:
+            return _CacheEntry(stale.value, now, now + self.sequence_ttl, stale.etag)
+
+        info = SequenceInfo.from_json(response.json())
+        return _CacheEntry(info, now, now + self.sequence_ttl,
+                           response.headers.get('ETag'))
+
+    def get_current_number(self, timeout=None):
         """
         Get the current transmitted number.
 
+        Until the number changes, repeated calls are answered from the cache,
+        with ``next_change_in`` counted down locally.
+
+        Args:
+            timeout (float): Timeout for this call, defaults to the client timeout
+
         Returns:
-            dict: API response with current number and metadata
+            NumberInfo: Current number and metadata
 
         Raises:
             requests.RequestException: If the API request fails
         """
         try:
-            response = requests.get(f"{self.base_url}/api/number", timeout=5)
-            response.raise_for_status()
-            return response.json()
+            if self.cache is False:
+                return self._load_number(timeout).value
+
+            entry = self.cache.get_or_load(
+                f"{self.base_url}/api/number",
+                lambda stale: self._load_number(timeout)
+            )
+            age = time.monotonic() - entry.fetched_at
+            if age <= 0:
+                return entry.value
+            remaining = max(0.0, entry.value.next_change_in - age)
+            return replace(entry.value, next_change_in=round(remaining, 6))
         except requests.RequestException as error:
             logger.error(f"Failed to get current number: {error}")
             raise
 
-    def get_sequence_info(self):
+    def get_sequence_info(self, timeout=None):
         """
         Get information about the number sequence.
 
+        Args:
+            timeout (float): Timeout for this call, defaults to the client timeout
+
         Returns:
-            dict: API response with sequence configuration
+            SequenceInfo: Sequence configuration
 
         Raises:
             requests.RequestException: If the API request fails
         """
         try:
-            response = requests.get(f"{self.base_url}/api/sequence", timeout=5)
-            response.raise_for_status()
-            return response.json()
+            if self.cache is False:
+                return self._load_sequence(None, timeout).value
+
+            entry = self.cache.get_or_load(
+                f"{self.base_url}/api/sequence",
+                lambda stale: self._load_sequence(stale, timeout)
+            )
+            return entry.value
         except requests.RequestException as error:
             logger.error(f"Failed to get sequence info: {error}")
             raise
 
-    def get_status(self):
+    def get_status(self, timeout=None):
         """
         Get API status and uptime.
 
+        Args:
+            timeout (float): Timeout for this call, defaults to the client timeout
+
         Returns:
-            dict: API response with status information
+            StatusInfo: Status information
 
         Raises:
             requests.RequestException: If the API request fails
         """
         try:
-            response = requests.get(f"{self.base_url}/api/status", timeout=5)
-            response.raise_for_status()
-            return response.json()
+            return StatusInfo.from_json(self._get('/api/status', timeout))
         except requests.RequestException as error:
             logger.error(f"Failed to get status: {error}")
             raise
 
-    def monitor(self, duration=10, interval=1):
+    def monitor(self, duration=10, interval=None, margin=0.05, recorder=None):
         """
         Monitor the number transmitter for a specified duration.
 
+        By default every request is timed from the previous answer's
+        ``next_change_in`` so that it reaches the server just after the next
+        number change. That observes every tick with one request per tick.
+        Continuity of ``total_cycles``/``number`` shows missed or duplicated
+        ticks, and a summary is printed at the end.
+
         Args:
             duration (int): How long to monitor in seconds
-            interval (float): How often to check in seconds
+            interval (float): Fixed check interval in seconds, or None to
+                align each check to the next number change
+            margin (float): How long after a number change a request should
+                reach the server, in seconds
+            recorder (CaptureWriter): Optional writer that every sample is
+                streamed to
+
+        Returns:
+            dict: Summary of the run (see print_monitor_summary())
         """
-        logger.info(f"Monitoring for {duration} seconds (checking every {interval}s)")
-        start_time = time.time()
+        if interval is None:
+            logger.info(f"Monitoring for {duration} seconds (aligned to number changes)")
+        else:
+            logger.info(f"Monitoring for {duration} seconds (checking every {interval}s)")
+
+        summary = {
+            'requests': 0, 'errors': 0, 'ticks': 0,
+            'missed': 0, 'duplicates': 0, 'restarts': 0,
+            'lateness': RunningStats(), 'rtts': RunningStats(),
+        }
+        start_time = time.monotonic()
 
         try:
-            while time.time() - start_time < duration:
-                data = self.get_current_number()
-                print(f"Number: {data['number']} | "
-                      f"Cycle: {data['total_cycles']} | "
-                      f"Next change in: {data['next_change_in']:.2f}s")
-                time.sleep(interval)
+            sequence = self.get_sequence_info()
+            summary['requests'] += 1
+            tick_seconds = sequence.interval_seconds
+            last_tick = None
+
+            while time.monotonic() - start_time < duration:
+                sent_at = time.time()
+                sent = time.monotonic()
+                try:
+                    # Always ask the server; a cached answer would hide gaps
+                    data = self._load_number(None).value
+                except requests.RequestException as error:
+                    logger.error(f"Failed to get current number: {error}")
+                    summary['errors'] += 1
+                    time.sleep(tick_seconds if interval is None else interval)
+                    continue
+                rtt = time.monotonic() - sent
+                summary['requests'] += 1
+                summary['rtts'].add(rtt)
+                if recorder is not None:
+                    recorder.write(sent_at, sent_at + rtt, data.unix_timestamp,
+                                   data.number, data.total_cycles,
+                                   data.next_change_in, rtt)
+
+                # Position of this number in the server's whole sequence
+                tick = data.total_cycles * sequence.length + data.number - 1
+                # How long after the number change the server answered
+                lateness = tick_seconds - data.next_change_in
+
+                note = ""
+                step = 1 if last_tick is None else tick - last_tick
+                if step == 0:
+                    summary['duplicates'] += 1
+                    note = " | duplicate"
+                elif step < 0:
+                    summary['restarts'] += 1
+                    note = " | server restarted"
+                elif step > 1:
+                    summary['missed'] += step - 1
+                    note = f" | missed {step - 1}"
+                if step != 0:
+                    summary['ticks'] += 1
+                    # The first sample lands at an arbitrary point in the tick
+                    if last_tick is not None:
+                        summary['lateness'].add(lateness)
+                last_tick = tick
+
+                print(f"Number: {data.number} | "
+                      f"Cycle: {data.total_cycles} | "
+                      f"Next change in: {data.next_change_in:.2f}s | "
+                      f"RTT: {rtt * 1000:.1f}ms{note}")
+
+                if interval is None:
+                    # Send the next request so that it arrives `margin`
+                    # after the next change. The server answered about half
+                    # an RTT after `sent`, and the next request needs about
+                    # half an RTT to reach it, so measuring from the send
+                    # time needs no RTT correction.
+                    wake_at = sent + data.next_change_in + margin
+                    time.sleep(max(0.0, wake_at - time.monotonic()))
+                else:
+                    time.sleep(interval)
         except KeyboardInterrupt:
             logger.info("Monitoring stopped by user")
         except Exception as error:
             logger.error(f"Monitoring error: {error}")
 
+        print_monitor_summary(summary)
+        return summary
+
+
+def print_monitor_summary(summary):
+    """
+    Print the end-of-run summary of NumberTransmitterClient.monitor().
+
+    Args:
+        summary (dict): Counters ``requests``, ``errors``, ``ticks``, ``missed``,
+            ``duplicates``, ``restarts`` and RunningStats ``lateness`` and
+            ``rtts`` in seconds
+    """
+    print("\n" + "=" * 50)
+    print("Monitoring Summary")
+    print("=" * 50)
+    print(f"Requests: {summary['requests']} ({summary['errors']} failed)")
+    print(f"Ticks observed: {summary['ticks']}")
+    print(f"Missed ticks: {summary['missed']}")
+    print(f"Duplicate samples: {summary['duplicates']}")
+    if summary['restarts']:
+        print(f"Server restarts: {summary['restarts']}")
+
+    lateness = summary['lateness']
+    if lateness.count:
+        print(f"Sample delay after change: mean {lateness.mean * 1000:.1f}ms, "
+              f"max {lateness.max * 1000:.1f}ms, jitter {lateness.stdev * 1000:.1f}ms")
+    rtts = summary['rtts']
+    if rtts.count:
+        print(f"RTT: mean {rtts.mean * 1000:.1f}ms, max {rtts.max * 1000:.1f}ms")
+    print("=" * 50)
+
+
+class CaptureWriter:
+    """
+    Stream monitor samples to NDJSON or CSV files from a background thread.
+
+    The format follows the file name (``.csv`` or anything else for NDJSON),
+    and ``.gz`` enables gzip compression. With ``max_bytes`` or
+    ``max_seconds`` set, the capture is split into timestamped segment files
+    next to ``path``. Samples are handed over through a bounded queue, so
+    writing never blocks the sampling loop and memory use stays constant.
+
+    The first file is opened before the constructor returns, so a bad path
+    raises at once. If the writer thread fails later, write() and close()
+    raise its exception.
+    """
+
+    FIELDS = ('sent_at', 'received_at', 'server_time', 'number', 'total_cycles',
+              'next_change_in', 'rtt')
+
+    def __init__(self, path, max_bytes=None, max_seconds=None, compress=None,
+                 flush_interval=5, queue_size=10000):
+        """
+        Open the capture and start the writer thread.
+
+        Args:
+            path (str): Capture file, e.g. ``soak.ndjson`` or ``soak.csv.gz``
+            max_bytes (int): Start a new segment after this many uncompressed bytes
+            max_seconds (float): Start a new segment after this many seconds
+            compress (bool): Force gzip on or off; by default follows ``.gz``
+            flush_interval (float): Seconds between flushes to disk
+            queue_size (int): Samples that may wait for the writer thread
+
+        Raises:
+            OSError: If the first capture file cannot be opened
+        """
+        path = Path(path)
+        if compress is None:
+            compress = path.suffix == '.gz'
+        if compress and path.suffix != '.gz':
+            path = path.with_name(path.name + '.gz')
+
+        self.path = path
+        self.compress = compress
+        self.format = 'csv' if path.name.removesuffix('.gz').endswith('.csv') else 'ndjson'
+        self.max_bytes = max_bytes
+        self.max_seconds = max_seconds
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self.segment = None  # Path of the current segment
+        self.segment_count = 0
+
+        self._queue = queue.Queue(queue_size)
+        self._error = None
+        self._file = self._open_segment()
+        self._thread = threading.Thread(target=self._run, name='capture-writer', daemon=True)
+        self._thread.start()
+
+    def write(self, *record):
+        """
+        Queue one sample without blocking.
+
+        Args:
+            *record: Values in the order of FIELDS
+
+        Raises:
+            Exception: Whatever stopped the writer thread
+        """
+        if self._error is not None:
+            raise self._error
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self):
+        """
+        Write all queued samples and close the current segment.
+
+        Raises:
+            Exception: Whatever stopped the writer thread
+        """
+        # A writer thread that has died no longer empties the queue
+        while self._thread.is_alive():
+            try:
+                self._queue.put(None, timeout=0.1)
+                break
+            except queue.Full:
+                pass
+        self._thread.join()
+        if self.dropped:
+            logger.warning(f"Capture dropped {self.dropped} samples (writer too slow)")
+        if self._error is not None:
+            raise self._error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _segment_path(self):
+        """Return the file name for a new segment."""
+        if self.max_bytes is None and self.max_seconds is None:
+            return self.path
+
+        stem, dot, extension = self.path.name.partition('.')
+        stamp = time.strftime('%Y%m%dT%H%M%S')
+        candidate = self.path.with_name(f"{stem}-{stamp}{dot}{extension}")
+        counter = 1
+        # Segments rotated within the same second, or left by an earlier run
+        while candidate.exists():
+            candidate = self.path.with_name(f"{stem}-{stamp}-{counter}{dot}{extension}")
+            counter += 1
+        return candidate
+
+    def _open_segment(self):
+        """Open the next segment file and write the CSV header if needed."""
+        path = self._segment_path()
+        if self.compress:
+            handle = gzip.open(path, 'wt', encoding='utf-8', newline='')
+        else:
+            handle = open(path, 'w', encoding='utf-8', newline='', buffering=1 << 16)
+
+        writer = csv.writer(handle) if self.format == 'csv' else None
+        if writer is not None:
+            writer.writerow(self.FIELDS)
+        self.segment = path
+        self.segment_count += 1
+        logger.info(f"Recording samples to {path}")
+        return handle, writer
+
+    def _run(self):
+        """Writer thread: format queued samples and rotate segments."""
+        handle, writer = self._file
+        opened_at = last_flush = time.monotonic()
+        written = 0
+
+        try:
+            while True:
+                try:
+                    record = self._queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    record = ()
+                if record is None:
+                    break
+
+                now = time.monotonic()
+                if record:
+                    rotate = (
+                        (self.max_bytes is not None and written >= self.max_bytes)
+                        or (self.max_seconds is not None and now - opened_at >= self.max_seconds)
+                    )
+                    if rotate:
+                        handle.close()
+                        handle, writer = self._file = self._open_segment()
+                        opened_at = last_flush = now
+                        written = 0
+
+                    if writer is not None:
+                        written += writer.writerow(record)
+                    else:
+                        written += handle.write(json.dumps(
+                            dict(zip(self.FIELDS, record)), separators=(',', ':')
+                        ) + '\n')
+
+                if now - last_flush >= self.flush_interval:
+                    handle.flush()
+                    last_flush = now
+        except Exception as error:
+            logger.error(f"Capture writer stopped: {error!r}")
+            self._error = error
+        finally:
+            self._file[0].close()
+
+
+class APIError(Exception):
+    """Raised when the API answers with an HTTP error status."""
+
+
+class AsyncNumberTransmitterClient:
+    """
+    Asyncio client for the Number Transmitter API.
+
+    Offers the same calls as NumberTransmitterClient as coroutines. Requests
+    are sent over a small pool of keep-alive connections built on asyncio
+    streams, and at most ``pool_size`` requests are in flight at once.
+    """
+
+    def __init__(self, base_url='http://localhost:5001', pool_size=10,
+                 retries=3, backoff=0.1, timeout=5):
+        """
+        Initialize the async API client.
+
+        Args:
+            base_url (str): Base URL of the API server
+            pool_size (int): Maximum number of concurrent requests and connections
+            retries (int): Retries after a connection error or timeout
+            backoff (float): Base delay in seconds for exponential backoff
+            timeout (float): Default per-call timeout in seconds
+        """
+        self.base_url = base_url.rstrip('/')
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+
+        url = urlsplit(self.base_url)
+        self._host = url.hostname
+        self._port = url.port or (443 if url.scheme == 'https' else 80)
+        self._ssl = url.scheme == 'https'
+        self._netloc = url.netloc
+        self._prefix = url.path.rstrip('/')
+
+        self._slots = asyncio.Semaphore(pool_size)
+        self._idle = []
+
+    async def close(self):
+        """Close all idle pooled connections."""
+        idle, self._idle = self._idle, []
+        for _, writer in idle:
+            writer.close()
+        for _, writer in idle:
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def _request(self, path):
+        """
+        Send one GET request on a pooled connection.
+
+        A reused connection that fails before the status line arrives was
+        most likely closed by the server while it was idle; the request is
+        then sent once more on a fresh connection.
+
+        Args:
+            path (str): Endpoint path, e.g. ``/api/number``
+
+        Returns:
+            tuple: (status code, body bytes)
+        """
+        request = (
+            f"GET {self._prefix}{path} HTTP/1.1\r\n"
+            f"Host: {self._netloc}\r\n"
+            f"Accept: application/json\r\n\r\n".encode('latin-1')
+        )
+
+        if self._idle:
+            reader, writer = self._idle.pop()
+            try:
+                status_line = await self._send(reader, writer, request)
+            except ConnectionError as error:
+                logger.debug(f"Reused connection failed ({error!r}), reconnecting")
+            else:
+                return await self._finish(reader, writer, status_line)
+
+        reader, writer = await asyncio.open_connection(
+            self._host, self._port, ssl=self._ssl
+        )
+        status_line = await self._send(reader, writer, request)
+        return await self._finish(reader, writer, status_line)
+
+    @staticmethod
+    async def _send(reader, writer, request):
+        """
+        Send a request and wait for the status line of the response.
+
+        The connection is closed if this fails.
+
+        Returns:
+            bytes: Status line
+
+        Raises:
+            ConnectionError: If the connection was closed or reset
+        """
+        try:
+            writer.write(request)
+            await writer.drain()
+            status_line = await reader.readline()
+            if not status_line:
+                raise ConnectionError("Connection closed by server")
+        except BaseException:
+            writer.close()
+            raise
+        return status_line
+
+    async def _finish(self, reader, writer, status_line):
+        """
+        Read the rest of a response and return the connection to the pool.
+
+        Returns:
+            tuple: (status code, body bytes)
+        """
+        try:
+            status, body, keep_alive = await self._read_response(reader, status_line)
+        except BaseException:
+            writer.close()
+            raise
+
+        if keep_alive:
+            self._idle.append((reader, writer))
+        else:
+            writer.close()
+        return status, body
+
+    @staticmethod
+    async def _read_response(reader, status_line):
+        """
+        Read the headers and body of an HTTP/1.x response.
+
+        Args:
+            reader (asyncio.StreamReader): Connection to read from
+            status_line (bytes): Status line that was already read
+
+        Returns:
+            tuple: (status code, body bytes, whether the connection can be reused)
+
+        Raises:
+            ValueError: If the status line is malformed
+        """
+        version, status = status_line.decode('latin-1').split(None, 2)[:2]
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip().lower()
+
+        keep_alive = version == 'HTTP/1.1' and headers.get('connection') != 'close'
+
+        if headers.get('transfer-encoding') == 'chunked':
+            body = bytearray()
+            while True:
+                size = int((await reader.readline()).split(b';')[0], 16)
+                if size == 0:
+                    # Skip optional trailers up to the final empty line
+                    while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                        pass
+                    break
+                body += await reader.readexactly(size)
+                await reader.readexactly(2)
+        elif 'content-length' in headers:
+            body = await reader.readexactly(int(headers['content-length']))
+        else:
+            body = await reader.read()
+            keep_alive = False
+
+        return int(status), bytes(body), keep_alive
+
+    async def _get(self, path, timeout=None):
+        """
+        Send a GET request, retrying on connection errors and timeouts.
+
+        Args:
+            path (str): Endpoint path, e.g. ``/api/number``
+            timeout (float): Timeout for this call, defaults to ``self.timeout``
+
+        Returns:
+            dict: Decoded JSON response
+
+        Raises:
+            OSError: If the connection still fails after all retries
+            TimeoutError: If the request still times out after all retries
+            APIError: If the API answers with an error status
+        """
+        timeout = self.timeout if timeout is None else timeout
+
+        for attempt in range(self.retries + 1):
+            try:
+                async with self._slots:
+                    async with asyncio.timeout(timeout):
+                        status, body = await self._request(path)
+                break
+            except (OSError, TimeoutError, asyncio.IncompleteReadError) as error:
+                if attempt == self.retries:
+                    raise
+                # Full jitter keeps many clients from retrying in lockstep
+                delay = random.uniform(0, self.backoff * 2 ** attempt)
+                logger.debug(f"GET {path} failed ({error!r}), retrying in {delay:.3f}s")
+                await asyncio.sleep(delay)
+
+        if status >= 400:
+            raise APIError(f"HTTP {status} for {self.base_url}{path}")
+        return json.loads(body)
+
+    async def get_current_number(self, timeout=None):
+        """
+        Get the current transmitted number.
+
+        Args:
+            timeout (float): Timeout for this call, defaults to the client timeout
+
+        Returns:
+            NumberInfo: Current number and metadata
+        """
+        return NumberInfo.from_json(await self._get('/api/number', timeout))
+
+    async def get_sequence_info(self, timeout=None):
+        """
+        Get information about the number sequence.
+
+        Args:
+            timeout (float): Timeout for this call, defaults to the client timeout
+
+        Returns:
+            SequenceInfo: Sequence configuration
+        """
+        return SequenceInfo.from_json(await self._get('/api/sequence', timeout))
+
+    async def get_status(self, timeout=None):
+        """
+        Get API status and uptime.
+
+        Args:
+            timeout (float): Timeout for this call, defaults to the client timeout
+
+        Returns:
+            StatusInfo: Status information
+        """
+        return StatusInfo.from_json(await self._get('/api/status', timeout))
+
+    @classmethod
+    async def monitor_many(cls, urls, duration=10, interval=1, concurrency=100,
+                           timeout=5):
+        """
+        Monitor many transmitter instances concurrently from one thread.
+
+        Every instance is polled on its own schedule, so a slow or dead
+        instance only delays its own samples. Any error of an instance,
+        including an answer that is not valid API JSON, is counted for that
+        instance only.
+
+        Args:
+            urls (list): Base URLs of the instances to monitor
+            duration (float): How long to monitor in seconds
+            interval (float): How often to check each instance in seconds
+            concurrency (int): Maximum number of requests in flight overall
+            timeout (float): Per-request timeout in seconds
+
+        Returns:
+            dict: Per-URL statistics with ``samples``, ``errors``,
+            ``last_number``, ``last_error`` and ``latencies`` (seconds,
+            the most recent MONITOR_MANY_LATENCY_SAMPLES)
+        """
+        limiter = asyncio.Semaphore(concurrency)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + duration
+        results = {}
+
+        async def follow(url):
+            stats = results[url] = {
+                'samples': 0, 'errors': 0, 'last_number': None,
+                'last_error': None,
+                'latencies': deque(maxlen=MONITOR_MANY_LATENCY_SAMPLES),
+            }
+            async with cls(url, pool_size=1, retries=0, timeout=timeout) as client:
+                # Spread the first requests over one interval
+                next_at = loop.time() + random.uniform(0, interval)
+                while next_at < deadline:
+                    await asyncio.sleep(max(0.0, next_at - loop.time()))
+                    started = loop.time()
+                    try:
+                        async with limiter:
+                            info = await client.get_current_number()
+                    except Exception as error:
+                        # Also malformed answers: JSONDecodeError, KeyError,
+                        # ValueError
+                        stats['errors'] += 1
+                        stats['last_error'] = repr(error)
+                        logger.debug(f"{url}: {error!r}")
+                    else:
+                        stats['samples'] += 1
+                        stats['last_number'] = info.number
+                        stats['latencies'].append(loop.time() - started)
+                    # A slow answer skips missed samples instead of piling up
+                    next_at = max(next_at + interval, loop.time())
+
+        await asyncio.gather(*(follow(url) for url in dict.fromkeys(urls)))
+        return results
+
+
+def print_fleet_report(results):
+    """
+    Print a per-instance summary of a monitor_many() run.
+
+    Args:
+        results (dict): Result of AsyncNumberTransmitterClient.monitor_many()
+    """
+    print(f"{'URL':<40} {'OK':>6} {'ERR':>5} {'NUM':>4} {'P50 ms':>8} {'MAX ms':>8}")
+    for url, stats in results.items():
+        latencies = stats['latencies']
+        p50 = f"{statistics.median(latencies) * 1000:.1f}" if latencies else '-'
+        worst = f"{max(latencies) * 1000:.1f}" if latencies else '-'
+        number = stats['last_number'] if stats['last_number'] is not None else '-'
+        print(f"{url:<40} {stats['samples']:>6} {stats['errors']:>5} "
+              f"{number:>4} {p50:>8} {worst:>8}")
+
+
+BENCH_ENDPOINTS = {
+    'number': '/api/number',
+    'sequence': '/api/sequence',
+    'status': '/api/status',
+    'health': '/health',
+}
+
+
+def run_benchmark(client, endpoint='number', workers=4, duration=10, total=None):
+    """
+    Load-test one endpoint with concurrent workers.
+
+    Every worker thread sends requests back to back through the client's
+    pooled session. Requests are not retried, so every failure is counted.
+
+    Args:
+        client (NumberTransmitterClient): Client whose session is used
+        endpoint (str): Key of BENCH_ENDPOINTS to request
+        workers (int): Number of concurrent worker threads
+        duration (float): How long to run in seconds, if total is not given
+        total (int): Stop after this many requests instead of after duration
+
+    Returns:
+        dict: Benchmark report (see print_benchmark_report())
+    """
+    url = f"{client.base_url}{BENCH_ENDPOINTS[endpoint]}"
+    pools = client.session.get_adapter(url).poolmanager.pools
+
+    def connections_opened():
+        return sum(pools[key].num_connections for key in pools.keys())
+
+    connections_before = connections_opened()
+
+    latencies = []
+    errors = {}
+    lock = threading.Lock()
+    remaining = [total]
+    reconnected = [0]
+    stop = threading.Event()
+
+    def worker():
+        local_latencies = []
+        local_errors = {}
+        reconnects = 0
+        closed = False
+        while not stop.is_set():
+            if total is not None:
+                with lock:
+                    if remaining[0] == 0:
+                        break
+                    remaining[0] -= 1
+
+            # urllib3 reopens a closed connection in place, so count that here
+            if closed:
+                reconnects += 1
+
+            started = time.perf_counter()
+            try:
+                response = client.session.get(url, timeout=client.timeout)
+                # Read the whole body, so the latency covers it and the
+                # connection goes back to the pool
+                _ = response.content
+                kind = f"HTTP {response.status_code}" if response.status_code >= 400 else None
+                closed = (response.headers.get('Connection', '').lower() == 'close'
+                          or response.raw.version == 10)
+            except requests.RequestException as error:
+                kind = type(error).__name__
+                closed = False
+            local_latencies.append(time.perf_counter() - started)
+            if kind:
+                local_errors[kind] = local_errors.get(kind, 0) + 1
+
+        with lock:
+            reconnected[0] += reconnects
+            latencies.extend(local_latencies)
+            for kind, count in local_errors.items():
+                errors[kind] = errors.get(kind, 0) + count
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(workers)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    try:
+        if total is None:
+            stop.wait(duration)
+            stop.set()
+        for thread in threads:
+            thread.join()
+    except KeyboardInterrupt:
+        stop.set()
+        for thread in threads:
+            thread.join()
+    elapsed = time.perf_counter() - started
+
+    count = len(latencies)
+    failed = sum(errors.values())
+    connections = connections_opened() - connections_before + reconnected[0]
+    report = {
+        'url': url,
+        'workers': workers,
+        'requests': count,
+        'duration_seconds': round(elapsed, 3),
+        'throughput_rps': round(count / elapsed, 1) if elapsed else 0.0,
+        'errors': failed,
+        'error_rate': round(failed / count, 4) if count else 0.0,
+        'errors_by_kind': errors,
+        'connections_opened': connections,
+        'connection_reuse': round(1 - connections / count, 4) if count else 0.0,
+        'latency_ms': {},
+    }
+    if count >= 2:
+        cuts = statistics.quantiles(latencies, n=100, method='inclusive')
+        report['latency_ms'] = {
+            'p50': round(cuts[49] * 1000, 3),
+            'p90': round(cuts[89] * 1000, 3),
+            'p99': round(cuts[98] * 1000, 3),
+            'max': round(max(latencies) * 1000, 3),
+        }
+    return report
+
+
+def print_benchmark_report(report, as_json=False):
+    """
+    Print a run_benchmark() report as text or JSON.
+
+    Args:
+        report (dict): Result of run_benchmark()
+        as_json (bool): Print JSON instead of text
+    """
+    if as_json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print("=" * 50)
+    print(f"Benchmark: {report['url']}")
+    print("=" * 50)
+    print(f"Workers: {report['workers']}")
+    print(f"Requests: {report['requests']} in {report['duration_seconds']:.2f}s")
+    print(f"Throughput: {report['throughput_rps']:.1f} req/s")
+    latency = report['latency_ms']
+    if latency:
+        print(f"Latency: p50 {latency['p50']:.2f}ms | p90 {latency['p90']:.2f}ms | "
+              f"p99 {latency['p99']:.2f}ms | max {latency['max']:.2f}ms")
+    print(f"Errors: {report['errors']} ({report['error_rate'] * 100:.2f}%)")
+    for kind, count in report['errors_by_kind'].items():
+        print(f"  {kind}: {count}")
+    print(f"Connections opened: {report['connections_opened']} "
+          f"(reuse {report['connection_reuse'] * 100:.1f}%)")
+    print("=" * 50)
+
 
 def main():
     """
@@ -128,6 +1215,15 @@ Examples:
   # Monitor for 30 seconds
   %(prog)s --monitor --duration 30
 
+  # Record a day-long soak test in hourly compressed segments
+  %(prog)s --monitor --duration 86400 --record soak.ndjson.gz --rotate-interval 3600
+
+  # Monitor several instances at once
+  %(prog)s --monitor-many http://10.0.0.5:5001 http://10.0.0.6:5001
+
+  # Load-test /api/number with 8 workers for 20 seconds
+  %(prog)s --bench --workers 8 --duration 20
+
   # Use custom API URL
   %(prog)s --url http://192.168.1.100:5001 --current
         '''
@@ -158,6 +1254,67 @@ Examples:
         action='store_true',
         help='Monitor number changes continuously'
     )
+    parser.add_argument(
+        '--record',
+        metavar='FILE',
+        help='Stream --monitor samples to FILE (.ndjson or .csv, add .gz to compress)'
+    )
+    parser.add_argument(
+        '--rotate-size',
+        type=float,
+        metavar='MB',
+        help='Start a new --record segment after MB megabytes'
+    )
+    parser.add_argument(
+        '--rotate-interval',
+        type=float,
+        metavar='SECONDS',
+        help='Start a new --record segment after SECONDS seconds'
+    )
+    parser.add_argument(
+        '--gzip',
+        action='store_true',
+        help='Compress --record output with gzip'
+    )
+    parser.add_argument(
+        '--monitor-many',
+        nargs='+',
+        metavar='URL',
+        help='Monitor several API instances concurrently'
+    )
+    parser.add_argument(
+        '--bench',
+        action='store_true',
+        help='Load-test an endpoint and report latency and throughput'
+    )
+    parser.add_argument(
+        '--endpoint',
+        choices=sorted(BENCH_ENDPOINTS),
+        default='number',
+        help='Endpoint to load-test with --bench (default: number)'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=4,
+        help='Concurrent workers for --bench (default: 4)'
+    )
+    parser.add_argument(
+        '--requests',
+        type=int,
+        help='Stop --bench after this many requests instead of --duration'
+    )
+    parser.add_argument(
+        '--json',
+        action='store_true',
+        help='Print the --bench report as JSON'
+    )
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=100,
+        help='Maximum requests in flight with --monitor-many (default: 100)'
+    )
     parser.add_argument(
         '--duration',
         type=int,
@@ -167,8 +1324,27 @@ Examples:
     parser.add_argument(
         '--interval',
         type=float,
-        default=1.0,
-        help='Monitoring check interval in seconds (default: 1.0)'
+        default=None,
+        help='Monitoring check interval in seconds '
+             '(default: align to every number change)'
+    )
+    parser.add_argument(
+        '--timeout',
+        type=float,
+        default=5.0,
+        help='Per-request timeout in seconds (default: 5.0)'
+    )
+    parser.add_argument(
+        '--retries',
+        type=int,
+        default=3,
+        help='Retries after connection errors (default: 3)'
+    )
+    parser.add_argument(
+        '--pool-size',
+        type=int,
+        help='Maximum number of pooled connections '
+             '(default: 10, or --workers with --bench)'
     )
     parser.add_argument(
         '-v', '--verbose',
@@ -182,33 +1358,78 @@ Examples:
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
 
+    # --monitor-many only talks to the instances given on the command line
+    if args.monitor_many:
+        try:
+            results = asyncio.run(AsyncNumberTransmitterClient.monitor_many(
+                args.monitor_many,
+                duration=args.duration,
+                interval=args.interval or 1.0,
+                concurrency=args.concurrency,
+                timeout=args.timeout
+            ))
+        except Exception as error:
+            logger.error(f"Error: {error}")
+            sys.exit(1)
+        print_fleet_report(results)
+        return
+
     # Create client
-    client = NumberTransmitterClient(base_url=args.url)
+    pool_size = args.pool_size or (args.workers if args.bench else 10)
+    client = NumberTransmitterClient(
+        base_url=args.url,
+        pool_size=pool_size,
+        retries=args.retries,
+        timeout=args.timeout
+    )
 
     try:
         # Execute requested action
         if args.current:
             data = client.get_current_number()
-            print(f"Current Number: {data['number']}")
-            print(f"Timestamp: {data['timestamp']}")
-            print(f"Total Cycles: {data['total_cycles']}")
+            print(f"Current Number: {data.number}")
+            print(f"Timestamp: {data.timestamp}")
+            print(f"Total Cycles: {data.total_cycles}")
 
         elif args.status:
             data = client.get_status()
-            print(f"Status: {data['status']}")
-            print(f"Uptime: {data['uptime_seconds']:.2f} seconds")
-            print(f"Current Number: {data['current_number']}")
-            print(f"API Version: {data['api_version']}")
+            print(f"Status: {data.status}")
+            print(f"Uptime: {data.uptime_seconds:.2f} seconds")
+            print(f"Current Number: {data.current_number}")
+            print(f"API Version: {data.api_version}")
 
         elif args.sequence:
             data = client.get_sequence_info()
-            print(f"Sequence: {data['sequence']}")
-            print(f"Length: {data['length']}")
-            print(f"Interval: {data['interval_seconds']} second(s)")
-            print(f"Description: {data['description']}")
+            print(f"Sequence: {data.sequence}")
+            print(f"Length: {data.length}")
+            print(f"Interval: {data.interval_seconds} second(s)")
+            print(f"Description: {data.description}")
 
         elif args.monitor:
-            client.monitor(duration=args.duration, interval=args.interval)
+            recorder = None
+            if args.record:
+                recorder = CaptureWriter(
+                    args.record,
+                    max_bytes=int(args.rotate_size * 1e6) if args.rotate_size else None,
+                    max_seconds=args.rotate_interval,
+                    compress=True if args.gzip else None
+                )
+            try:
+                client.monitor(duration=args.duration, interval=args.interval,
+                               recorder=recorder)
+            finally:
+                if recorder is not None:
+                    recorder.close()
+
+        elif args.bench:
+            report = run_benchmark(
+                client,
+                endpoint=args.endpoint,
+                workers=args.workers,
+                duration=args.duration,
+                total=args.requests
+            )
+            print_benchmark_report(report, as_json=args.json)
 
         else:
             parser.print_help()
@@ -218,6 +1439,9 @@ Examples:
         logger.error(f"Error: {error}")
         sys.exit(1)
 
+    finally:
+        client.close()
+
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,366 @@
+"""
+Pico Build: Precompile the Shared Modules to .mpy
+
+MicroPython compiles every imported .py file on the device, at import
+time. Parsing and compiling need much more RAM than the finished bytecode,
+so importing the larger modules costs boot time and a temporary RAM peak
+that can end in a MemoryError before the script even starts.
+
+This script compiles the shared modules in src/pico_scripts/lib to
+MicroPython bytecode (.mpy) with mpy-cross and writes a deploy manifest.
+It can copy the result to a Pico with mpremote, and measure on the Pico
+how long importing the modules takes and how much RAM it allocates, once
+from the .py sources and once from the .mpy files.
+
+The example scripts themselves stay source files: the script that runs at
+boot has to be main.py.
+
+Requirements:
+- mpy-cross of the same MicroPython version as the Pico's firmware
+  (pip install mpy-cross==1.24.1 or similar, or `uv sync --extra pico`)
+- mpremote for --deploy and --compare (pip install mpremote)
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+LIB_DIR = Path(__file__).resolve().parent.parent / 'src' / 'pico_scripts' / 'lib'
+DEFAULT_OUT_DIR = Path(__file__).resolve().parent.parent / 'build' / 'pico'
+
+# Folder on the Pico that is on sys.path
+DEVICE_LIB_DIR = '/lib'
+
+# Run on the Pico after a soft reset, once per module. The garbage collector
+# is off during the import, so `allocated` includes everything the import
+# needed, also what is garbage afterwards.
+MEASURE_SNIPPET = '''
+import gc, time
+gc.collect()
+gc.disable()
+free = gc.mem_free()
+start = time.ticks_us()
+import {module}
+elapsed = time.ticks_diff(time.ticks_us(), start)
+allocated = free - gc.mem_free()
+gc.enable()
+gc.collect()
+print('MEASURE', elapsed, allocated, free - gc.mem_free())
+'''
+
+
+def find_mpy_cross():
+    """
+    Find mpy-cross: the pip package or an executable on PATH.
+
+    Returns:
+        list: Command to run mpy-cross, or None if it is not installed
+    """
+    try:
+        import mpy_cross  # noqa: F401
+        return [sys.executable, '-m', 'mpy_cross']
+    except ImportError:
+        pass
+    executable = shutil.which('mpy-cross')
+    return [executable] if executable else None
+
+
+def find_mpremote():
+    """
+    Returns:
+        list: Command to run mpremote, or None if it is not installed
+    """
+    executable = shutil.which('mpremote')
+    if executable:
+        return [executable]
+    try:
+        import mpremote  # noqa: F401
+        return [sys.executable, '-m', 'mpremote']
+    except ImportError:
+        return None
+
+
+def build(mpy_cross, out_dir, optimize=0):
+    """
+    Compile all modules in LIB_DIR.
+
+    Args:
+        mpy_cross (list): mpy-cross command
+        out_dir (Path): Output folder
+        optimize (int): mpy-cross optimization level (-O); 1 and above drop
+            assert statements
+
+    Returns:
+        list: One dict per module with source, output, sizes and sha256
+
+    Raises:
+        subprocess.CalledProcessError: If a module does not compile
+    """
+    lib_out = out_dir / 'lib'
+    lib_out.mkdir(parents=True, exist_ok=True)
+
+    entries = []
+    for source in sorted(LIB_DIR.glob('*.py')):
+        output = lib_out / (source.stem + '.mpy')
+        subprocess.run(
+            mpy_cross + [f'-O{optimize}', '-s', source.name, '-o', str(output), str(source)],
+            check=True,
+        )
+        data = output.read_bytes()
+        entries.append({
+            'module': source.stem,
+            'source': str(source),
+            'output': str(output),
+            'target': f'{DEVICE_LIB_DIR}/{output.name}',
+            'source_bytes': source.stat().st_size,
+            'mpy_bytes': len(data),
+            'sha256': hashlib.sha256(data).hexdigest(),
+        })
+    return entries
+
+
+def mpy_cross_version(mpy_cross):
+    result = subprocess.run(mpy_cross + ['--version'], capture_output=True, text=True)
+    return result.stdout.strip()
+
+
+def write_manifest(entries, out_dir, version):
+    """
+    Write manifest.json next to the build output.
+
+    Args:
+        entries (list): Result of build()
+        out_dir (Path): Output folder
+        version (str): mpy-cross version line
+
+    Returns:
+        Path: Manifest file
+    """
+    manifest = {
+        'mpy_cross': version,
+        'device_lib_dir': DEVICE_LIB_DIR,
+        'files': [
+            {
+                'module': entry['module'],
+                'file': Path(entry['output']).relative_to(out_dir).as_posix(),
+                'target': entry['target'],
+                'bytes': entry['mpy_bytes'],
+                'sha256': entry['sha256'],
+            }
+            for entry in entries
+        ],
+    }
+    path = out_dir / 'manifest.json'
+    path.write_text(json.dumps(manifest, indent=2) + '\n')
+    return path
+
+
+def _mpremote(mpremote, device, *args, check=True):
+    command = list(mpremote)
+    if device:
+        command += ['connect', device]
+    result = subprocess.run(command + list(args), capture_output=True, text=True)
+    if check and result.returncode != 0:
+        raise RuntimeError(f"mpremote {' '.join(args)} failed: {result.stderr.strip()}")
+    return result
+
+
+def deploy(mpremote, device, entries, compiled=True):
+    """
+    Copy the modules to the Pico's /lib folder.
+
+    MicroPython imports a .py file in preference to an .mpy file of the
+    same name, so the other variant is removed from the Pico.
+
+    Args:
+        mpremote (list): mpremote command
+        device (str): mpremote device name, or None for the first Pico found
+        entries (list): Result of build()
+        compiled (bool): Copy the .mpy files, or the .py sources if False
+    """
+    _mpremote(mpremote, device, 'fs', 'mkdir', f':{DEVICE_LIB_DIR}', check=False)
+    for entry in entries:
+        name = f"{DEVICE_LIB_DIR}/{entry['module']}"
+        stale, local, target = (
+            (f'{name}.py', entry['output'], f'{name}.mpy') if compiled
+            else (f'{name}.mpy', entry['source'], f'{name}.py')
+        )
+        _mpremote(mpremote, device, 'fs', 'rm', f':{stale}', check=False)
+        _mpremote(mpremote, device, 'fs', 'cp', local, f':{target}')
+        logger.info(f"Copied {Path(local).name} to {target}")
+
+
+def measure(mpremote, device, entries):
+    """
+    Import each module on the Pico after a soft reset and measure it.
+
+    Returns:
+        dict: Module -> {'import_ms', 'allocated_bytes', 'resident_bytes'}
+    """
+    results = {}
+    for entry in entries:
+        snippet = MEASURE_SNIPPET.format(module=entry['module'])
+        output = _mpremote(mpremote, device, 'soft-reset', 'exec', snippet).stdout
+        for line in output.splitlines():
+            if line.startswith('MEASURE'):
+                _, elapsed, allocated, resident = line.split()
+                results[entry['module']] = {
+                    'import_ms': int(elapsed) / 1000,
+                    'allocated_bytes': int(allocated),
+                    'resident_bytes': int(resident),
+                }
+                break
+        else:
+            raise RuntimeError(f"Measuring {entry['module']} failed: {output.strip()}")
+    return results
+
+
+def print_report(entries, manifest_path, comparison=None):
+    """
+    Print the build result and, if measured, the before/after comparison.
+
+    Args:
+        entries (list): Result of build()
+        manifest_path (Path): Written manifest
+        comparison (dict): {'py': measure(), 'mpy': measure()} or None
+    """
+    print("=" * 60)
+    print("Pico build")
+    print("=" * 60)
+    print(f"{'Module':<16}{'.py bytes':>12}{'.mpy bytes':>12}")
+    for entry in entries:
+        print(f"{entry['module']:<16}{entry['source_bytes']:>12}{entry['mpy_bytes']:>12}")
+    print(f"{'Total':<16}{sum(e['source_bytes'] for e in entries):>12}"
+          f"{sum(e['mpy_bytes'] for e in entries):>12}")
+    print(f"Manifest: {manifest_path}")
+
+    if comparison:
+        before, after = comparison['py'], comparison['mpy']
+        print("\nImport on the Pico (.py -> .mpy)")
+        print(f"{'Module':<16}{'time ms':>18}{'RAM peak B':>20}{'resident B':>18}")
+        for entry in entries:
+            module = entry['module']
+            b, a = before[module], after[module]
+            print(f"{module:<16}"
+                  f"{b['import_ms']:>8.1f} -> {a['import_ms']:>6.1f}"
+                  f"{b['allocated_bytes']:>10} -> {a['allocated_bytes']:>6}"
+                  f"{b['resident_bytes']:>8} -> {a['resident_bytes']:>6}")
+        total = {
+            variant: {key: sum(m[key] for m in results.values())
+                      for key in ('import_ms', 'allocated_bytes')}
+            for variant, results in comparison.items()
+        }
+        print(f"Boot imports: {total['py']['import_ms']:.1f}ms -> {total['mpy']['import_ms']:.1f}ms, "
+              f"largest RAM peak: {max(m['allocated_bytes'] for m in before.values())}B -> "
+              f"{max(m['allocated_bytes'] for m in after.values())}B")
+    print("=" * 60)
+
+
+def main():
+    """
+    Main entry point for the Pico build.
+    """
+    parser = argparse.ArgumentParser(
+        description='Compile the shared Pico modules to .mpy bytecode',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+Examples:
+  # Compile src/pico_scripts/lib into build/pico
+  %(prog)s
+
+  # Compile and copy the .mpy files to the connected Pico
+  %(prog)s --deploy
+
+  # Measure import time and RAM on the Pico with .py, then with .mpy
+  %(prog)s --compare
+        '''
+    )
+
+    parser.add_argument(
+        '--out',
+        type=Path,
+        default=DEFAULT_OUT_DIR,
+        help='Output folder (default: build/pico)'
+    )
+    parser.add_argument(
+        '-O', '--optimize',
+        type=int,
+        default=0,
+        choices=range(4),
+        help='mpy-cross optimization level; 1+ drops asserts (default: 0)'
+    )
+    parser.add_argument(
+        '--deploy',
+        action='store_true',
+        help='Copy the .mpy files to the Pico with mpremote'
+    )
+    parser.add_argument(
+        '--compare',
+        action='store_true',
+        help='Measure imports on the Pico from .py and from .mpy (implies --deploy)'
+    )
+    parser.add_argument(
+        '--device',
+        help='mpremote device, e.g. /dev/ttyACM0 (default: first Pico found)'
+    )
+    parser.add_argument(
+        '--json',
+        action='store_true',
+        help='Print the results as JSON'
+    )
+
+    args = parser.parse_args()
+
+    mpy_cross = find_mpy_cross()
+    if mpy_cross is None:
+        logger.error("mpy-cross is required: pip install mpy-cross")
+        sys.exit(1)
+
+    mpremote = None
+    if args.deploy or args.compare:
+        mpremote = find_mpremote()
+        if mpremote is None:
+            logger.error("mpremote is required for --deploy and --compare: pip install mpremote")
+            sys.exit(1)
+
+    try:
+        entries = build(mpy_cross, args.out, args.optimize)
+    except subprocess.CalledProcessError as error:
+        logger.error(f"mpy-cross failed: {error}")
+        sys.exit(1)
+    manifest_path = write_manifest(entries, args.out, mpy_cross_version(mpy_cross))
+
+    comparison = None
+    try:
+        if args.compare:
+            deploy(mpremote, args.device, entries, compiled=False)
+            comparison = {'py': measure(mpremote, args.device, entries)}
+        if args.deploy or args.compare:
+            deploy(mpremote, args.device, entries)
+        if args.compare:
+            comparison['mpy'] = measure(mpremote, args.device, entries)
+    except RuntimeError as error:
+        logger.error(str(error))
+        sys.exit(1)
+
+    if args.json:
+        print(json.dumps({'modules': entries, 'manifest': str(manifest_path),
+                          'comparison': comparison}, indent=2))
+    else:
+        print_report(entries, manifest_path, comparison)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,258 @@
+"""
+Pico HTTP Client Benchmark
+
+This script compares, on the host, the two ways the Pico API consumer can
+poll the Number Transmitter API:
+
+- urequests style: resolve the address, open a new socket, send an
+  HTTP/1.0 request and parse the response into a dict, for every poll
+- keep-alive: src/pico_scripts/lib/http_client.py, which keeps one
+  connection open and reads into a preallocated buffer
+
+For each client it reports poll latency, connections opened and heap
+churn: the temporary memory allocated per poll, measured with tracemalloc.
+
+The Flask development server closes the connection after every response,
+so the keep-alive client reconnects after each poll there. Run the API
+with a server that supports keep-alive to see the full effect, e.g.:
+
+    gunicorn -k gthread --keep-alive 5 -b 0.0.0.0:5555 app:app
+"""
+
+import argparse
+import asyncio
+import asyncio.selector_events
+import json
+import logging
+import socket
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from urllib.parse import urlsplit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src' / 'pico_scripts' / 'lib'))
+
+from http_client import HTTPClient  # noqa: E402
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# CPython's event loop reads sockets into a fresh 256 KiB buffer, which would
+# hide the clients' own allocations. Read in chunks closer to the Pico's.
+READ_CHUNK_SIZE = 2048
+
+
+class PerRequestClient:
+    """
+    Client that behaves like urequests.get(): one connection per request.
+    """
+
+    def __init__(self, host, port, timeout=5):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.connect_count = 0
+
+    async def get(self, path):
+        """
+        Send a GET request over a new connection.
+
+        Returns:
+            tuple: (status, body)
+        """
+        address = socket.getaddrinfo(self.host, self.port, 0, socket.SOCK_STREAM)[0][-1]
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(address[0], address[1]), self.timeout
+        )
+        self.connect_count += 1
+
+        try:
+            writer.write(f'GET {path} HTTP/1.0\r\nHost: {self.host}\r\n\r\n'.encode())
+            await writer.drain()
+
+            status_line = await asyncio.wait_for(reader.readline(), self.timeout)
+            status = int(status_line.split()[1])
+            headers = {}
+            while True:
+                line = await asyncio.wait_for(reader.readline(), self.timeout)
+                if line in (b'\r\n', b''):
+                    break
+                name, _, value = line.decode().partition(':')
+                headers[name.strip().lower()] = value.strip()
+            body = await asyncio.wait_for(reader.read(), self.timeout)
+            return status, body
+        finally:
+            writer.close()
+            await writer.wait_closed()
+
+    async def close(self):
+        pass
+
+
+def _quantile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def run_client(client, path, requests_count, interval):
+    """
+    Poll the API with one client and measure each poll.
+
+    Args:
+        client: PerRequestClient or HTTPClient
+        path (str): API endpoint path
+        requests_count (int): Number of polls
+        interval (float): Pause between polls in seconds
+
+    Returns:
+        dict: Latency, connection and heap churn statistics
+    """
+    latencies = []
+    churn = []
+    errors = 0
+
+    tracemalloc.start()
+    try:
+        for _ in range(requests_count):
+            baseline = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            started = time.perf_counter()
+            try:
+                status, body = await client.get(path)
+                json.loads(bytes(body))['number']
+            except (OSError, ValueError, KeyError) as error:
+                errors += 1
+                logger.debug(f"Request failed: {error!r}")
+                continue
+            latencies.append((time.perf_counter() - started) * 1000)
+            churn.append(tracemalloc.get_traced_memory()[1] - baseline)
+            if interval:
+                await asyncio.sleep(interval)
+    finally:
+        tracemalloc.stop()
+        await client.close()
+
+    report = {
+        'requests': requests_count,
+        'errors': errors,
+        'connections_opened': client.connect_count,
+        'latency_ms': None,
+        'heap_churn_bytes': None,
+    }
+    if latencies:
+        report['latency_ms'] = {
+            'p50': _quantile(latencies, 0.5),
+            'p90': _quantile(latencies, 0.9),
+            'max': max(latencies),
+        }
+        report['heap_churn_bytes'] = {
+            'mean': statistics.fmean(churn),
+            'max': max(churn),
+        }
+    return report
+
+
+def print_report(url, reports):
+    """
+    Print the benchmark results side by side.
+
+    Args:
+        url (str): Benchmarked URL
+        reports (dict): Client name -> result of run_client()
+    """
+    print("=" * 60)
+    print(f"Pico client benchmark: {url}")
+    print("=" * 60)
+    print(f"{'Client':<14}{'p50 ms':>8}{'p90 ms':>8}{'max ms':>8}"
+          f"{'conns':>7}{'errors':>8}{'churn B':>9}")
+    for name, report in reports.items():
+        latency = report['latency_ms']
+        if latency is None:
+            print(f"{name:<14}{'-':>8}{'-':>8}{'-':>8}"
+                  f"{report['connections_opened']:>7}{report['errors']:>8}{'-':>9}")
+            continue
+        print(f"{name:<14}{latency['p50']:>8.2f}{latency['p90']:>8.2f}{latency['max']:>8.2f}"
+              f"{report['connections_opened']:>7}{report['errors']:>8}"
+              f"{report['heap_churn_bytes']['mean']:>9.0f}")
+    print("=" * 60)
+    print("churn B: temporary heap allocation per poll (mean)")
+
+
+async def run_benchmark(url, requests_count, interval):
+    """
+    Benchmark both clients one after the other against the same URL.
+
+    Returns:
+        dict: Client name -> result of run_client()
+    """
+    parts = urlsplit(url)
+    host, port = parts.hostname, parts.port or 80
+    path = parts.path or '/api/number'
+
+    return {
+        'per-request': await run_client(PerRequestClient(host, port), path,
+                                        requests_count, interval),
+        'keep-alive': await run_client(HTTPClient(host, port), path,
+                                       requests_count, interval),
+    }
+
+
+def main():
+    """
+    Main entry point for the benchmark.
+    """
+    parser = argparse.ArgumentParser(
+        description='Compare the Pico HTTP clients against the Number Transmitter API',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+Examples:
+  # 500 polls against the local API
+  %(prog)s --url http://localhost:5555/api/number
+
+  # Poll once per second like the Pico does
+  %(prog)s --requests 30 --interval 1
+        '''
+    )
+
+    parser.add_argument(
+        '--url',
+        default='http://localhost:5555/api/number',
+        help='API endpoint URL (default: http://localhost:5555/api/number)'
+    )
+    parser.add_argument(
+        '--requests',
+        type=int,
+        default=500,
+        help='Polls per client (default: 500)'
+    )
+    parser.add_argument(
+        '--interval',
+        type=float,
+        default=0.0,
+        help='Seconds between polls (default: 0)'
+    )
+    parser.add_argument(
+        '--json',
+        action='store_true',
+        help='Print the results as JSON'
+    )
+
+    args = parser.parse_args()
+
+    asyncio.selector_events._SelectorTransport.max_size = READ_CHUNK_SIZE
+    reports = asyncio.run(run_benchmark(args.url, args.requests, args.interval))
+
+    if args.json:
+        print(json.dumps(reports, indent=2))
+    else:
+        print_report(args.url, reports)
+
+
+if __name__ == '__main__':
+    main()
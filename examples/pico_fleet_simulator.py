@@ -0,0 +1,682 @@
+"""
+Pico Fleet Simulator
+
+This script load-tests the Number Transmitter API with thousands of virtual
+Picos running in one asyncio event loop on a computer. Each virtual Pico
+behaves like 05_api_consumer.py:
+
+- it boots, joins the WiFi and syncs its clock over one kept-alive
+  connection, using the same HTTP client and response parser as the Pico
+  (src/pico_scripts/lib)
+- it syncs every SYNC_INTERVAL seconds, halfway between two number changes,
+  and retries a failed sync after RETRY_INTERVAL
+- it advances the number itself at every predicted change, like the
+  number ticker that times the LED blinks
+- after a WiFi drop-out it rejoins with the backoff of lib/wifi.py while
+  its ticker keeps counting
+
+All Picos can boot at the same moment, and the whole fleet can be rebooted
+at given times, like a site that comes back after a power cut.
+
+The report shows the server's latency percentiles and errors, how long the
+Picos needed for their first sync, and per Pico how stale its clock got and
+whether it ever showed a wrong number. The expected schedule is measured
+from the server before the fleet boots, so the server's clock does not need
+to match this computer's.
+
+One event loop drives all Picos. If it falls behind (see "Simulator lag"
+in the report), the latencies include the simulator's own delay; use
+fewer Picos per process and run several processes instead.
+
+Example: will the API on gunicorn survive 5,000 Picos booting at once?
+
+    gunicorn -k gthread --threads 32 --keep-alive 30 -b 0.0.0.0:5001 app:app
+    python examples/pico_fleet_simulator.py --devices 5000 --duration 120
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows
+    resource = None
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src' / 'pico_scripts' / 'lib'))
+
+from http_client import HTTPClient  # noqa: E402
+from number_parser import NumberReading, parse_number_response  # noqa: E402
+# Milliseconds of time.monotonic(), which is also the event loop's clock
+from ticks import ticks_ms  # noqa: E402
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Same values as in 05_api_consumer.py
+SEQUENCE_LENGTH = 9
+TICK_MS = 1000
+SYNC_INTERVAL = 10
+RETRY_INTERVAL = 1
+REQUEST_TIMEOUT = 5
+
+# Same values as in lib/wifi.py
+MIN_BACKOFF = 1
+MAX_BACKOFF = 16
+
+# Simulated WiFi join: rejoining the remembered access point, and a
+# failed attempt (scan without a result) while the access point is down
+JOIN_SECONDS = (0.3, 1.5)
+FAILED_JOIN_SECONDS = 2.0
+
+# Requests used to measure the server's schedule before the fleet boots
+REFERENCE_PROBES = 20
+
+# Interval of the simulator lag check
+LAG_CHECK_INTERVAL = 0.1
+
+
+def _quantile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def _distribution(values):
+    if not values:
+        return None
+    return {
+        'p50': _quantile(values, 0.5),
+        'p90': _quantile(values, 0.9),
+        'p99': _quantile(values, 0.99),
+        'max': max(values),
+        'mean': statistics.fmean(values),
+    }
+
+
+class Reference:
+    """
+    The server's schedule: which tick starts when, on the event loop's clock.
+    """
+
+    def __init__(self, boundary_ms, tick, rtt_ms):
+        """
+        Args:
+            boundary_ms (float): Start of `tick` in milliseconds
+            tick (int): Position total_cycles * SEQUENCE_LENGTH + number - 1
+            rtt_ms (float): Round trip of the probe the estimate is based on
+        """
+        self.boundary_ms = boundary_ms
+        self.tick = tick
+        self.rtt_ms = rtt_ms
+
+    def nearest(self, at_ms):
+        """
+        Find the change of number closest to a moment.
+
+        Returns:
+            tuple: (tick that starts there, its start in milliseconds)
+        """
+        offset = round((at_ms - self.boundary_ms) / TICK_MS)
+        return self.tick + offset, self.boundary_ms + offset * TICK_MS
+
+
+async def measure_reference(host, port, path, probes=REFERENCE_PROBES):
+    """
+    Estimate the server's schedule from the fastest of several requests.
+
+    Returns:
+        Reference: The estimate, or None if the server did not answer
+    """
+    loop = asyncio.get_running_loop()
+    client = HTTPClient(host, port, REQUEST_TIMEOUT)
+    reading = NumberReading()
+    best = None
+    try:
+        for _ in range(probes):
+            sent_at = loop.time() * 1000
+            try:
+                status, body = await client.get(path)
+            except OSError as error:
+                logger.warning(f"Reference request failed: {error!r}")
+                await client.close()
+                continue
+            received_at = loop.time() * 1000
+            if status != 200 or not parse_number_response(body, reading):
+                continue
+            rtt = received_at - sent_at
+            if best is None or rtt < best.rtt_ms:
+                # The tick after the current one starts next_change_in after
+                # the server answered
+                tick = reading.total_cycles * SEQUENCE_LENGTH + reading.number
+                best = Reference(received_at - rtt / 2 + reading.next_change_ms, tick, rtt)
+            await asyncio.sleep(0.05)
+    finally:
+        await client.close()
+    return best
+
+
+class VirtualPico:
+    """
+    One simulated 05_api_consumer.py.
+    """
+
+    def __init__(self, index, fleet):
+        """
+        Args:
+            index (int): Device number
+            fleet (Fleet): Shared configuration and results
+        """
+        self.index = index
+        self.fleet = fleet
+        self.client = HTTPClient(fleet.host, fleet.port, REQUEST_TIMEOUT)
+        self.reading = NumberReading()
+        self.task = None
+        self._tick_handle = None
+
+        # Schedule, as in ConsumerState
+        self.tick = None
+        self.boundary_at = None
+        self.connected = False
+
+        self.booted_at = None
+        self.last_sync_at = None
+        self.ap_down_until = 0
+        self.wifi_failures = 0
+
+        # Statistics
+        self.query_count = 0
+        self.error_count = 0
+        self.ticks = 0
+        self.wrong_ticks = 0
+        self.max_staleness_ms = 0
+        self.max_boundary_error_ms = 0
+
+    def boot(self, delay):
+        """
+        Power the Pico on (again) after `delay` seconds. The schedule is lost.
+        """
+        self._stop()
+        self.tick = None
+        self.boundary_at = None
+        self.last_sync_at = None
+        self.booted_at = None
+        self.task = asyncio.create_task(self._run(delay))
+
+    def drop_wifi(self, seconds):
+        """
+        Lose the access point for `seconds`. The ticker keeps running.
+        """
+        self.ap_down_until = asyncio.get_running_loop().time() + seconds
+        if self.task is not None and self.connected:
+            self.task.cancel()
+            self.task = asyncio.create_task(self._run(0))
+
+    def _stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
+        if self._tick_handle is not None:
+            self._tick_handle.cancel()
+            self._tick_handle = None
+
+    async def shutdown(self):
+        self._stop()
+        await self.client.close()
+
+    async def _run(self, delay):
+        # The connection is gone after a reboot or a drop-out
+        self.connected = False
+        await self.client.close()
+        if delay:
+            await asyncio.sleep(delay)
+        if self.booted_at is None:
+            self.booted_at = ticks_ms()
+
+        await self._join()
+        await self._clock_sync()
+
+    async def _join(self):
+        """Join the WiFi, retrying with backoff like WiFi.reconnect_async()."""
+        loop = asyncio.get_running_loop()
+        while True:
+            if loop.time() >= self.ap_down_until:
+                await asyncio.sleep(random.uniform(*JOIN_SECONDS))
+                if loop.time() >= self.ap_down_until:
+                    break
+            else:
+                await asyncio.sleep(FAILED_JOIN_SECONDS)
+            self.wifi_failures += 1
+            self.fleet.results['wifi_failures'] += 1
+            delay = min(MAX_BACKOFF, MIN_BACKOFF * 2 ** max(0, self.wifi_failures - 1))
+            await asyncio.sleep(delay / 2 + random.random() * delay / 2)
+
+        self.wifi_failures = 0
+        self.connected = True
+
+    async def _clock_sync(self):
+        """Sync the schedule every sync interval, like clock_sync()."""
+        results = self.fleet.results
+        interval_ms = int(self.fleet.sync_interval * 1000)
+        reading = self.reading
+
+        while True:
+            sent_at = ticks_ms()
+            ok = False
+            try:
+                status, body = await self.client.get(self.fleet.path)
+                received_at = ticks_ms()
+                if status == 200 and parse_number_response(body, reading):
+                    ok = 1 <= reading.number <= SEQUENCE_LENGTH
+                results['statuses'][status] = results['statuses'].get(status, 0) + 1
+            except Exception as error:
+                received_at = ticks_ms()
+                kind = type(error).__name__
+                results['errors'][kind] = results['errors'].get(kind, 0) + 1
+
+            if ok:
+                results['latencies'].append(received_at - sent_at)
+                self.query_count += 1
+                if self.last_sync_at is None:
+                    results['first_sync'].append(received_at - self.booted_at)
+                self.last_sync_at = received_at
+                self._apply_sync(sent_at, received_at)
+
+                wake_at = self.boundary_at + interval_ms - TICK_MS // 2
+                await asyncio.sleep(max(0, wake_at - ticks_ms()) / 1000)
+                continue
+
+            self.error_count += 1
+            await asyncio.sleep(RETRY_INTERVAL)
+
+    def _apply_sync(self, sent_at, received_at):
+        """Correct the schedule with an API answer, like apply_sync()."""
+        reading = self.reading
+        rtt = received_at - sent_at
+        tick = reading.total_cycles * SEQUENCE_LENGTH + reading.number - 1
+        boundary_at = received_at + reading.next_change_ms - rtt // 2
+
+        while boundary_at - received_at <= 0:
+            tick += 1
+            boundary_at += TICK_MS
+
+        self.tick = tick
+        self.boundary_at = boundary_at
+        self._schedule_tick()
+
+    def _schedule_tick(self):
+        """Wake up at the predicted change, like number_ticker()."""
+        if self._tick_handle is not None:
+            self._tick_handle.cancel()
+        self._tick_handle = asyncio.get_running_loop().call_at(
+            self.boundary_at / 1000, self._on_tick
+        )
+
+    def _on_tick(self):
+        """Advance the number and compare it with the server's schedule."""
+        self._tick_handle = None
+        started_at = self.boundary_at
+        self.tick += 1
+        self.ticks += 1
+
+        true_tick, true_start = self.fleet.reference.nearest(started_at)
+        if true_tick != self.tick:
+            self.wrong_ticks += 1
+        self.max_boundary_error_ms = max(self.max_boundary_error_ms,
+                                         abs(started_at - true_start))
+        self.max_staleness_ms = max(self.max_staleness_ms, started_at - self.last_sync_at)
+
+        self.boundary_at += TICK_MS
+        self._schedule_tick()
+
+
+class Fleet:
+    """
+    Configuration and results shared by all virtual Picos.
+    """
+
+    def __init__(self, url, sync_interval, reference):
+        parts = urlsplit(url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.path = parts.path or '/api/number'
+        self.sync_interval = sync_interval
+        self.reference = reference
+        self.results = {
+            'latencies': [],
+            'statuses': {},
+            'errors': {},
+            'first_sync': [],
+            'wifi_failures': 0,
+            'wifi_dropouts': 0,
+            'lag': [],
+        }
+
+
+def raise_file_limit(needed):
+    """
+    Raise the open file limit: every virtual Pico keeps a socket open.
+
+    Returns:
+        int: The soft limit now in effect, or None if it is unknown
+    """
+    if resource is None:
+        return None
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft != resource.RLIM_INFINITY and soft < needed:
+        target = needed if hard == resource.RLIM_INFINITY else min(needed, hard)
+        try:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+            soft = target
+        except (ValueError, OSError):
+            pass
+    return soft
+
+
+async def watch_lag(results):
+    """Task: record how late the event loop wakes up."""
+    loop = asyncio.get_running_loop()
+    while True:
+        expected = loop.time() + LAG_CHECK_INTERVAL
+        await asyncio.sleep(LAG_CHECK_INTERVAL)
+        results['lag'].append((loop.time() - expected) * 1000)
+
+
+async def drop_wifi_randomly(devices, rate, seconds, results):
+    """
+    Task: make Picos lose their access point at random.
+
+    Args:
+        devices (list): VirtualPico objects
+        rate (float): Drop-outs per Pico per hour
+        seconds (float): Length of a drop-out
+        results (dict): Fleet results
+    """
+    probability = rate / 3600
+    while True:
+        await asyncio.sleep(1)
+        for device in devices:
+            if random.random() < probability:
+                results['wifi_dropouts'] += 1
+                device.drop_wifi(seconds)
+
+
+async def reboot_fleet(devices, at, boot_spread):
+    """Task: reboot all Picos at the given seconds after the start."""
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    for offset in sorted(at):
+        await asyncio.sleep(max(0, started + offset - loop.time()))
+        logger.info(f"Rebooting all {len(devices)} Picos")
+        for device in devices:
+            device.boot(random.uniform(0, boot_spread))
+
+
+async def run_simulation(url, devices_count, duration, sync_interval=SYNC_INTERVAL,
+                         boot_spread=0.0, reboot_at=(), dropout_rate=0.0,
+                         dropout_seconds=10.0):
+    """
+    Boot a fleet of virtual Picos and let it run for `duration` seconds.
+
+    Args:
+        url (str): API endpoint URL
+        devices_count (int): Number of virtual Picos
+        duration (float): Seconds to run
+        sync_interval (float): Seconds between successful syncs per Pico
+        boot_spread (float): Picos boot at random within this many seconds;
+            0 boots all at the same moment
+        reboot_at (list): Seconds after the start at which all Picos reboot
+        dropout_rate (float): WiFi drop-outs per Pico per hour
+        dropout_seconds (float): Length of a WiFi drop-out
+
+    Returns:
+        dict: Simulation report
+    """
+    parts = urlsplit(url)
+    reference = await measure_reference(parts.hostname, parts.port or 80,
+                                        parts.path or '/api/number')
+    if reference is None:
+        raise RuntimeError(f"No valid answer from {url}")
+    logger.info(f"Server schedule measured (round trip {reference.rtt_ms:.1f}ms)")
+
+    fleet = Fleet(url, sync_interval, reference)
+    results = fleet.results
+    devices = [VirtualPico(index, fleet) for index in range(devices_count)]
+
+    helpers = [asyncio.create_task(watch_lag(results))]
+    if dropout_rate:
+        helpers.append(asyncio.create_task(
+            drop_wifi_randomly(devices, dropout_rate, dropout_seconds, results)))
+    if reboot_at:
+        helpers.append(asyncio.create_task(reboot_fleet(devices, reboot_at, boot_spread)))
+
+    logger.info(f"Booting {devices_count} Picos"
+                + (f" within {boot_spread:g}s" if boot_spread else " at once"))
+    started = time.perf_counter()
+    for device in devices:
+        device.boot(random.uniform(0, boot_spread))
+    try:
+        await asyncio.sleep(duration)
+    finally:
+        elapsed = time.perf_counter() - started
+        for helper in helpers:
+            helper.cancel()
+        await asyncio.gather(*(device.shutdown() for device in devices))
+
+    now = asyncio.get_running_loop().time() * 1000
+    synced = [device for device in devices if device.last_sync_at is not None]
+    # A Pico's clock is as stale as its oldest schedule, up to now
+    staleness = [
+        max(device.max_staleness_ms, now - device.last_sync_at) / 1000
+        for device in synced
+    ]
+    latencies = results['latencies']
+    requests = sum(results['statuses'].values()) + sum(results['errors'].values())
+
+    return {
+        'url': url,
+        'devices': devices_count,
+        'duration_seconds': elapsed,
+        'sync_interval_seconds': sync_interval,
+        'boot_spread_seconds': boot_spread,
+        'reboots': sorted(reboot_at),
+        'requests': requests,
+        'responses_ok': len(latencies),
+        'throughput_rps': len(latencies) / elapsed if elapsed else 0.0,
+        'latency_ms': _distribution(latencies),
+        'statuses': {str(code): count for code, count in sorted(results['statuses'].items())},
+        'errors': results['errors'],
+        'connections_opened': sum(device.client.connect_count for device in devices),
+        'first_sync_ms': _distribution(results['first_sync']),
+        'never_synced': devices_count - len(synced),
+        'staleness_seconds': _distribution(staleness),
+        'stale_devices': sum(1 for value in staleness if value > 2 * sync_interval),
+        'boundary_error_ms': _distribution(
+            [device.max_boundary_error_ms for device in devices if device.ticks]),
+        'ticks': sum(device.ticks for device in devices),
+        'wrong_ticks': sum(device.wrong_ticks for device in devices),
+        'devices_with_wrong_ticks': sum(1 for device in devices if device.wrong_ticks),
+        'wifi_dropouts': results['wifi_dropouts'],
+        'wifi_failed_joins': results['wifi_failures'],
+        'reference_rtt_ms': reference.rtt_ms,
+        'simulator_lag_ms': _distribution(results['lag']),
+    }
+
+
+def print_report(report):
+    """
+    Print a run_simulation() report.
+
+    Args:
+        report (dict): Result of run_simulation()
+    """
+    print("=" * 60)
+    print(f"Fleet simulation: {report['url']}")
+    print("=" * 60)
+    boot = (f"within {report['boot_spread_seconds']:g}s" if report['boot_spread_seconds']
+            else "at once")
+    print(f"Picos: {report['devices']}, booted {boot}, "
+          f"sync every {report['sync_interval_seconds']:g}s, "
+          f"ran {report['duration_seconds']:.1f}s")
+    if report['reboots']:
+        print(f"Fleet reboots at: {', '.join(f'{t:g}s' for t in report['reboots'])}")
+
+    print("\nServer")
+    print(f"Responses: {report['responses_ok']}/{report['requests']} "
+          f"({report['throughput_rps']:.1f} req/s)")
+    latency = report['latency_ms']
+    if latency:
+        print(f"Latency: p50 {latency['p50']:.0f}ms | p90 {latency['p90']:.0f}ms | "
+              f"p99 {latency['p99']:.0f}ms | max {latency['max']:.0f}ms")
+    statuses = ', '.join(f"{code}: {count}" for code, count in report['statuses'].items())
+    print(f"Status codes: {statuses or '-'}")
+    for kind, count in report['errors'].items():
+        print(f"  {kind}: {count}")
+    print(f"Connections opened: {report['connections_opened']}")
+
+    print("\nPicos")
+    first_sync = report['first_sync_ms']
+    if first_sync:
+        print(f"First sync after boot: p50 {first_sync['p50'] / 1000:.1f}s | "
+              f"p99 {first_sync['p99'] / 1000:.1f}s | max {first_sync['max'] / 1000:.1f}s")
+    print(f"Never synced: {report['never_synced']}")
+    staleness = report['staleness_seconds']
+    if staleness:
+        print(f"Staleness per Pico: p50 {staleness['p50']:.1f}s | "
+              f"p99 {staleness['p99']:.1f}s | max {staleness['max']:.1f}s "
+              f"({report['stale_devices']} over twice the sync interval)")
+    error = report['boundary_error_ms']
+    if error:
+        print(f"Number change off by: p50 {error['p50']:.0f}ms | "
+              f"p99 {error['p99']:.0f}ms | max {error['max']:.0f}ms")
+    print(f"Wrong numbers shown: {report['wrong_ticks']} of {report['ticks']} ticks, "
+          f"on {report['devices_with_wrong_ticks']} Picos")
+    if report['wifi_dropouts'] or report['wifi_failed_joins']:
+        print(f"WiFi drop-outs: {report['wifi_dropouts']}, "
+              f"failed joins: {report['wifi_failed_joins']}")
+
+    lag = report['simulator_lag_ms']
+    if lag:
+        print(f"\nSimulator lag: p99 {lag['p99']:.0f}ms | max {lag['max']:.0f}ms")
+        if lag['p99'] > 50:
+            print("The simulator is overloaded; latencies include its own delay.")
+    print("=" * 60)
+
+
+def main():
+    """
+    Main entry point for the fleet simulator.
+    """
+    parser = argparse.ArgumentParser(
+        description='Simulate a fleet of Picos polling the Number Transmitter API',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+Examples:
+  # 1000 Picos booting at the same moment, for one minute
+  %(prog)s --devices 1000
+
+  # 5000 Picos booting within 30 seconds, syncing every 5 seconds
+  %(prog)s --devices 5000 --boot-spread 30 --sync-interval 5 --duration 120
+
+  # Power cut: the whole fleet reboots after 60 and 120 seconds
+  %(prog)s --devices 2000 --duration 180 --reboot-at 60 --reboot-at 120
+
+  # Each Pico loses WiFi for 10 seconds about 6 times per hour
+  %(prog)s --devices 1000 --dropout-rate 6 --dropout-seconds 10
+        '''
+    )
+
+    parser.add_argument(
+        '--url',
+        default='http://127.0.0.1:5001/api/number',
+        help='API endpoint (default: http://127.0.0.1:5001/api/number)'
+    )
+    parser.add_argument(
+        '--devices',
+        type=int,
+        default=100,
+        help='Number of virtual Picos (default: 100)'
+    )
+    parser.add_argument(
+        '--duration',
+        type=float,
+        default=60.0,
+        help='Seconds to run (default: 60)'
+    )
+    parser.add_argument(
+        '--sync-interval',
+        type=float,
+        default=SYNC_INTERVAL,
+        help=f'Seconds between syncs per Pico (default: {SYNC_INTERVAL})'
+    )
+    parser.add_argument(
+        '--boot-spread',
+        type=float,
+        default=0.0,
+        help='Boot the Picos at random within this many seconds (default: 0, all at once)'
+    )
+    parser.add_argument(
+        '--reboot-at',
+        type=float,
+        action='append',
+        default=[],
+        metavar='SECONDS',
+        help='Reboot the whole fleet this many seconds after the start (repeatable)'
+    )
+    parser.add_argument(
+        '--dropout-rate',
+        type=float,
+        default=0.0,
+        help='WiFi drop-outs per Pico per hour (default: 0)'
+    )
+    parser.add_argument(
+        '--dropout-seconds',
+        type=float,
+        default=10.0,
+        help='Length of a WiFi drop-out in seconds (default: 10)'
+    )
+    parser.add_argument(
+        '--json',
+        action='store_true',
+        help='Print the report as JSON'
+    )
+
+    args = parser.parse_args()
+
+    limit = raise_file_limit(args.devices + 64)
+    if limit is not None and limit < args.devices + 64:
+        logger.warning(f"Open file limit is {limit}; some Picos will fail to connect "
+                       f"(raise it with 'ulimit -n')")
+
+    try:
+        report = asyncio.run(run_simulation(
+            args.url, args.devices, args.duration,
+            sync_interval=args.sync_interval,
+            boot_spread=args.boot_spread,
+            reboot_at=args.reboot_at,
+            dropout_rate=args.dropout_rate,
+            dropout_seconds=args.dropout_seconds,
+        ))
+    except RuntimeError as error:
+        logger.error(str(error))
+        sys.exit(1)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == '__main__':
+    main()
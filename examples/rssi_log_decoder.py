@@ -0,0 +1,213 @@
+"""
+Pico RSSI Log Decoder
+
+This script decodes the binary signal strength logs that
+03_wifi_signal_monitor.py writes to the Pico's flash (rssi.bin and its
+rotated files rssi.bin.1, rssi.bin.2, ...). It prints a summary per file,
+with the longest periods without samples, and can export all samples as
+CSV.
+
+Copy the logs from the Pico first, e.g. with mpremote:
+
+    mpremote cp :rssi.bin :rssi.bin.1 .
+"""
+
+import argparse
+import csv
+import json
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src' / 'pico_scripts' / 'lib'))
+
+from rssi_log import read_log  # noqa: E402
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def _rotation_index(path):
+    """Rotation number of a log file: 0 for rssi.bin, 2 for rssi.bin.2."""
+    suffix = Path(path).suffix[1:]
+    return int(suffix) if suffix.isdigit() else 0
+
+
+def load_logs(paths):
+    """
+    Decode log files and order them by start time.
+
+    Files that are not RSSI logs are skipped with a warning.
+
+    Args:
+        paths (list): Log file paths
+
+    Returns:
+        list: Dicts with path, start_time and samples (see read_log()),
+            oldest first
+    """
+    logs = []
+    for path in paths:
+        try:
+            start_time, samples = read_log(Path(path).read_bytes())
+        except (OSError, ValueError) as error:
+            logger.warning(f"Skipping {path}: {error}")
+            continue
+        logs.append({'path': str(path), 'start_time': start_time, 'samples': samples})
+    # Files started within the same second keep their rotation order
+    logs.sort(key=lambda log: (log['start_time'], -_rotation_index(log['path'])))
+    return logs
+
+
+def summarize(log, gap_threshold=10.0, longest=5):
+    """
+    Summarize the samples of one log file.
+
+    Args:
+        log (dict): Entry of load_logs()
+        gap_threshold (float): Seconds between samples that count as a gap
+        longest (int): Number of longest gaps to report
+
+    Returns:
+        dict: Summary
+    """
+    samples = log['samples']
+    summary = {
+        'path': log['path'],
+        'start': log['start_time'],
+        'samples': len(samples),
+        'duration_seconds': samples[-1][0] if samples else 0.0,
+        'rssi': None,
+        'gaps': 0,
+        'longest_gaps': [],
+    }
+    if not samples:
+        return summary
+
+    values = [rssi for _, rssi in samples]
+    summary['rssi'] = {
+        'min': min(values),
+        'max': max(values),
+        'mean': statistics.fmean(values),
+        'median': statistics.median(values),
+    }
+
+    gaps = [
+        {'start': log['start_time'] + previous[0], 'seconds': current[0] - previous[0]}
+        for previous, current in zip(samples, samples[1:])
+        if current[0] - previous[0] >= gap_threshold
+    ]
+    summary['gaps'] = len(gaps)
+    summary['longest_gaps'] = sorted(gaps, key=lambda gap: -gap['seconds'])[:longest]
+    return summary
+
+
+def write_csv(logs, path):
+    """
+    Write all samples as CSV rows (unix time, ISO time, RSSI).
+
+    Args:
+        logs (list): Result of load_logs()
+        path (str): Output file
+    """
+    with open(path, 'w', newline='') as output:
+        writer = csv.writer(output)
+        writer.writerow(['unix_time', 'time', 'rssi'])
+        for log in logs:
+            for offset, rssi in log['samples']:
+                timestamp = log['start_time'] + offset
+                iso = time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(timestamp))
+                writer.writerow([f'{timestamp:.3f}', iso, rssi])
+
+
+def print_report(summaries):
+    """
+    Print summarize() results as text.
+
+    Args:
+        summaries (list): Results of summarize()
+    """
+    print("=" * 60)
+    print("Pico RSSI Logs")
+    print("=" * 60)
+    for summary in summaries:
+        start = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(summary['start']))
+        print(f"\n{summary['path']}")
+        print(f"Started: {start}")
+        print(f"Samples: {summary['samples']} over {summary['duration_seconds']:.1f}s")
+        rssi = summary['rssi']
+        if rssi:
+            print(f"RSSI: min {rssi['min']} | median {rssi['median']:.0f} | "
+                  f"max {rssi['max']} | mean {rssi['mean']:.1f} dBm")
+        print(f"Gaps: {summary['gaps']}")
+        for gap in summary['longest_gaps']:
+            gap_start = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(gap['start']))
+            print(f"  {gap_start}: {gap['seconds']:.1f}s")
+    print("=" * 60)
+
+
+def main():
+    """
+    Main entry point for the log decoder.
+    """
+    parser = argparse.ArgumentParser(
+        description='Decode RSSI logs written by the Pico signal monitor',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+Examples:
+  # Summarize the current log and all rotated ones
+  %(prog)s rssi.bin*
+
+  # Export all samples as CSV
+  %(prog)s rssi.bin* --csv survey.csv
+        '''
+    )
+
+    parser.add_argument(
+        'files',
+        nargs='+',
+        help='Log files copied from the Pico'
+    )
+    parser.add_argument(
+        '--gap',
+        type=float,
+        default=10.0,
+        help='Seconds between samples that count as a gap (default: 10.0)'
+    )
+    parser.add_argument(
+        '--csv',
+        metavar='FILE',
+        help='Write all samples to a CSV file'
+    )
+    parser.add_argument(
+        '--json',
+        action='store_true',
+        help='Print the summaries as JSON'
+    )
+
+    args = parser.parse_args()
+
+    logs = load_logs(args.files)
+    if not logs:
+        logger.error("No RSSI logs found")
+        sys.exit(1)
+
+    if args.csv:
+        write_csv(logs, args.csv)
+        logger.info(f"Wrote {sum(len(log['samples']) for log in logs)} samples to {args.csv}")
+
+    summaries = [summarize(log, gap_threshold=args.gap) for log in logs]
+    if args.json:
+        print(json.dumps(summaries, indent=2))
+    else:
+        print_report(summaries)
+
+
+if __name__ == '__main__':
+    main()
@@ -3,12 +3,29 @@ Number Transmitter API
 
 This Flask API provides machine-readable access to number transmissions.
 Returns numbers 1-9 in a rotating sequence, changing every second.
+
+Devices can also upload telemetry (RSSI and poll latency) in batches,
+which is kept in memory and served as downsampled aggregates.
+
+Relay mode: started with --upstream URL (or the NUMBER_UPSTREAM_URL
+environment variable), the API takes the rotation's start time from an
+upstream transmitter with a few requests and then answers /api/number and
+the other endpoints locally. Relays can point at other relays, so the
+origin's load grows with the number of relays, not with the number of
+devices.
 """
 
+import argparse
 import logging
+import math
+import os
+import threading
 import time
+from array import array
+from bisect import bisect_left
 from datetime import datetime
-from flask import Flask, jsonify
+import requests
+from flask import Flask, jsonify, request
 from flask_cors import CORS
 
 # Configure logging
@@ -26,6 +43,291 @@ CORS(app)  # Enable CORS for cross-origin requests
 # This simulates a continuous rotation starting from application start
 START_TIME = time.time()
 
+# Telemetry retention: samples kept per device (one day at one sample every
+# 2 seconds) and number of devices. A sample takes 13 bytes, so the store
+# never uses more than about 140 MB.
+TELEMETRY_CAPACITY = 43200
+TELEMETRY_MAX_DEVICES = 256
+TELEMETRY_MAX_BATCH = 1000
+TELEMETRY_MAX_BUCKETS = 1440
+TELEMETRY_DEFAULT_RANGE = 3600
+TELEMETRY_DEFAULT_BUCKETS = 60
+
+# Accepted sample timestamps: at most a week old (devices that were offline
+# upload their backlog later) and at most 5 minutes ahead of the server
+# clock. A timestamp far in the future would block all later samples of the
+# device, since older samples than the latest stored one are dropped.
+TELEMETRY_MAX_SAMPLE_AGE = 7 * 86400
+TELEMETRY_MAX_CLOCK_AHEAD = 300
+
+# Relay mode: requests per upstream sync (the fastest one is used), seconds
+# a sync stays fresh, seconds between single-request checks of the
+# prediction, and seconds before retrying a failed sync. A check that is
+# off by more than half its round trip plus RELAY_CHECK_TOLERANCE seconds
+# starts a new sync at once.
+RELAY_SYNC_PROBES = 5
+RELAY_REFRESH_INTERVAL = 300
+RELAY_CHECK_INTERVAL = 10
+RELAY_CHECK_TOLERANCE = 0.01
+RELAY_RETRY_INTERVAL = 10
+RELAY_TIMEOUT = 5
+
+
+class UpstreamError(Exception):
+    """The upstream transmitter of a relay could not be reached."""
+
+
+class UpstreamSchedule:
+    """
+    Start time of an upstream transmitter's rotation, for relay mode.
+
+    The whole number schedule follows from the start time, so a relay only
+    needs the upstream now and then:
+
+    - A sync sends a few requests to the upstream's /api/number and keeps
+      the estimate from the fastest one, assuming the upstream answered
+      halfway through the round trip
+    - Once the sync is older than refresh_interval, the next request starts
+      a new one in the background and is answered with the old start time
+      (stale-while-revalidate). A failed sync keeps the old start time too.
+    - In between, every check_interval a single request checks the
+      prediction. If the upstream is elsewhere in its rotation, e.g. after
+      a restart, a full sync follows at once.
+    - Only one sync runs at a time. Requests that arrive before the first
+      sync has finished wait for that sync instead of starting their own.
+    """
+
+    def __init__(self, url, probes=RELAY_SYNC_PROBES, refresh_interval=RELAY_REFRESH_INTERVAL,
+                 check_interval=RELAY_CHECK_INTERVAL, retry_interval=RELAY_RETRY_INTERVAL,
+                 timeout=RELAY_TIMEOUT):
+        """
+        Args:
+            url (str): Base URL of the upstream, e.g. http://192.168.1.10:5001
+            probes (int): Requests per sync
+            refresh_interval (float): Seconds until a sync is renewed
+            check_interval (float): Seconds between checks of the prediction
+            retry_interval (float): Seconds before a failed sync is retried
+            timeout (float): Timeout per upstream request in seconds
+        """
+        self.url = url.rstrip('/') + '/api/number'
+        self.probes = probes
+        self.refresh_interval = refresh_interval
+        self.check_interval = check_interval
+        self.retry_interval = retry_interval
+        self.timeout = timeout
+
+        self.start_time = None
+        self.rtt = None
+        self.synced_at = None  # time.monotonic() of the last successful sync
+        self.checked_at = None  # ... and of the last successful check or sync
+        self.retry_at = 0.0
+        self.sync_count = 0
+        self.check_count = 0
+        self.error_count = 0
+        self.last_error = None
+
+        self.lock = threading.Lock()
+        self._syncing = None  # threading.Event while a sync is running
+        self._session = requests.Session()
+
+    def _probe(self):
+        """
+        Request the upstream's number once.
+
+        Returns:
+            tuple: (round trip in seconds, start time on the local clock)
+        """
+        sent = time.time()
+        response = self._session.get(self.url, timeout=self.timeout)
+        received = time.time()
+        response.raise_for_status()
+        data = response.json()
+
+        # Seconds since the upstream's start when it answered: the current
+        # position plus the part of the current second that has passed
+        position = int(data["total_cycles"]) * 9 + int(data["number"]) - 1
+        elapsed = position + 1.0 - float(data["next_change_in"])
+        rtt = received - sent
+        return rtt, sent + rtt / 2 - elapsed
+
+    def _measure(self, probes):
+        """
+        Probe the upstream a few times.
+
+        Returns:
+            tuple: (round trip, start time) of the fastest probe
+
+        Raises:
+            UpstreamError: If the first probe fails
+        """
+        results = []
+        for _ in range(probes):
+            try:
+                results.append(self._probe())
+            except (requests.RequestException, KeyError, TypeError, ValueError) as error:
+                # The remaining probes would most likely fail the same way
+                self.last_error = repr(error)
+                break
+        if not results:
+            raise UpstreamError(self.last_error)
+        return min(results)
+
+    def _check(self):
+        """
+        Compare the prediction with one upstream answer.
+
+        Returns:
+            bool: True if the prediction still holds
+        """
+        rtt, start_time = self._measure(1)
+        with self.lock:
+            offset = start_time - self.start_time
+            self.checked_at = time.monotonic()
+            self.check_count += 1
+        if abs(offset) <= rtt / 2 + RELAY_CHECK_TOLERANCE:
+            return True
+        logger.info(f"Relay: upstream is {offset:+.3f}s off the prediction, resyncing")
+        return False
+
+    def _sync(self, done, check=False):
+        """
+        Run one sync and wake up the requests waiting for it.
+
+        Args:
+            done (threading.Event): Set when the sync has finished
+            check (bool): Only check the prediction, and sync only if it
+                turns out to be wrong
+        """
+        try:
+            if check and self._check():
+                return
+            rtt, start_time = self._measure(self.probes)
+
+            with self.lock:
+                # Keep the old estimate if the new one is not clearly better,
+                # so numbers do not jump back and forth by a few milliseconds
+                if self.start_time is None or abs(start_time - self.start_time) > rtt / 2:
+                    if self.start_time is not None:
+                        logger.info(f"Relay: upstream start time moved by "
+                                    f"{start_time - self.start_time:+.3f}s")
+                    self.start_time = start_time
+                self.rtt = rtt
+                self.synced_at = self.checked_at = time.monotonic()
+                self.sync_count += 1
+            logger.info(f"Relay: synced with {self.url} (round trip {rtt * 1000:.1f}ms)")
+        except UpstreamError as error:
+            with self.lock:
+                self.error_count += 1
+                self.retry_at = time.monotonic() + self.retry_interval
+            logger.warning(f"Relay: sync with {self.url} failed: {error}")
+        finally:
+            with self.lock:
+                self._syncing = None
+            done.set()
+
+    def start_sync(self):
+        """
+        Start a sync in the background unless one is already running.
+
+        Returns:
+            threading.Event: Set when the running sync has finished
+        """
+        with self.lock:
+            return self._start_sync_locked()
+
+    def _start_sync_locked(self, check=False):
+        done = self._syncing
+        if done is None:
+            done = self._syncing = threading.Event()
+            threading.Thread(target=self._sync, args=(done, check), daemon=True).start()
+        return done
+
+    def get_start_time(self):
+        """
+        Start time of the upstream's rotation on the local clock.
+
+        Returns:
+            float: Unix time
+
+        Raises:
+            UpstreamError: If no sync has succeeded yet
+        """
+        now = time.monotonic()
+        with self.lock:
+            start_time = self.start_time
+            if start_time is not None:
+                if now >= self.retry_at:
+                    if now - self.synced_at >= self.refresh_interval:
+                        self._start_sync_locked()
+                    elif now - self.checked_at >= self.check_interval:
+                        self._start_sync_locked(check=True)
+                return start_time
+            if now < self.retry_at:
+                raise UpstreamError(f"Upstream {self.url} unavailable: {self.last_error}")
+            done = self._start_sync_locked()
+
+        done.wait(self.timeout * (self.probes + 1))
+        with self.lock:
+            if self.start_time is None:
+                raise UpstreamError(f"Upstream {self.url} unavailable: {self.last_error}")
+            return self.start_time
+
+    def status(self):
+        """
+        Returns:
+            dict: Upstream URL and sync state for /api/status
+        """
+        with self.lock:
+            return {
+                "upstream": self.url,
+                "synced": self.start_time is not None,
+                # Age of the upstream's rotation, which is the origin's uptime
+                "upstream_uptime_seconds": (round(time.time() - self.start_time, 3)
+                                            if self.start_time is not None else None),
+                "sync_age_seconds": (round(time.monotonic() - self.synced_at, 3)
+                                     if self.synced_at is not None else None),
+                "round_trip_ms": round(self.rtt * 1000, 3) if self.rtt is not None else None,
+                "syncs": self.sync_count,
+                "checks": self.check_count,
+                "errors": self.error_count,
+            }
+
+
+# Upstream of relay mode, or None when this server is the origin
+relay = None
+
+
+def enable_relay(url):
+    """
+    Serve the number schedule of an upstream transmitter.
+
+    The first sync starts at once, so the relay is usually ready before the
+    first request arrives.
+
+    Args:
+        url (str): Base URL of the upstream
+    """
+    global relay
+    relay = UpstreamSchedule(url)
+    relay.start_sync()
+    logger.info(f"Relay mode: mirroring {relay.url}")
+
+
+def get_start_time():
+    """
+    Start of the number rotation: this server's start, or the upstream's in
+    relay mode.
+
+    Returns:
+        float: Unix time
+
+    Raises:
+        UpstreamError: If a relay has not synced with its upstream yet
+    """
+    if relay is None:
+        return START_TIME
+    return relay.get_start_time()
+
 
 def get_current_number():
     """
@@ -35,12 +337,262 @@ def get_current_number():
     Returns:
         int: Current number (1-9)
     """
-    elapsed_seconds = int(time.time() - START_TIME)
+    elapsed_seconds = int(time.time() - get_start_time())
     # Calculate position in 1-9 cycle (0-8 mapped to 1-9)
     current_number = (elapsed_seconds % 9) + 1
     return current_number
 
 
+class DeviceSeries:
+    """
+    Telemetry of one device in fixed-size ring buffers.
+
+    Timestamps, RSSI and latency are stored in parallel typed arrays
+    (float64, int8 and float32), which grow up to the capacity and are then
+    overwritten oldest first. Samples are kept in time order, so a time
+    range can be found by bisection.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.timestamps = array('d')
+        self.rssi = array('b')
+        self.latency = array('f')
+        self.head = 0  # Index of the oldest sample once the buffers are full
+        self.last_seen = 0.0
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    @property
+    def last_timestamp(self):
+        if not self.timestamps:
+            return -math.inf
+        return self.timestamps[self.head - 1]
+
+    def append(self, timestamp, rssi, latency):
+        """Store a sample, overwriting the oldest one when full."""
+        if len(self.timestamps) < self.capacity:
+            self.timestamps.append(timestamp)
+            self.rssi.append(rssi)
+            self.latency.append(latency)
+            return
+        self.timestamps[self.head] = timestamp
+        self.rssi[self.head] = rssi
+        self.latency[self.head] = latency
+        self.head = (self.head + 1) % self.capacity
+
+    def segments(self):
+        """Index ranges of the buffers in time order."""
+        if self.head == 0:
+            return [(0, len(self.timestamps))]
+        return [(self.head, self.capacity), (0, self.head)]
+
+
+class TelemetryStore:
+    """
+    In-memory telemetry of many devices with fixed retention.
+
+    When a new device would exceed max_devices, the device that has not
+    uploaded for the longest time is dropped. All methods are thread-safe.
+    """
+
+    def __init__(self, capacity=TELEMETRY_CAPACITY, max_devices=TELEMETRY_MAX_DEVICES):
+        self.capacity = capacity
+        self.max_devices = max_devices
+        self.devices = {}
+        self.lock = threading.Lock()
+
+    def add_samples(self, device_id, samples):
+        """
+        Store a batch of samples of one device.
+
+        Samples that are not newer than the latest stored one of the device
+        (e.g. a batch that is uploaded twice) are dropped.
+
+        Args:
+            device_id (str): Device name
+            samples (list): Validated (timestamp, rssi, latency_ms) tuples
+
+        Returns:
+            tuple: (stored, dropped) sample counts
+        """
+        samples = sorted(samples)
+        with self.lock:
+            series = self.devices.get(device_id)
+            if series is None:
+                if len(self.devices) >= self.max_devices:
+                    stale = min(self.devices, key=lambda name: self.devices[name].last_seen)
+                    del self.devices[stale]
+                    logger.info(f"Telemetry: dropped device {stale} to make room for {device_id}")
+                series = self.devices[device_id] = DeviceSeries(self.capacity)
+
+            stored = 0
+            last = series.last_timestamp
+            for timestamp, rssi, latency in samples:
+                if timestamp <= last:
+                    continue
+                series.append(timestamp, rssi, latency)
+                last = timestamp
+                stored += 1
+            series.last_seen = time.time()
+
+        return stored, len(samples) - stored
+
+    def device_summary(self):
+        """
+        Returns:
+            dict: Device name -> sample count and time range
+        """
+        with self.lock:
+            return {
+                device_id: {
+                    "samples": len(series),
+                    "first_timestamp": series.timestamps[series.head] if len(series) else None,
+                    "last_timestamp": series.last_timestamp if len(series) else None,
+                    "last_upload": series.last_seen,
+                }
+                for device_id, series in self.devices.items()
+            }
+
+    def aggregate(self, device_id, start, end, bucket_count):
+        """
+        Downsample a device's samples in [start, end) to equal buckets.
+
+        Each bucket is found by bisection and reduced with the built-in
+        min(), max() and sum() on array slices, so the cost depends on the
+        number of buckets rather than on Python-level work per sample.
+
+        Args:
+            device_id (str): Device name
+            start (float): Range start, unix time
+            end (float): Range end, unix time
+            bucket_count (int): Number of buckets
+
+        Returns:
+            list: One dict per bucket with start, count and min/max/mean of
+                rssi and latency_ms, or None if the device is unknown
+        """
+        width = (end - start) / bucket_count
+        edges = [start + width * (index + 1) for index in range(bucket_count)]
+        edges[-1] = end
+        totals = [None] * bucket_count
+
+        with self.lock:
+            series = self.devices.get(device_id)
+            if series is None:
+                return None
+
+            timestamps = series.timestamps
+            for low, high in series.segments():
+                first = bisect_left(timestamps, start, low, high)
+                last = bisect_left(timestamps, end, first, high)
+                if first == last:
+                    continue
+                bucket = min(int((timestamps[first] - start) / width), bucket_count - 1)
+                while first < last and bucket < bucket_count:
+                    stop = bisect_left(timestamps, edges[bucket], first, last)
+                    if stop > first:
+                        rssi = series.rssi[first:stop]
+                        latency = series.latency[first:stop]
+                        part = [stop - first, min(rssi), max(rssi), sum(rssi),
+                                min(latency), max(latency), sum(latency)]
+                        total = totals[bucket]
+                        if total is None:
+                            totals[bucket] = part
+                        else:
+                            # A bucket that spans the ring buffer's wrap point
+                            total[0] += part[0]
+                            total[1] = min(total[1], part[1])
+                            total[2] = max(total[2], part[2])
+                            total[3] += part[3]
+                            total[4] = min(total[4], part[4])
+                            total[5] = max(total[5], part[5])
+                            total[6] += part[6]
+                    first = stop
+                    bucket += 1
+
+        buckets = []
+        for index, total in enumerate(totals):
+            bucket = {"start": start + width * index, "count": 0,
+                      "rssi": None, "latency_ms": None}
+            if total is not None:
+                count = total[0]
+                bucket["count"] = count
+                bucket["rssi"] = {"min": total[1], "max": total[2],
+                                  "mean": round(total[3] / count, 2)}
+                bucket["latency_ms"] = {"min": round(total[4], 3), "max": round(total[5], 3),
+                                        "mean": round(total[6] / count, 3)}
+            buckets.append(bucket)
+        return buckets
+
+
+telemetry = TelemetryStore()
+
+
+def parse_telemetry_samples(samples):
+    """
+    Validate uploaded samples.
+
+    Args:
+        samples: Value of the "samples" field
+
+    Returns:
+        list: (timestamp, rssi, latency_ms) tuples
+
+    Raises:
+        ValueError: If the samples are malformed
+    """
+    if not isinstance(samples, list) or not samples:
+        raise ValueError("'samples' must be a non-empty list")
+    if len(samples) > TELEMETRY_MAX_BATCH:
+        raise ValueError(f"At most {TELEMETRY_MAX_BATCH} samples per request")
+
+    now = time.time()
+    earliest = now - TELEMETRY_MAX_SAMPLE_AGE
+    latest = now + TELEMETRY_MAX_CLOCK_AHEAD
+
+    parsed = []
+    for sample in samples:
+        if not isinstance(sample, list) or len(sample) != 3:
+            raise ValueError("Each sample must be [timestamp, rssi, latency_ms]")
+        timestamp, rssi, latency = sample
+        if not all(isinstance(value, (int, float)) and not isinstance(value, bool)
+                   for value in sample):
+            raise ValueError("Sample values must be numbers")
+        try:
+            # JSON integers are unbounded; float() refuses those beyond
+            # the float range with OverflowError
+            timestamp = float(timestamp)
+            latency = float(latency)
+        except (OverflowError, ValueError):
+            raise ValueError("Invalid timestamp or latency") from None
+        if not math.isfinite(timestamp) or not math.isfinite(latency) or latency < 0:
+            raise ValueError("Invalid timestamp or latency")
+        if not earliest <= timestamp <= latest:
+            raise ValueError("Timestamp must be within the last "
+                             f"{TELEMETRY_MAX_SAMPLE_AGE // 86400} days and at most "
+                             f"{TELEMETRY_MAX_CLOCK_AHEAD} seconds ahead of the server clock")
+        if not -128 <= rssi <= 127:
+            raise ValueError("RSSI must be between -128 and 127 dBm")
+        parsed.append((timestamp, int(rssi), latency))
+    return parsed
+
+
+def telemetry_error(message, status=400):
+    """
+    Build the response for a rejected telemetry upload.
+
+    Args:
+        message: Description of the problem
+        status: HTTP status code
+
+    Returns:
+        JSON response with error message and status code
+    """
+    return jsonify({"error": "Bad request", "message": message}), status
+
+
 @app.route('/api/number', methods=['GET'])
 def get_number():
     """
@@ -59,9 +611,9 @@ def get_number():
         "total_cycles": 12345
     }
     """
-    current_number = get_current_number()
     now = time.time()
-    elapsed = now - START_TIME
+    elapsed = now - get_start_time()
+    current_number = int(elapsed) % 9 + 1
 
     # Calculate when next number change occurs
     next_change_in = 1.0 - (elapsed % 1.0)
@@ -87,6 +639,9 @@ def get_sequence():
     """
     Get information about the number sequence.
 
+    Supports conditional requests: the response carries an ETag, and a
+    matching If-None-Match header is answered with 304 Not Modified.
+
     Returns:
         JSON response with sequence configuration
 
@@ -105,7 +660,11 @@ def get_sequence():
         "description": "Numbers 1-9 rotating every second"
     }
 
-    return jsonify(response)
+    # The sequence never changes, so clients can revalidate with If-None-Match
+    # and get an empty 304 response
+    result = jsonify(response)
+    result.add_etag()
+    return result.make_conditional(request)
 
 
 @app.route('/api/status', methods=['GET'])
@@ -113,6 +672,9 @@ def get_status():
     """
     Get API status and uptime information.
 
+    uptime_seconds is this server's own uptime. In relay mode, the
+    origin's uptime is relay.upstream_uptime_seconds.
+
     Returns:
         JSON response with API status
 
@@ -131,12 +693,114 @@ def get_status():
         "uptime_seconds": round(uptime, 3),
         "current_number": get_current_number(),
         "api_version": "1.0.0",
-        "service": "number-transmitter-api"
+        "service": "number-transmitter-api",
+        "mode": "origin" if relay is None else "relay"
     }
+    if relay is not None:
+        response["relay"] = relay.status()
 
     return jsonify(response)
 
 
+@app.route('/api/telemetry', methods=['POST'])
+def post_telemetry():
+    """
+    Upload a batch of telemetry samples of one device.
+
+    Request body:
+    {
+        "device": "pico-01",
+        "samples": [[1736935845.12, -58, 42.5], ...]
+    }
+
+    Each sample is [unix timestamp, RSSI in dBm, poll latency in ms].
+
+    Returns:
+        JSON response with the number of stored and dropped samples
+    """
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return telemetry_error("Expected a JSON object")
+
+    device_id = data.get("device")
+    if not isinstance(device_id, str) or not 0 < len(device_id) <= 64:
+        return telemetry_error("'device' must be a string of 1-64 characters")
+
+    try:
+        samples = parse_telemetry_samples(data.get("samples"))
+    except ValueError as error:
+        return telemetry_error(str(error))
+
+    stored, dropped = telemetry.add_samples(device_id, samples)
+    logger.debug(f"Telemetry from {device_id}: {stored} stored, {dropped} dropped")
+    return jsonify({"device": device_id, "stored": stored, "dropped": dropped})
+
+
+@app.route('/api/telemetry', methods=['GET'])
+def list_telemetry_devices():
+    """
+    List the devices with stored telemetry.
+
+    Returns:
+        JSON response with sample count and time range per device
+    """
+    return jsonify({"devices": telemetry.device_summary()})
+
+
+@app.route('/api/telemetry/<device_id>', methods=['GET'])
+def get_telemetry(device_id):
+    """
+    Get a device's telemetry downsampled to buckets.
+
+    Query parameters:
+        start: Range start, unix time (default: end - 1 hour)
+        end: Range end, unix time (default: now)
+        buckets: Number of buckets (default: 60)
+
+    Returns:
+        JSON response with min/max/mean of RSSI and latency per bucket
+
+    Example response:
+    {
+        "device": "pico-01",
+        "start": 1736932245.0,
+        "end": 1736935845.0,
+        "bucket_seconds": 60.0,
+        "buckets": [
+            {"start": 1736932245.0, "count": 30,
+             "rssi": {"min": -61, "max": -55, "mean": -57.4},
+             "latency_ms": {"min": 38.2, "max": 95.1, "mean": 47.9}},
+            ...
+        ]
+    }
+    """
+    try:
+        end = float(request.args.get('end', time.time()))
+        start = float(request.args.get('start', end - TELEMETRY_DEFAULT_RANGE))
+        bucket_count = int(request.args.get('buckets', TELEMETRY_DEFAULT_BUCKETS))
+    except ValueError:
+        return telemetry_error("'start', 'end' and 'buckets' must be numbers")
+    if not (math.isfinite(start) and math.isfinite(end)) or end <= start:
+        return telemetry_error("'end' must be after 'start'")
+    if not 1 <= bucket_count <= TELEMETRY_MAX_BUCKETS:
+        return telemetry_error(f"'buckets' must be between 1 and {TELEMETRY_MAX_BUCKETS}")
+
+    buckets = telemetry.aggregate(device_id, start, end, bucket_count)
+    if buckets is None:
+        return jsonify({
+            "error": "Not found",
+            "message": f"No telemetry for device {device_id}"
+        }), 404
+
+    return jsonify({
+        "device": device_id,
+        "start": start,
+        "end": end,
+        "bucket_seconds": (end - start) / bucket_count,
+        "buckets": buckets,
+    })
+
+
 @app.route('/health', methods=['GET'])
 def health():
     """
@@ -165,6 +829,23 @@ def not_found(error):
     }), 404
 
 
+@app.errorhandler(UpstreamError)
+def upstream_unavailable(error):
+    """
+    Handle a relay that has no schedule from its upstream yet.
+
+    Args:
+        error: The error object
+
+    Returns:
+        JSON response with error message
+    """
+    return jsonify({
+        "error": "Upstream unavailable",
+        "message": str(error)
+    }), 503
+
+
 @app.errorhandler(500)
 def internal_error(error):
     """
@@ -183,7 +864,19 @@ def internal_error(error):
     }), 500
 
 
+if os.environ.get('NUMBER_UPSTREAM_URL'):
+    enable_relay(os.environ['NUMBER_UPSTREAM_URL'])
+
+
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Number Transmitter API')
+    parser.add_argument('--port', type=int, default=5001, help='Port (default: 5001)')
+    parser.add_argument('--upstream', metavar='URL',
+                        help='Relay mode: mirror the transmitter at this base URL')
+    args = parser.parse_args()
+
     logger.info("Starting Number Transmitter API")
     logger.info(f"API will rotate through numbers 1-9, changing every second")
-    app.run(host='0.0.0.0', port=5001, debug=True)
+    if args.upstream and relay is None:
+        enable_relay(args.upstream)
+    app.run(host='0.0.0.0', port=args.port, debug=True)
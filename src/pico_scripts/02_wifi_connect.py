@@ -9,6 +9,10 @@ Hardware:
 
 Configuration:
 - Update WIFI_SSID and WIFI_PASSWORD with your network credentials
+- Copy lib/wifi.py and lib/ticks.py to the /lib folder of your Pico
+
+Connecting, rejoining the last access point and reconnecting after a
+drop-out are handled by lib/wifi.py, which the other scripts share.
 
 Usage:
 1. Edit the WiFi credentials below
@@ -20,6 +24,9 @@ import network
 import time
 import machine
 
+# Copy lib/wifi.py and lib/ticks.py to the /lib folder of your Pico
+from wifi import WiFi
+
 # WiFi Configuration
 # IMPORTANT: Replace these with your WiFi credentials
 WIFI_SSID = "YOUR_WIFI_SSID"
@@ -29,48 +36,31 @@ WIFI_PASSWORD = "YOUR_WIFI_PASSWORD"
 led = machine.Pin("LED", machine.Pin.OUT)
 
 
-def connect_wifi(ssid, password, timeout=10):
+def connect_wifi(wifi, timeout=10):
     """
     Connect to a WiFi network.
 
     Args:
-        ssid (str): WiFi network name
-        password (str): WiFi password
+        wifi (WiFi): WiFi connection
         timeout (int): Connection timeout in seconds
 
     Returns:
         bool: True if connected, False otherwise
     """
-    # Initialize WiFi interface in station mode
-    wlan = network.WLAN(network.STA_IF)
-    wlan.active(True)
-
     # Check if already connected
-    if wlan.isconnected():
+    if wifi.isconnected():
         print("Already connected to WiFi")
-        print_connection_info(wlan)
+        print_connection_info(wifi.wlan)
         return True
 
-    print(f"Connecting to WiFi: {ssid}")
-    wlan.connect(ssid, password)
-
-    # Wait for connection with timeout
-    start_time = time.time()
-    while not wlan.isconnected():
-        # Blink LED while connecting
-        led.toggle()
-        time.sleep(0.2)
-
-        # Check timeout
-        if time.time() - start_time > timeout:
-            print(f"Connection timeout after {timeout} seconds")
-            led.off()
-            return False
+    if not wifi.connect(timeout):
+        print(f"Could not connect to {wifi.ssid}")
+        return False
 
     # Connection successful
     led.on()
     print("WiFi connected successfully!")
-    print_connection_info(wlan)
+    print_connection_info(wifi.wlan)
     return True
 
 
@@ -111,23 +101,29 @@ def print_connection_info(wlan):
         print("Not connected to WiFi")
 
 
-def check_connection_status():
-    """
-    Continuously check and display WiFi connection status.
+def check_connection_status(wifi):
     """
-    wlan = network.WLAN(network.STA_IF)
+    Continuously check and display WiFi connection status, and reconnect
+    when the connection drops.
 
+    Args:
+        wifi (WiFi): WiFi connection
+    """
     print("Monitoring WiFi connection status...")
     print("Press Ctrl+C to stop")
 
     try:
         while True:
-            if wlan.isconnected():
+            if wifi.isconnected():
                 led.on()
                 print("Status: CONNECTED")
             else:
                 led.off()
-                print("Status: NOT CONNECTED")
+                print("Status: NOT CONNECTED - reconnecting")
+                wifi.reconnect()
+                led.on()
+                print("Status: RECONNECTED")
+                continue
 
             time.sleep(2)
 
@@ -149,9 +145,10 @@ if __name__ == "__main__":
         led.off()
     else:
         # Attempt to connect to WiFi
-        if connect_wifi(WIFI_SSID, WIFI_PASSWORD, timeout=15):
+        wifi = WiFi(WIFI_SSID, WIFI_PASSWORD, led=led)
+        if connect_wifi(wifi, timeout=15):
             # Monitor connection status
-            check_connection_status()
+            check_connection_status(wifi)
         else:
             print("\nFailed to connect to WiFi")
             print("Please check your credentials and try again")
@@ -4,11 +4,23 @@ WiFi Signal Strength Monitor for Raspberry Pi Pico W
 This script connects to WiFi and continuously monitors the signal strength (RSSI),
 displaying it on the console.
 
+Besides the current value it keeps rolling statistics (minimum, maximum,
+mean, percentiles and an exponential moving average) over several windows,
+so short dropouts stay visible instead of vanishing in a lifetime average.
+The statistics use fixed-size arrays and run in constant memory.
+
+Samples are also logged to flash in a compact binary format (see
+lib/rssi_log.py), so a survey survives the Pico losing its USB connection.
+Copy the files to a computer and decode them with
+examples/rssi_log_decoder.py.
+
 Hardware:
 - Raspberry Pi Pico W (WiFi required)
 
 Configuration:
 - Update WIFI_SSID and WIFI_PASSWORD with your network credentials
+- Copy lib/rssi_log.py, lib/ticks.py and lib/wifi.py to the /lib folder
+  of your Pico
 
 Signal Strength Reference (RSSI in dBm):
 - -30 to -50 dBm: Excellent signal
@@ -24,9 +36,14 @@ Usage:
 3. Run it in Thonny
 """
 
-import network
 import time
 import machine
+from array import array
+
+# Copy lib/rssi_log.py, lib/ticks.py and lib/wifi.py to the /lib folder of
+# your Pico
+from rssi_log import RssiLogger
+from wifi import WiFi
 
 # WiFi Configuration
 WIFI_SSID = "YOUR_WIFI_SSID"
@@ -35,45 +52,29 @@ WIFI_PASSWORD = "YOUR_WIFI_PASSWORD"
 # Update interval in seconds
 UPDATE_INTERVAL = 2
 
-# LED for status indication
-led = machine.Pin("LED", machine.Pin.OUT)
+# Rolling statistics windows in samples; with UPDATE_INTERVAL = 2 they
+# cover the last 10 seconds, 1 minute and 5 minutes
+STATS_WINDOWS = (5, 30, 150)
 
+# Weight of a new sample in the moving average: 1 / 2**EMA_SHIFT
+EMA_SHIFT = 3
 
-def connect_wifi(ssid, password, timeout=15):
-    """
-    Connect to WiFi network.
-
-    Args:
-        ssid (str): WiFi network name
-        password (str): WiFi password
-        timeout (int): Connection timeout in seconds
-
-    Returns:
-        network.WLAN: WLAN object if connected, None otherwise
-    """
-    wlan = network.WLAN(network.STA_IF)
-    wlan.active(True)
+# Report a dropout when the shortest window's minimum is this many dB below
+# the longest window's mean
+DROPOUT_THRESHOLD = 10
 
-    if wlan.isconnected():
-        print("Already connected to WiFi")
-        return wlan
+# RSSI values are counted in 1 dB bins from 0 down to -127 dBm
+RSSI_LEVELS = 128
 
-    print(f"Connecting to {ssid}...")
-    wlan.connect(ssid, password)
+# Flash logging: 3 bytes per sample, written in batches of one flash page.
+# With 2 second samples a 64 KB file holds about 12 hours.
+LOG_ENABLED = True
+LOG_PATH = "rssi.bin"
+LOG_MAX_FILE_SIZE = 64 * 1024
+LOG_BACKUP_COUNT = 3
 
-    start_time = time.time()
-    while not wlan.isconnected():
-        led.toggle()
-        time.sleep(0.2)
-
-        if time.time() - start_time > timeout:
-            print("Connection timeout")
-            led.off()
-            return None
-
-    led.on()
-    print("Connected to WiFi")
-    return wlan
+# LED for status indication
+led = machine.Pin("LED", machine.Pin.OUT)
 
 
 def get_signal_strength(wlan):
@@ -155,13 +156,175 @@ def create_signal_bar(percentage, bar_length=20):
     return f"[{bar}]"
 
 
-def monitor_signal_strength(wlan, interval=2):
+class RssiStats:
+    """
+    Rolling RSSI statistics over several windows in fixed memory.
+
+    The latest samples are kept in an array('b') ring buffer sized for the
+    longest window. Each window has a running sum and a histogram with one
+    counter per dB, updated as samples enter and leave the window. Adding a
+    sample therefore takes constant time and allocates nothing; minimum,
+    maximum and percentiles are read from the histogram in at most
+    RSSI_LEVELS steps, at 1 dB resolution.
+
+    Windows are addressed by their index in `windows`. Query a window only
+    after at least one sample was added.
+    """
+
+    def __init__(self, windows=STATS_WINDOWS, ema_shift=EMA_SHIFT):
+        """
+        Args:
+            windows (tuple): Window lengths in samples, shortest first
+            ema_shift (int): A new sample weighs 1 / 2**ema_shift in the EMA
+        """
+        self.windows = windows
+        self.size = max(windows)
+        self.samples = array("b", [0] * self.size)
+        self.position = 0
+        self.count = 0
+        self.ema_shift = ema_shift
+        self._ema = 0  # Fixed point, 1/256 dBm
+
+        # Histogram bin = -RSSI, so the weakest signal has the highest bin
+        self._histograms = [array("H", [0] * RSSI_LEVELS) for _ in windows]
+        self._sums = [0] * len(windows)
+        self._weakest = [0] * len(windows)
+        self._strongest = [RSSI_LEVELS - 1] * len(windows)
+
+    def add(self, rssi):
+        """
+        Add a sample to all windows.
+
+        Args:
+            rssi (int): Signal strength in dBm, clamped to -127..0
+        """
+        level = min(max(-rssi, 0), RSSI_LEVELS - 1)
+
+        for index in range(len(self.windows)):
+            window = self.windows[index]
+            histogram = self._histograms[index]
+
+            histogram[level] += 1
+            self._sums[index] -= level
+            if level > self._weakest[index]:
+                self._weakest[index] = level
+            if level < self._strongest[index]:
+                self._strongest[index] = level
+
+            if self.count < window:
+                continue
+
+            # The sample `window` positions back leaves this window. The new
+            # sample is already counted, so the bound scans always stop.
+            old = -self.samples[(self.position - window) % self.size]
+            histogram[old] -= 1
+            self._sums[index] += old
+            if not histogram[old]:
+                if old == self._weakest[index]:
+                    while not histogram[old]:
+                        old -= 1
+                    self._weakest[index] = old
+                elif old == self._strongest[index]:
+                    while not histogram[old]:
+                        old += 1
+                    self._strongest[index] = old
+
+        self.samples[self.position] = -level
+        self.position = (self.position + 1) % self.size
+        if self.count < self.size:
+            self.count += 1
+
+        if self.count == 1:
+            self._ema = -level << 8
+        else:
+            self._ema += ((-level << 8) - self._ema) >> self.ema_shift
+
+    def window_count(self, index):
+        """Number of samples currently in a window."""
+        return min(self.count, self.windows[index])
+
+    def minimum(self, index):
+        """Weakest RSSI in a window, in dBm."""
+        return -self._weakest[index]
+
+    def maximum(self, index):
+        """Strongest RSSI in a window, in dBm."""
+        return -self._strongest[index]
+
+    def mean(self, index):
+        """Mean RSSI of a window, in dBm."""
+        return self._sums[index] / self.window_count(index)
+
+    def percentile(self, index, percent):
+        """
+        RSSI below or at which `percent` of a window's samples lie.
+
+        Args:
+            index (int): Window index
+            percent (int): Percentile, 0-100
+
+        Returns:
+            int: RSSI in dBm (nearest rank, 1 dB resolution)
+        """
+        histogram = self._histograms[index]
+        rank = max(1, (self.window_count(index) * percent + 99) // 100)
+        level = self._weakest[index]
+        seen = histogram[level]
+        while seen < rank:
+            level -= 1
+            seen += histogram[level]
+        return -level
+
+    @property
+    def ema(self):
+        """Exponential moving average of all samples, in dBm."""
+        return self._ema / 256
+
+
+def find_dropout(stats):
+    """
+    Compare the shortest window's minimum with the longest window's mean.
+
+    Args:
+        stats (RssiStats): Signal statistics
+
+    Returns:
+        float: dB by which the short-term minimum falls below the long-term
+            mean, or 0 if that is less than DROPOUT_THRESHOLD
+    """
+    longest = len(stats.windows) - 1
+    if stats.window_count(longest) <= stats.windows[0]:
+        # Both windows still hold the same samples
+        return 0
+    drop = stats.mean(longest) - stats.minimum(0)
+    return drop if drop >= DROPOUT_THRESHOLD else 0
+
+
+def print_window_stats(stats):
+    """
+    Print minimum, percentiles, maximum and mean of every window.
+
+    Args:
+        stats (RssiStats): Signal statistics
+    """
+    for index in range(len(stats.windows)):
+        print(f"Last {stats.window_count(index):>3}: "
+              f"min {stats.minimum(index)} | "
+              f"p10 {stats.percentile(index, 10)} | "
+              f"p50 {stats.percentile(index, 50)} | "
+              f"p90 {stats.percentile(index, 90)} | "
+              f"max {stats.maximum(index)} | "
+              f"mean {stats.mean(index):.1f} dBm")
+
+
+def monitor_signal_strength(wifi, interval=2, log=None):
     """
     Continuously monitor and display signal strength.
 
     Args:
-        wlan: WLAN object
+        wifi (WiFi): WiFi connection
         interval (float): Update interval in seconds
+        log (RssiLogger): Flash log for the samples, or None
     """
     print("\n" + "=" * 60)
     print("WiFi Signal Strength Monitor")
@@ -171,19 +334,23 @@ def monitor_signal_strength(wlan, interval=2):
     try:
         sample_count = 0
         rssi_sum = 0
+        stats = RssiStats()
 
         while True:
-            if not wlan.isconnected():
+            if not wifi.isconnected():
                 print("WiFi disconnected! Attempting to reconnect...")
                 led.off()
-                break
+                wifi.reconnect()
+                continue
 
-            rssi = get_signal_strength(wlan)
+            rssi = get_signal_strength(wifi.wlan)
 
             if rssi is not None:
                 sample_count += 1
                 rssi_sum += rssi
-                avg_rssi = rssi_sum / sample_count
+                stats.add(rssi)
+                if log is not None:
+                    log.add(rssi)
 
                 percentage = rssi_to_percentage(rssi)
                 quality = classify_signal(rssi)
@@ -195,7 +362,12 @@ def monitor_signal_strength(wlan, interval=2):
                 print(f"Quality: {quality}")
                 print(f"Percentage: {percentage}%")
                 print(f"Visual: {bar}")
-                print(f"Average RSSI: {avg_rssi:.1f} dBm")
+                print(f"Moving average: {stats.ema:.1f} dBm")
+                print_window_stats(stats)
+
+                drop = find_dropout(stats)
+                if drop:
+                    print(f"Dropout: {drop:.0f} dB below the long-term mean")
 
                 # Blink LED based on signal quality
                 led.on()
@@ -212,8 +384,15 @@ def monitor_signal_strength(wlan, interval=2):
         print(f"Total samples: {sample_count}")
         if sample_count > 0:
             print(f"Average RSSI: {rssi_sum / sample_count:.1f} dBm")
+            print_window_stats(stats)
         led.off()
 
+    finally:
+        if log is not None:
+            log.close()
+            print(f"Logged {log.sample_count} samples to {log.path} "
+                  f"in {log.write_count} flash writes")
+
 
 # Main execution
 if __name__ == "__main__":
@@ -225,16 +404,28 @@ if __name__ == "__main__":
         print("\nERROR: Please update WIFI_SSID and WIFI_PASSWORD")
         led.off()
     else:
-        wlan = connect_wifi(WIFI_SSID, WIFI_PASSWORD)
+        wifi = WiFi(WIFI_SSID, WIFI_PASSWORD, led=led)
+
+        if wifi.connect():
+            led.on()
 
-        if wlan:
             # Display connection info
-            status = wlan.ifconfig()
+            status = wifi.wlan.ifconfig()
             print(f"\nConnected to: {WIFI_SSID}")
             print(f"IP Address: {status[0]}")
 
+            log = None
+            if LOG_ENABLED:
+                # The log files are stamped with the clock, so set it first
+                try:
+                    import ntptime
+                    ntptime.settime()
+                except Exception as error:
+                    print(f"Could not set the clock: {error}")
+                log = RssiLogger(LOG_PATH, LOG_MAX_FILE_SIZE, LOG_BACKUP_COUNT)
+
             # Start monitoring
-            monitor_signal_strength(wlan, UPDATE_INTERVAL)
+            monitor_signal_strength(wifi, UPDATE_INTERVAL, log)
         else:
             print("\nFailed to connect to WiFi")
             led.off()
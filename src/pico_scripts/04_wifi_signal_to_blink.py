@@ -11,6 +11,8 @@ Hardware:
 
 Configuration:
 - Update WIFI_SSID and WIFI_PASSWORD with your network credentials
+- Copy lib/wifi.py, lib/ticks.py and lib/led.py to the /lib folder of your
+  Pico
 
 Blink Frequency Mapping:
 - Excellent signal (-30 to -50 dBm): Very fast (0.1s interval)
@@ -19,63 +21,38 @@ Blink Frequency Mapping:
 - Weak signal (-70 to -80 dBm): Slow (1.0s interval)
 - Very weak signal (below -80 dBm): Very slow (2.0s interval)
 
+The LED is toggled by a machine.Timer callback (TimerBlinker in lib/led.py),
+so the blink timing does not depend on the main loop. The main loop only
+samples the signal and retunes the timer's period when the blink interval
+changes.
+
 Usage:
 1. Edit the WiFi credentials below
-2. Save this file to your Raspberry Pi Pico W
+2. Save this file to your Raspberry Pi Pico W, and lib/wifi.py and
+   lib/led.py into its /lib folder
 3. Run it in Thonny or save as main.py for autostart
 """
 
-import network
 import time
 import machine
 
+# Copy lib/wifi.py, lib/ticks.py and lib/led.py to the /lib folder of your
+# Pico
+from led import TimerBlinker
+from wifi import WiFi
+
 # WiFi Configuration
 WIFI_SSID = "YOUR_WIFI_SSID"
 WIFI_PASSWORD = "YOUR_WIFI_PASSWORD"
 
-# Signal check interval (how often to update blink rate)
-SIGNAL_CHECK_INTERVAL = 5  # seconds
+# Signal check interval (how often to update blink rate). The LED reacts to
+# a new signal level within one interval.
+SIGNAL_CHECK_INTERVAL = 1  # seconds
 
 # LED
 led = machine.Pin("LED", machine.Pin.OUT)
 
 
-def connect_wifi(ssid, password, timeout=15):
-    """
-    Connect to WiFi network.
-
-    Args:
-        ssid (str): WiFi network name
-        password (str): WiFi password
-        timeout (int): Connection timeout in seconds
-
-    Returns:
-        network.WLAN: WLAN object if connected, None otherwise
-    """
-    wlan = network.WLAN(network.STA_IF)
-    wlan.active(True)
-
-    if wlan.isconnected():
-        print("Already connected to WiFi")
-        return wlan
-
-    print(f"Connecting to {ssid}...")
-    wlan.connect(ssid, password)
-
-    start_time = time.time()
-    while not wlan.isconnected():
-        led.toggle()
-        time.sleep(0.2)
-
-        if time.time() - start_time > timeout:
-            print("Connection timeout")
-            led.off()
-            return None
-
-    print("Connected to WiFi!")
-    return wlan
-
-
 def get_signal_strength(wlan):
     """
     Get WiFi signal strength (RSSI).
@@ -117,13 +94,13 @@ def rssi_to_blink_interval(rssi):
         return (2.0, "Very Weak")
 
 
-def blink_with_signal(wlan):
+def blink_with_signal(wifi):
     """
     Blink LED based on WiFi signal strength.
     Updates blink rate periodically based on signal strength.
 
     Args:
-        wlan: WLAN object
+        wifi (WiFi): WiFi connection
     """
     print("\n" + "=" * 60)
     print("WiFi Signal Strength to LED Blink Converter")
@@ -136,53 +113,45 @@ def blink_with_signal(wlan):
     print("  - Very slow = Very weak signal")
     print("\nPress Ctrl+C to stop\n")
 
-    last_check_time = 0
-    current_interval = 1.0
+    blinker = TimerBlinker(led)
     current_quality = "Unknown"
+    reported_blinks = 0
 
     try:
-        blink_count = 0
-
         while True:
             # Check if WiFi is still connected
-            if not wlan.isconnected():
+            if not wifi.isconnected():
                 print("\nWiFi disconnected!")
                 # Flash rapidly to indicate disconnection
-                for _ in range(10):
-                    led.toggle()
-                    time.sleep(0.05)
-                led.off()
-                break
+                blinker.set_interval(0.1)
+                time.sleep(1)
+                blinker.stop()
+                wifi.reconnect()
+                continue
 
             # Update blink interval based on signal strength
-            current_time = time.time()
-            if current_time - last_check_time >= SIGNAL_CHECK_INTERVAL:
-                rssi = get_signal_strength(wlan)
-                current_interval, current_quality = rssi_to_blink_interval(rssi)
+            rssi = get_signal_strength(wifi.wlan)
+            interval, quality = rssi_to_blink_interval(rssi)
+            if interval != blinker.interval:
+                blinker.set_interval(interval)
+                current_quality = quality
 
                 print(f"\nSignal Update:")
                 print(f"  RSSI: {rssi} dBm")
                 print(f"  Quality: {current_quality}")
-                print(f"  Blink interval: {current_interval}s")
-
-                last_check_time = current_time
-
-            # Blink LED at current interval
-            led.on()
-            time.sleep(current_interval / 2)
-
-            led.off()
-            time.sleep(current_interval / 2)
-
-            blink_count += 1
+                print(f"  Blink interval: {interval}s")
 
             # Print status every 20 blinks
-            if blink_count % 20 == 0:
-                print(f"Blinking ({current_quality}): {blink_count} blinks")
+            blink_count = blinker.blink_count
+            if blink_count - reported_blinks >= 20:
+                reported_blinks = blink_count - blink_count % 20
+                print(f"Blinking ({current_quality}): {reported_blinks} blinks")
+
+            time.sleep(SIGNAL_CHECK_INTERVAL)
 
     except KeyboardInterrupt:
-        print(f"\n\nStopped by user after {blink_count} blinks")
-        led.off()
+        print(f"\n\nStopped by user after {blinker.blink_count} blinks")
+        blinker.stop()
 
 
 def run_demo_mode():
@@ -202,24 +171,23 @@ def run_demo_mode():
         (-85, "Very Weak", 2.0)
     ]
 
+    blinker = TimerBlinker(led)
+
     try:
         for rssi, quality, interval in signal_levels:
             print(f"\nSimulating {quality} signal ({rssi} dBm, {interval}s interval)")
 
-            for i in range(10):
-                led.on()
-                time.sleep(interval / 2)
-                led.off()
-                time.sleep(interval / 2)
-
+            # 10 blinks at this level, then a pause
+            blinker.set_interval(interval)
+            time.sleep(10 * interval)
+            blinker.stop()
             time.sleep(1)
 
         print("\nDemo completed!")
-        led.off()
 
     except KeyboardInterrupt:
         print("\nDemo stopped by user")
-        led.off()
+        blinker.stop()
 
 
 # Main execution
@@ -239,15 +207,15 @@ if __name__ == "__main__":
         print("Or set DEMO_MODE = True to run without WiFi")
         led.off()
     else:
-        wlan = connect_wifi(WIFI_SSID, WIFI_PASSWORD)
+        wifi = WiFi(WIFI_SSID, WIFI_PASSWORD, led=led)
 
-        if wlan:
-            status = wlan.ifconfig()
+        if wifi.connect():
+            status = wifi.wlan.ifconfig()
             print(f"Connected to: {WIFI_SSID}")
             print(f"IP Address: {status[0]}")
 
             # Start blinking based on signal strength
-            blink_with_signal(wlan)
+            blink_with_signal(wifi)
         else:
             print("\nFailed to connect to WiFi")
             print("Set DEMO_MODE = True to run demo without WiFi")
@@ -5,6 +5,17 @@ This script queries the Number Transmitter API over WiFi and displays
 the transmitted number both on the console and by blinking the LED.
 The LED blinks N times where N is the current number from the API.
 
+The device keeps its own copy of the number schedule: each API answer
+says how long the current number remains valid (next_change_in), so the
+number is advanced locally at every predicted change and the API is only
+asked every SYNC_INTERVAL seconds to correct the clock.
+
+The work is split into concurrent uasyncio tasks:
+- Clock sync: queries the API over one kept-alive connection
+- Number ticker: advances the number at each predicted change
+- LED renderer: always blinks the latest number, restarting on changes
+- Connection watchdog: notices WiFi drop-outs and reconnects
+
 Hardware:
 - Raspberry Pi Pico W (WiFi required)
 - Onboard LED
@@ -16,15 +27,25 @@ Configuration:
 Usage:
 1. Ensure the Number Transmitter API is running
 2. Edit the configuration below
-3. Save this file to your Raspberry Pi Pico W
+3. Save this file, lib/http_client.py, lib/number_parser.py, lib/ticks.py
+   and lib/wifi.py (into /lib) to your Raspberry Pi Pico W
 4. Run it in Thonny or save as main.py for autostart
 """
 
-import network
 import time
 import machine
-import ujson
-import urequests
+
+try:
+    import uasyncio as asyncio
+except ImportError:
+    import asyncio
+
+# Copy lib/http_client.py, lib/number_parser.py, lib/ticks.py and lib/wifi.py
+# to the /lib folder of your Pico
+from http_client import HTTPClient
+from number_parser import NumberReading, parse_number_response
+from ticks import ticks_ms, ticks_add, ticks_diff
+from wifi import WiFi
 
 # WiFi Configuration
 WIFI_SSID = "YOUR_WIFI_SSID"
@@ -34,184 +55,426 @@ WIFI_PASSWORD = "YOUR_WIFI_PASSWORD"
 API_BASE_URL = "http://192.168.1.100:5001"  # Update with your API server IP
 API_ENDPOINT = "/api/number"
 
-# Query interval in seconds
-QUERY_INTERVAL = 2
+# Number sequence: 1-9, changing every second
+SEQUENCE_LENGTH = 9
+TICK_MS = 1000
+
+# How often the local clock is corrected against the API, in seconds
+SYNC_INTERVAL = 10
+
+# Delay before retrying a failed sync, in seconds
+RETRY_INTERVAL = 1
+
+# Request timeout in seconds
+REQUEST_TIMEOUT = 5
+
+# How often the watchdog checks the WiFi connection, in seconds
+WATCHDOG_INTERVAL = 1
 
 # LED
 led = machine.Pin("LED", machine.Pin.OUT)
 
 
-def connect_wifi(ssid, password, timeout=15):
+class ConsumerState:
+    """
+    State shared between the uasyncio tasks.
+
+    The schedule is ``tick`` (position in the endless sequence,
+    total_cycles * SEQUENCE_LENGTH + number - 1) and ``boundary_at``, the
+    ticks_ms() time at which it ends. The ticker and the clock sync set
+    ``changed`` when the number changes so that the LED renderer picks it
+    up at once; the sync sets ``rescheduled`` when it moves the boundary.
+    """
+
+    def __init__(self):
+        self.tick = None
+        self.boundary_at = None
+        self.number = None
+        self.total_cycles = None
+        self.connected = False
+        self.query_count = 0
+        self.error_count = 0
+        self.request_failed = False
+        self.changed = asyncio.Event()
+        self.rescheduled = asyncio.Event()
+
+
+def set_tick(state, tick):
     """
-    Connect to WiFi network.
+    Move the shared state to a new position in the sequence.
 
     Args:
-        ssid (str): WiFi network name
-        password (str): WiFi password
-        timeout (int): Connection timeout in seconds
+        state (ConsumerState): Shared state
+        tick (int): New position, total_cycles * SEQUENCE_LENGTH + number - 1
+    """
+    old_number = state.number
+    state.tick = tick
+    state.number = tick % SEQUENCE_LENGTH + 1
+    state.total_cycles = tick // SEQUENCE_LENGTH
+    print("Number changed:", old_number, "->", state.number)
+    state.changed.set()
+
+
+def apply_sync(state, reading, sent_at, received_at):
+    """
+    Correct the local schedule with an API answer.
+
+    The server answered roughly halfway through the round trip, so the
+    next change is expected next_change_in after that moment. An answer
+    whose boundary has already passed is rolled forward.
+
+    Args:
+        state (ConsumerState): Shared state
+        reading (NumberReading): Parsed API response
+        sent_at (int): ticks_ms() when the request was sent
+        received_at (int): ticks_ms() when the response arrived
 
     Returns:
-        network.WLAN: WLAN object if connected, None otherwise
+        int: Correction of the predicted boundary in milliseconds
+            (positive: the local clock was late), or None on first sync
     """
-    wlan = network.WLAN(network.STA_IF)
-    wlan.active(True)
+    rtt = ticks_diff(received_at, sent_at)
+    tick = reading.total_cycles * SEQUENCE_LENGTH + reading.number - 1
+    boundary_at = ticks_add(received_at, reading.next_change_ms - rtt // 2)
 
-    if wlan.isconnected():
-        print("Already connected to WiFi")
-        return wlan
+    while ticks_diff(boundary_at, received_at) <= 0:
+        tick += 1
+        boundary_at = ticks_add(boundary_at, TICK_MS)
 
-    print(f"Connecting to {ssid}...")
-    wlan.connect(ssid, password)
+    correction = None
+    if state.tick is not None:
+        # Local prediction for the end of the same tick
+        predicted_at = ticks_add(state.boundary_at, (tick - state.tick) * TICK_MS)
+        correction = ticks_diff(predicted_at, boundary_at)
 
-    start_time = time.time()
-    while not wlan.isconnected():
-        led.toggle()
-        time.sleep(0.2)
+    state.boundary_at = boundary_at
+    if tick != state.tick:
+        set_tick(state, tick)
+    state.rescheduled.set()
+    return correction
 
-        if time.time() - start_time > timeout:
-            print("Connection timeout")
-            led.off()
-            return None
 
-    led.on()
-    time.sleep(0.5)
-    led.off()
-    print("Connected to WiFi!")
-    return wlan
+def parse_url(url):
+    """
+    Split an http:// URL into host, port and path.
+
+    Args:
+        url (str): URL such as ``http://192.168.1.100:5001/api/number``
+
+    Returns:
+        tuple: (host, port, path)
+    """
+    if url.startswith("http://"):
+        url = url[7:]
+    host, _, path = url.partition("/")
+    host, _, port = host.partition(":")
+    return host, int(port) if port else 80, "/" + path
 
 
-def query_api(url):
+async def query_api(client, path, reading):
     """
-    Query the Number Transmitter API.
+    Query the Number Transmitter API without blocking other tasks.
+
+    The response is parsed in place in the client's receive buffer, so a
+    poll allocates no dict, strings or floats.
 
     Args:
-        url (str): Full API endpoint URL
+        client (HTTPClient): Keep-alive client for the API server
+        path (str): API endpoint path
+        reading (NumberReading): Receives the parsed fields
 
     Returns:
-        dict: API response data, or None if request failed
+        bool: True if `reading` was updated, False if the request failed
     """
     try:
-        response = urequests.get(url, timeout=5)
+        status_code, body = await client.get(path)
 
-        if response.status_code == 200:
-            data = response.json()
-            response.close()
-            return data
+        if status_code == 200:
+            if parse_number_response(body, reading):
+                return True
+            print("Incomplete API response")
+            return False
         else:
-            print(f"API error: HTTP {response.status_code}")
-            response.close()
-            return None
+            print("API error: HTTP", status_code)
+            return False
 
     except Exception as error:
-        print(f"Request failed: {error}")
-        return None
+        print(f"Request failed: {error!r}")
+        return False
+
+
+async def wait_for_change(state, timeout):
+    """
+    Sleep for up to `timeout` seconds, waking early on a new number.
+
+    Args:
+        state (ConsumerState): Shared state
+        timeout (float): Maximum time to wait in seconds
+
+    Returns:
+        bool: True if a new number arrived while waiting
+    """
+    try:
+        await asyncio.wait_for(state.changed.wait(), timeout)
+        return True
+    except asyncio.TimeoutError:
+        return False
 
 
-def blink_number(number, blink_speed=0.2):
+async def blink_number(state, number, blink_speed=0.2, duration=0.8):
     """
     Blink LED N times to represent the number.
 
+    The blinks are squeezed into `duration` seconds so that the pattern
+    finishes before the number changes, and it is cut short as soon as a new
+    number arrives.
+
     Args:
+        state (ConsumerState): Shared state
         number (int): Number to represent (1-9)
-        blink_speed (float): Speed of each blink in seconds
+        blink_speed (float): Longest on/off time of each blink in seconds
+        duration (float): Time the whole pattern may take in seconds
+
+    Returns:
+        bool: True if the pattern was interrupted by a new number
     """
-    for i in range(number):
-        led.on()
-        time.sleep(blink_speed)
+    half_period = min(blink_speed, duration / (2 * number))
+    try:
+        for i in range(number):
+            led.on()
+            if await wait_for_change(state, half_period):
+                return True
+            led.off()
+            if await wait_for_change(state, half_period):
+                return True
+        return False
+    finally:
         led.off()
-        time.sleep(blink_speed)
 
 
-def display_api_data(data):
+SEPARATOR = "-" * 50
+
+
+def display_api_data(reading):
     """
     Display API data on console.
 
+    Values are passed to print() separately instead of being formatted
+    into new strings, since this runs on every poll.
+
     Args:
-        data (dict): API response data
+        reading (NumberReading): Parsed API response
     """
-    print("\n" + "-" * 50)
-    print(f"Current Number: {data.get('number', 'N/A')}")
-    print(f"Timestamp: {data.get('timestamp', 'N/A')}")
-    print(f"Total Cycles: {data.get('total_cycles', 'N/A')}")
-    print(f"Next change in: {data.get('next_change_in', 'N/A'):.2f}s")
-    print("-" * 50)
+    print()
+    print(SEPARATOR)
+    print("Current Number:", reading.number)
+    print("Total Cycles:", reading.total_cycles)
+    print("Next change in:", reading.next_change_ms, "ms")
+    print(SEPARATOR)
 
 
-def monitor_api(wlan, api_url, interval=2):
+async def clock_sync(state, client, path, interval=SYNC_INTERVAL):
     """
-    Continuously query API and display results.
+    Task: query the API now and then to correct the local schedule.
+
+    Queries are timed halfway between two number changes.
 
     Args:
-        wlan: WLAN object
-        api_url (str): Full API endpoint URL
-        interval (float): Query interval in seconds
+        state (ConsumerState): Shared state
+        client (HTTPClient): Keep-alive client for the API server
+        path (str): API endpoint path
+        interval (float): Seconds between successful syncs
     """
-    print("\n" + "=" * 60)
-    print("Number Transmitter API Consumer")
-    print("=" * 60)
-    print(f"API URL: {api_url}")
-    print(f"Query interval: {interval} seconds")
-    print("Press Ctrl+C to stop\n")
+    # Allocated once and refilled by every poll
+    reading = NumberReading()
 
-    query_count = 0
-    error_count = 0
-    last_number = None
+    while True:
+        if not state.connected:
+            # The watchdog is reconnecting; don't waste time on requests
+            await asyncio.sleep(RETRY_INTERVAL)
+            continue
 
-    try:
-        while True:
-            # Check WiFi connection
-            if not wlan.isconnected():
-                print("\nWiFi disconnected!")
-                for _ in range(5):
-                    led.toggle()
-                    time.sleep(0.1)
+        print("Sync #", state.query_count + 1, "...", sep="", end=" ")
+        sent_at = ticks_ms()
+        ok = await query_api(client, path, reading)
+        received_at = ticks_ms()
+
+        if ok and 1 <= reading.number <= SEQUENCE_LENGTH:
+            state.query_count += 1
+
+            # Display data
+            display_api_data(reading)
+
+            correction = apply_sync(state, reading, sent_at, received_at)
+            if correction is not None:
+                print("Clock correction:", correction, "ms")
+
+            wake_at = ticks_add(state.boundary_at, int(interval * 1000) - TICK_MS // 2)
+            await asyncio.sleep(max(0, ticks_diff(wake_at, ticks_ms())) / 1000)
+            continue
+
+        if ok:
+            print("Invalid number from API")
+        else:
+            state.error_count += 1
+            print(f"Failed (Error #{state.error_count})")
+
+            # Let the renderer flash the LED to indicate the error
+            state.request_failed = True
+            state.changed.set()
+
+        await asyncio.sleep(RETRY_INTERVAL)
+
+
+async def number_ticker(state):
+    """
+    Task: advance the number at each predicted change.
+
+    Sleeps until the predicted boundary and wakes early when a sync moves
+    it. The next boundary is always computed from the previous one, so a
+    late wake-up does not shift the schedule.
+
+    Args:
+        state (ConsumerState): Shared state
+    """
+    while True:
+        state.rescheduled.clear()
+
+        if state.boundary_at is None:
+            # Not synced yet
+            await state.rescheduled.wait()
+            continue
+
+        delay = ticks_diff(state.boundary_at, ticks_ms())
+        if delay > 0:
+            try:
+                await asyncio.wait_for(state.rescheduled.wait(), delay / 1000)
+            except asyncio.TimeoutError:
+                pass
+            continue
+
+        state.boundary_at = ticks_add(state.boundary_at, TICK_MS)
+        set_tick(state, state.tick + 1)
+
+
+async def led_renderer(state, blink_speed=0.2):
+    """
+    Task: blink the latest number on the LED.
+
+    A new number interrupts the current pattern immediately. Failed
+    requests show as 3 rapid flashes; while WiFi is down, the LED
+    flickers continuously instead.
+
+    Args:
+        state (ConsumerState): Shared state
+        blink_speed (float): Longest on/off time of each blink in seconds
+    """
+    while True:
+        if not state.connected:
+            led.toggle()
+            await asyncio.sleep(0.1)
+            continue
+
+        state.changed.clear()
+
+        if state.request_failed:
+            # Flash LED to indicate error
+            state.request_failed = False
+            for _ in range(3):
+                led.on()
+                await asyncio.sleep(0.1)
                 led.off()
-                break
+                await asyncio.sleep(0.1)
+            continue
 
-            # Query API
-            print(f"Query #{query_count + 1}...", end=" ")
-            data = query_api(api_url)
+        if state.number is None:
+            await wait_for_change(state, 0.5)
+            continue
 
-            if data:
-                query_count += 1
-                current_number = data.get('number')
+        print("Blinking", state.number, "times...")
+        if not await blink_number(state, state.number, blink_speed):
+            # Pattern finished; stay dark until the next number
+            await wait_for_change(state, 1)
 
-                # Display data
-                display_api_data(data)
 
-                # Blink LED to represent the number
-                if current_number and 1 <= current_number <= 9:
-                    print(f"Blinking {current_number} times...")
-                    blink_number(current_number)
+async def connection_watchdog(wifi, state, interval=WATCHDOG_INTERVAL):
+    """
+    Task: watch the WiFi connection and reconnect after drop-outs.
 
-                    # Check if number changed
-                    if last_number != current_number:
-                        print(f"Number changed: {last_number} -> {current_number}")
+    Args:
+        wifi (WiFi): WiFi connection
+        state (ConsumerState): Shared state
+        interval (float): Check interval in seconds
+    """
+    while True:
+        if wifi.isconnected():
+            if not state.connected:
+                print("\nWiFi connected")
+                state.connected = True
+            await asyncio.sleep(interval)
+            continue
 
-                    last_number = current_number
-                else:
-                    print("Invalid number from API")
+        print("\nWiFi disconnected! Reconnecting...")
+        state.connected = False
+        # Retries with backoff; the other tasks keep running meanwhile
+        await wifi.reconnect_async()
 
-            else:
-                error_count += 1
-                print(f"Failed (Error #{error_count})")
 
-                # Flash LED to indicate error
-                for _ in range(3):
-                    led.on()
-                    time.sleep(0.1)
-                    led.off()
-                    time.sleep(0.1)
+async def run_tasks(wifi, state, api_url, interval):
+    """
+    Run the clock sync, number ticker, LED renderer and watchdog
+    concurrently.
+
+    Args:
+        wifi (WiFi): WiFi connection
+        state (ConsumerState): Shared state
+        api_url (str): Full API endpoint URL
+        interval (float): Seconds between syncs
+    """
+    host, port, path = parse_url(api_url)
+    client = HTTPClient(host, port, REQUEST_TIMEOUT)
+
+    # The LED renderer shows the connection state from now on
+    wifi.led = None
+    state.connected = wifi.isconnected()
+    await asyncio.gather(
+        clock_sync(state, client, path, interval),
+        number_ticker(state),
+        led_renderer(state),
+        connection_watchdog(wifi, state),
+    )
 
-            # Wait before next query
-            time.sleep(interval)
+
+def monitor_api(wifi, api_url, interval=SYNC_INTERVAL):
+    """
+    Follow the API's number schedule and display results.
+
+    Args:
+        wifi (WiFi): WiFi connection
+        api_url (str): Full API endpoint URL
+        interval (float): Seconds between syncs
+    """
+    print("\n" + "=" * 60)
+    print("Number Transmitter API Consumer")
+    print("=" * 60)
+    print(f"API URL: {api_url}")
+    print(f"Sync interval: {interval} seconds")
+    print("Press Ctrl+C to stop\n")
+
+    state = ConsumerState()
+
+    try:
+        asyncio.run(run_tasks(wifi, state, api_url, interval))
 
     except KeyboardInterrupt:
+        query_count = state.query_count
+        error_count = state.error_count
         print(f"\n\nStopped by user")
         print(f"Statistics:")
-        print(f"  Total queries: {query_count}")
+        print(f"  Total syncs: {query_count}")
         print(f"  Errors: {error_count}")
-        print(f"  Success rate: {(query_count / (query_count + error_count) * 100):.1f}%")
+        if query_count + error_count > 0:
+            print(f"  Success rate: {(query_count / (query_count + error_count) * 100):.1f}%")
         led.off()
 
 
@@ -227,11 +490,20 @@ def test_api_connection(api_url):
     """
     print(f"\nTesting API connection to {api_url}...")
 
-    data = query_api(api_url)
+    host, port, path = parse_url(api_url)
+    client = HTTPClient(host, port, REQUEST_TIMEOUT)
 
-    if data:
+    reading = NumberReading()
+
+    async def query_once():
+        try:
+            return await query_api(client, path, reading)
+        finally:
+            await client.close()
+
+    if asyncio.run(query_once()):
         print("API connection successful!")
-        print(f"Current number from API: {data.get('number')}")
+        print(f"Current number from API: {reading.number}")
         return True
     else:
         print("API connection failed!")
@@ -251,10 +523,13 @@ if __name__ == "__main__":
         led.off()
     else:
         # Connect to WiFi
-        wlan = connect_wifi(WIFI_SSID, WIFI_PASSWORD)
+        wifi = WiFi(WIFI_SSID, WIFI_PASSWORD, led=led)
 
-        if wlan:
-            status = wlan.ifconfig()
+        if wifi.connect():
+            led.on()
+            time.sleep(0.5)
+            led.off()
+            status = wifi.wlan.ifconfig()
             print(f"\nConnected to: {WIFI_SSID}")
             print(f"Pico IP Address: {status[0]}")
 
@@ -265,7 +540,7 @@ if __name__ == "__main__":
             if test_api_connection(full_api_url):
                 # Start monitoring
                 time.sleep(2)
-                monitor_api(wlan, full_api_url, QUERY_INTERVAL)
+                monitor_api(wifi, full_api_url, SYNC_INTERVAL)
             else:
                 print("\nCannot proceed without API connection")
                 print("Please check:")
@@ -11,8 +11,14 @@ Hardware:
 Features:
 - Creates a WiFi access point
 - Serves a web interface on the access point's IP
-- Allows LED control via web buttons
-- Simple HTTP server implementation
+- Allows LED control via web buttons, updated with fetch() without
+  reloading the page
+- Small JSON API: GET/POST /api/led, GET /api/status
+- uasyncio HTTP server: several clients at once, with timeouts and
+  keep-alive, so one slow browser cannot block the others
+- Bounded request parsing into a fixed buffer per connection; oversized,
+  slow or malformed requests are rejected early
+- Short heartbeat blink on the LED while the server is running
 
 Default Access Point Settings:
 - SSID: PicoW-LED-Control
@@ -25,24 +31,72 @@ Usage:
 3. Connect to the "PicoW-LED-Control" WiFi network (password: pico12345)
 4. Open browser and navigate to http://192.168.4.1
 5. Use the web interface to control the LED
+
+JSON API:
+- GET  /api/led     -> {"led": true}
+- POST /api/led     with body {"led": true} or {"led": false}
+- GET  /api/status  -> LED state, uptime and server statistics
 """
 
+import sys
 import network
-import socket
 import time
 import machine
 
+try:
+    import uasyncio as asyncio
+except ImportError:
+    import asyncio
+
+try:
+    import ujson as json
+except ImportError:
+    import json
+
 # Access Point Configuration
 AP_SSID = "PicoW-LED-Control"
 AP_PASSWORD = "pico12345"  # Minimum 8 characters required
 AP_CHANNEL = 11
 
+# Web Server Configuration
+WEB_PORT = 80
+MAX_CONNECTIONS = 8       # Open connections at once; when all are busy
+                          # and none is idle, more get 503
+REQUEST_TIMEOUT = 5       # Seconds a client may take to send a request
+                          # or to accept a response
+KEEPALIVE_TIMEOUT = 5     # Seconds an idle keep-alive connection stays open
+KEEPALIVE_MAX = 20        # Requests per keep-alive connection
+SEND_CHUNK_SIZE = 1024    # Bytes handed to the socket at once
+MAX_HEADER_SIZE = 1024    # Largest accepted request line plus headers
+MAX_HEADERS = 32          # Largest accepted number of header lines
+MAX_BODY_SIZE = 256       # Largest accepted request body in bytes
+
+# Heartbeat blink interval in seconds
+HEARTBEAT_INTERVAL = 2
+
 # LED
 led = machine.Pin("LED", machine.Pin.OUT)
 
 # LED state
 led_state = False
 
+# Start time for the uptime in /api/status
+start_time = time.time()
+
+# Keep-alive connections waiting for their next request, longest idle first
+idle_connections = []
+
+# Server statistics
+stats = {
+    "connections": 0,
+    "requests": 0,
+    "active": 0,
+    "rejected": 0,
+    "evicted": 0,
+    "timeouts": 0,
+    "bad_requests": 0,
+}
+
 
 def create_access_point(ssid, password, channel=11):
     """
@@ -94,29 +148,33 @@ def create_access_point(ssid, password, channel=11):
     return ap
 
 
-def generate_html():
+def _build_page(ssid):
     """
-    Generate HTML page for LED control.
+    Encode the LED control page once, at start-up.
+
+    The page is split where the LED state goes, so a request only has to
+    pick the right fragments instead of formatting and encoding the whole
+    page again. The template text itself is not needed afterwards.
+
+    Args:
+        ssid (str): Access point name shown on the page
 
     Returns:
-        str: HTML content
+        dict: LED state -> tuple of bytes fragments forming the page
     """
-    led_status = "ON" if led_state else "OFF"
-    led_color = "#4CAF50" if led_state else "#f44336"
-
-    html = f"""<!DOCTYPE html>
+    template = """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Pico W LED Control</title>
     <style>
-        * {{
+        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
-        body {{
+        }
+        body {
             font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             min-height: 100vh;
@@ -124,8 +182,8 @@ def generate_html():
             justify-content: center;
             align-items: center;
             padding: 20px;
-        }}
-        .container {{
+        }
+        .container {
             background: white;
             border-radius: 20px;
             box-shadow: 0 20px 60px rgba(0, 0, 0, 0.3);
@@ -133,17 +191,17 @@ def generate_html():
             max-width: 500px;
             width: 100%;
             text-align: center;
-        }}
-        h1 {{
+        }
+        h1 {
             color: #333;
             margin-bottom: 10px;
-        }}
-        .subtitle {{
+        }
+        .subtitle {
             color: #666;
             margin-bottom: 30px;
-        }}
-        .led-status {{
-            background: {led_color};
+        }
+        .led-status {
+            background: %LED_COLOR%;
             color: white;
             padding: 20px;
             border-radius: 10px;
@@ -151,13 +209,13 @@ def generate_html():
             font-weight: bold;
             margin: 20px 0;
             box-shadow: 0 5px 15px rgba(0, 0, 0, 0.2);
-        }}
-        .controls {{
+        }
+        .controls {
             display: flex;
             gap: 15px;
             margin: 30px 0;
-        }}
-        .btn {{
+        }
+        .btn {
             flex: 1;
             padding: 15px;
             font-size: 1.1rem;
@@ -169,41 +227,41 @@ def generate_html():
             text-decoration: none;
             display: inline-block;
             color: white;
-        }}
-        .btn:hover {{
+        }
+        .btn:hover {
             transform: translateY(-2px);
             box-shadow: 0 5px 15px rgba(0, 0, 0, 0.2);
-        }}
-        .btn-on {{
+        }
+        .btn-on {
             background: #4CAF50;
-        }}
-        .btn-on:hover {{
+        }
+        .btn-on:hover {
             background: #45a049;
-        }}
-        .btn-off {{
+        }
+        .btn-off {
             background: #f44336;
-        }}
-        .btn-off:hover {{
+        }
+        .btn-off:hover {
             background: #da190b;
-        }}
-        .info {{
+        }
+        .info {
             background: #f7fafc;
             border-radius: 10px;
             padding: 20px;
             margin-top: 20px;
             text-align: left;
-        }}
-        .info p {{
+        }
+        .info p {
             color: #4a5568;
             margin: 8px 0;
-        }}
-        footer {{
+        }
+        footer {
             margin-top: 20px;
             padding-top: 20px;
             border-top: 2px solid #e2e8f0;
             color: #718096;
             font-size: 0.9rem;
-        }}
+        }
     </style>
 </head>
 <body>
@@ -211,17 +269,17 @@ def generate_html():
         <h1>🔌 Pico W LED Control</h1>
         <p class="subtitle">Raspberry Pi Pico W Access Point</p>
 
-        <div class="led-status">
-            LED: {led_status}
+        <div class="led-status" id="led-status">
+            LED: <span id="led-text">%LED_STATUS%</span>
         </div>
 
         <div class="controls">
-            <a href="/led/on" class="btn btn-on">Turn ON</a>
-            <a href="/led/off" class="btn btn-off">Turn OFF</a>
+            <a href="/led/on" class="btn btn-on" data-led="on">Turn ON</a>
+            <a href="/led/off" class="btn btn-off" data-led="off">Turn OFF</a>
         </div>
 
         <div class="info">
-            <p><strong>Network:</strong> {AP_SSID}</p>
+            <p><strong>Network:</strong> %AP_SSID%</p>
             <p><strong>Device:</strong> Raspberry Pi Pico W</p>
             <p><strong>Status:</strong> Connected</p>
         </div>
@@ -230,80 +288,697 @@ def generate_html():
             <p>Seminar: Nummernsender im Internet</p>
         </footer>
     </div>
+    <script>
+        const statusBox = document.getElementById("led-status");
+        const statusText = document.getElementById("led-text");
+
+        function showLed(data) {
+            statusText.textContent = data.led ? "ON" : "OFF";
+            statusBox.style.background = data.led ? "#4CAF50" : "#f44336";
+        }
+
+        // Switch the LED through the JSON API instead of loading the page
+        document.querySelectorAll("[data-led]").forEach((button) => {
+            button.addEventListener("click", (event) => {
+                event.preventDefault();
+                fetch("/api/led", {
+                    method: "POST",
+                    headers: {"Content-Type": "application/json"},
+                    body: JSON.stringify({led: button.dataset.led === "on"})
+                }).then((response) => response.json()).then(showLed).catch(() => {});
+            });
+        });
+
+        // Pick up changes made from other devices
+        setInterval(() => {
+            if (!document.hidden) {
+                fetch("/api/led").then((response) => response.json()).then(showLed).catch(() => {});
+            }
+        }, 5000);
+    </script>
 </body>
 </html>
 """
-    return html
 
+    head, rest = template.replace("%AP_SSID%", ssid).split("%LED_COLOR%")
+    middle, tail = rest.split("%LED_STATUS%")
+    head, middle, tail = head.encode(), middle.encode(), tail.encode()
+
+    return {
+        True: (head, b"#4CAF50", middle, b"ON", tail),
+        False: (head, b"#f44336", middle, b"OFF", tail),
+    }
+
+
+# Pre-encoded pages for LED on and off
+PAGES = _build_page(AP_SSID)
+del _build_page
+
+BUSY_PAGE = b"<html><body><h1>Busy</h1></body></html>"
+
+HTML = "text/html; charset=utf-8"
+JSON = "application/json"
 
-def handle_request(client_socket, request):
+# Pre-encoded /api/led answers
+LED_JSON = {
+    True: b'{"led": true}',
+    False: b'{"led": false}',
+}
+
+
+def set_led(state):
     """
-    Handle HTTP request and generate response.
+    Switch the LED and remember the state.
 
     Args:
-        client_socket: Client socket connection
-        request (str): HTTP request string
+        state (bool): True for on, False for off
     """
     global led_state
 
-    # Parse request
+    led.value(state)
+    led_state = state
+    print(f"LED turned {'ON' if state else 'OFF'}")
+
+
+def json_error(status, message):
+    """
+    Build a JSON error response.
+
+    Returns:
+        tuple: (status, content_type, body) as returned by handle_request()
+    """
+    return status, JSON, (json.dumps({"error": message}).encode(),)
+
+
+def handle_api_request(method, path, body):
+    """
+    Handle a request to the JSON API.
+
+    Args:
+        method (str): HTTP method
+        path (str): Request path, starting with /api/
+        body (memoryview): Request body
+
+    Returns:
+        tuple: (status, content_type, body) where body is a tuple of bytes
+    """
+    if path == "/api/led":
+        if method == "POST":
+            try:
+                state = json.loads(bytes(body))["led"]
+            except (ValueError, KeyError, TypeError):
+                return json_error("400 Bad Request", 'expected {"led": true} or {"led": false}')
+            if not isinstance(state, bool):
+                return json_error("400 Bad Request", '"led" must be true or false')
+            set_led(state)
+        elif method != "GET":
+            return json_error("405 Method Not Allowed", "use GET or POST")
+        return "200 OK", JSON, (LED_JSON[led_state],)
+
+    if path == "/api/status":
+        if method != "GET":
+            return json_error("405 Method Not Allowed", "use GET")
+        status = {
+            "led": led_state,
+            "uptime_seconds": int(time.time() - start_time),
+            "ssid": AP_SSID,
+            "connections": stats["connections"],
+            "active_connections": stats["active"],
+            "requests": stats["requests"],
+        }
+        return "200 OK", JSON, (json.dumps(status).encode(),)
+
+    return json_error("404 Not Found", "unknown endpoint")
+
+
+def handle_request(method, path, body=b""):
+    """
+    Handle HTTP request and generate response.
+
+    Args:
+        method (str): HTTP method
+        path (str): Request path
+        body (memoryview): Request body
+
+    Returns:
+        tuple: (status, content_type, body) where body is a tuple of bytes
+            fragments
+    """
+    print(f"Request: {method} {path}")
+
+    if path.startswith("/api/"):
+        return handle_api_request(method, path, body)
+
+    # Handle LED control (links used when JavaScript is off)
+    if path == "/led/on":
+        set_led(True)
+
+    elif path == "/led/off":
+        set_led(False)
+
+    # Pick the pre-encoded page for the current LED state
+    return "200 OK", HTML, PAGES[led_state]
+
+
+# Encoded response headers, by (status, content_type, length, keep_alive)
+_headers = {}
+
+
+def response_header(status, content_type, length, keep_alive):
+    """
+    Get the encoded response header, building each variant only once.
+
+    Args:
+        status (str): Status code and reason, e.g. "200 OK"
+        content_type (str): Content-Type of the body
+        length (int): Body length in bytes
+        keep_alive (bool): Keep the connection open after the response
+
+    Returns:
+        bytes: Status line and headers, ending with a blank line
+    """
+    key = (status, content_type, length, keep_alive)
+    header = _headers.get(key)
+    if header is None:
+        connection = "keep-alive" if keep_alive else "close"
+        header = (
+            f"HTTP/1.1 {status}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {length}\r\n"
+            f"Connection: {connection}\r\n\r\n"
+        ).encode()
+        _headers[key] = header
+    return header
+
+
+async def send_all(writer, data):
+    """
+    Write bytes to the client in SEND_CHUNK_SIZE slices.
+
+    The slices are memoryviews, so the data is never copied, and waiting
+    for each slice to drain keeps the stream's own buffer small.
+
+    Args:
+        writer: Stream of the client connection
+        data (bytes): Data to send
+    """
+    view = memoryview(data)
+    for start in range(0, len(view), SEND_CHUNK_SIZE):
+        writer.write(view[start:start + SEND_CHUNK_SIZE])
+        # A client that stops reading must not hold the connection forever
+        await asyncio.wait_for(writer.drain(), REQUEST_TIMEOUT)
+
+
+async def send_response(writer, status, content_type, body, keep_alive):
+    """
+    Send a response made of pre-encoded fragments.
+
+    Args:
+        writer: Stream of the client connection
+        status (str): Status code and reason, e.g. "200 OK"
+        content_type (str): Content-Type of the body
+        body (tuple): Body as bytes fragments
+        keep_alive (bool): Keep the connection open after the response
+    """
+    # Content-Length counts bytes, not characters
+    length = 0
+    for fragment in body:
+        length += len(fragment)
+
+    await send_all(writer, response_header(status, content_type, length, keep_alive))
+    for fragment in body:
+        await send_all(writer, fragment)
+
+
+MICROPYTHON = sys.implementation.name == "micropython"
+
+_CONTENT_LENGTH = b"content-length"
+_CONNECTION = b"connection"
+_TRANSFER_ENCODING = b"transfer-encoding"
+_CLOSE = b"close"
+_KEEP_ALIVE = b"keep-alive"
+
+
+def _matches(buf, start, end, word):
+    """
+    Case-insensitive check whether buf[start:end] starts with `word`.
+
+    Args:
+        buf: Buffer to check
+        start (int): Start position
+        end (int): End position
+        word (bytes): Lowercase ASCII word
+
+    Returns:
+        bool: True if the word is found at start
+    """
+    if end - start < len(word):
+        return False
+    for i in range(len(word)):
+        # OR-ing 0x20 lowercases letters and keeps digits, '-' and ':'
+        if buf[start + i] | 0x20 != word[i]:
+            return False
+    return True
+
+
+def _equals(buf, start, end, word):
+    """Check whether buf[start:end] is exactly `word`."""
+    if end - start != len(word):
+        return False
+    for i in range(len(word)):
+        if buf[start + i] != word[i]:
+            return False
+    return True
+
+
+class BadRequest(Exception):
+    """Raised by RequestParser for requests the server refuses."""
+
+    def __init__(self, status):
+        super().__init__(status)
+        self.status = status
+
+
+class RequestParser:
+    """
+    Incremental HTTP/1.x request reader for one connection.
+
+    Reads into one buffer allocated when the connection opens, so a client
+    can never make the server allocate more than MAX_HEADER_SIZE +
+    MAX_BODY_SIZE bytes. The end of the headers is searched only in the
+    newly received bytes, and requests are checked while they arrive:
+    oversized or malformed ones are refused before their headers are
+    decoded.
+    """
+
+    def __init__(self, reader):
+        """
+        Args:
+            reader: Stream of the client connection
+        """
+        self.reader = reader
+        self.buffer = bytearray(MAX_HEADER_SIZE + MAX_BODY_SIZE)
+        self.view = memoryview(self.buffer)
+        self.received = 0
+        self.request_end = 0
+
+        # Fields of the last request
+        self.method = None
+        self.path = None
+        self.keep_alive = False
+        self.body = None
+
+    async def _fill(self):
+        """
+        Read whatever the client sent next into the free part of the buffer.
+
+        Returns:
+            int: Number of bytes read, 0 if the client closed the connection
+        """
+        free = self.view[self.received:]
+        if MICROPYTHON:
+            count = await self.reader.readinto(free)
+        else:
+            # CPython streams have no readinto()
+            data = await self.reader.read(len(free))
+            count = len(data)
+            free[:count] = data
+        self.received += count
+        return count
+
+    def _find_header_end(self, start):
+        """
+        Find the blank line that ends the headers.
+
+        Args:
+            start (int): Position to start searching from
+
+        Returns:
+            int: Position just after the blank line, or -1 if not received yet
+
+        Raises:
+            BadRequest: If a line ends with a bare LF, which would otherwise
+                never be recognised as the end of the headers
+        """
+        buf = self.buffer
+        end = min(self.received, MAX_HEADER_SIZE)
+        for i in range(start, end):
+            if buf[i] == 10:
+                if i == 0 or buf[i - 1] != 13:
+                    raise BadRequest("400 Bad Request")
+                if i >= 3 and buf[i - 2] == 10 and buf[i - 3] == 13:
+                    return i + 1
+        return -1
+
+    async def wait(self, idle_timeout):
+        """
+        Wait for the next request to start.
+
+        Args:
+            idle_timeout (float): Seconds to wait for the first bytes
+
+        Returns:
+            bool: True if request data is available, False if the client
+                closed the connection
+
+        Raises:
+            asyncio.TimeoutError: If nothing arrives within idle_timeout
+        """
+        if self.received:
+            return True
+        return await asyncio.wait_for(self._fill(), idle_timeout) > 0
+
+    async def read(self, idle_timeout):
+        """
+        Read and check the next request.
+
+        Args:
+            idle_timeout (float): Seconds to wait for the request to start;
+                once it has started it must be complete within
+                REQUEST_TIMEOUT
+
+        Returns:
+            bool: True if a request was read, False if the client closed
+                the connection
+
+        Raises:
+            BadRequest: If the request is refused
+            asyncio.TimeoutError: If the client is too slow
+        """
+        if not await self.wait(idle_timeout):
+            return False
+        return await asyncio.wait_for(self._read_request(), REQUEST_TIMEOUT)
+
+    async def _read_request(self):
+        scanned = 0
+        header_end = self._find_header_end(0)
+        while header_end < 0:
+            if self.received >= MAX_HEADER_SIZE:
+                raise BadRequest("431 Request Header Fields Too Large")
+            scanned = self.received
+            if not await self._fill():
+                return False
+            # Only look at new bytes; the check looks back 3 bytes itself
+            header_end = self._find_header_end(scanned)
+
+        content_length = self._parse_head(header_end)
+        request_end = header_end + content_length
+
+        while self.received < request_end:
+            if not await self._fill():
+                return False
+
+        self.body = self.view[header_end:request_end]
+        self.request_end = request_end
+        return True
+
+    def _parse_head(self, header_end):
+        """
+        Check the request line and headers and pick out the fields used.
+
+        Args:
+            header_end (int): Position just after the blank line
+
+        Returns:
+            int: Length of the request body in bytes
+
+        Raises:
+            BadRequest: If the request is refused
+        """
+        buf = self.buffer
+
+        # Request line: METHOD SP PATH SP HTTP/1.x CRLF
+        line_end = 0
+        while buf[line_end] != 13:
+            line_end += 1
+        if buf[line_end + 1] != 10:
+            raise BadRequest("400 Bad Request")
+        first_space = 0
+        while first_space < line_end and buf[first_space] != 32:
+            first_space += 1
+        second_space = first_space + 1
+        while second_space < line_end and buf[second_space] != 32:
+            second_space += 1
+
+        version = second_space + 1
+        if (second_space >= line_end or line_end - version != 8
+                or not _matches(buf, version, line_end, b"http/1.")
+                or buf[version + 7] not in (48, 49)):  # '0', '1'
+            raise BadRequest("400 Bad Request")
+        if buf[first_space + 1] != 47:  # '/'
+            raise BadRequest("400 Bad Request")
+
+        if not (_equals(buf, 0, first_space, b"GET")
+                or _equals(buf, 0, first_space, b"POST")):
+            raise BadRequest("501 Not Implemented")
+
+        http_11 = buf[version + 7] == 49
+        keep_alive = http_11
+        content_length = 0
+        content_length_seen = False
+
+        # Header lines: NAME ":" VALUE CRLF
+        header_count = 0
+        start = line_end + 2
+        while start < header_end - 2:
+            header_count += 1
+            if header_count > MAX_HEADERS:
+                raise BadRequest("431 Request Header Fields Too Large")
+
+            end = start
+            while buf[end] != 13:
+                end += 1
+            if buf[end + 1] != 10:
+                raise BadRequest("400 Bad Request")
+            colon = start
+            while colon < end and buf[colon] != 58:  # ':'
+                colon += 1
+            if colon == start or colon == end:
+                raise BadRequest("400 Bad Request")
+
+            value = colon + 1
+            while value < end and buf[value] in (32, 9):
+                value += 1
+
+            name_length = colon - start
+            if name_length == len(_CONTENT_LENGTH) and _matches(buf, start, colon, _CONTENT_LENGTH):
+                # A second Content-Length could frame the body differently
+                # from a proxy in front (request smuggling)
+                if value == end or content_length_seen:
+                    raise BadRequest("400 Bad Request")
+                content_length_seen = True
+                content_length = 0
+                for i in range(value, end):
+                    if not 48 <= buf[i] <= 57:
+                        raise BadRequest("400 Bad Request")
+                    content_length = content_length * 10 + buf[i] - 48
+                    if content_length > MAX_BODY_SIZE:
+                        raise BadRequest("413 Payload Too Large")
+            elif name_length == len(_TRANSFER_ENCODING) and _matches(buf, start, colon, _TRANSFER_ENCODING):
+                raise BadRequest("501 Not Implemented")
+            elif name_length == len(_CONNECTION) and _matches(buf, start, colon, _CONNECTION):
+                if _matches(buf, value, end, _CLOSE):
+                    keep_alive = False
+                elif _matches(buf, value, end, _KEEP_ALIVE):
+                    keep_alive = True
+
+            start = end + 2
+
+        # The request is acceptable; only now create strings from it
+        try:
+            self.method = bytes(self.view[:first_space]).decode()
+            self.path = bytes(self.view[first_space + 1:second_space]).decode()
+        except UnicodeError:
+            raise BadRequest("400 Bad Request")
+        self.keep_alive = keep_alive
+        return content_length
+
+    def consume(self):
+        """
+        Drop the last request from the buffer.
+
+        Bytes the client already sent for a following request are moved to
+        the front of the buffer.
+        """
+        buf = self.buffer
+        start = self.request_end
+        extra = self.received - start
+        for i in range(extra):
+            buf[i] = buf[start + i]
+        self.received = extra
+        self.request_end = 0
+        self.body = None
+
+
+def error_page(status):
+    """
+    Build the small HTML body of an error response.
+
+    Args:
+        status (str): Status code and reason
+
+    Returns:
+        tuple: Body as bytes fragments
+    """
+    return (f"<html><body><h1>{status}</h1></body></html>".encode(),)
+
+
+async def close_connection(writer):
+    """
+    Close a client connection, ignoring errors from clients that are gone.
+
+    Args:
+        writer: Stream of the client connection
+    """
     try:
-        request_line = request.split('\n')[0]
-        method, path, _ = request_line.split()
+        writer.close()
+        await writer.wait_closed()
+    except OSError:
+        pass
 
-        print(f"Request: {method} {path}")
 
-        # Handle LED control
-        if path == "/led/on":
-            led.on()
-            led_state = True
-            print("LED turned ON")
+def evict_idle_connection():
+    """
+    Close the keep-alive connection that has been idle the longest.
 
-        elif path == "/led/off":
-            led.off()
-            led_state = False
-            print("LED turned OFF")
+    Its handler sees the connection closed and ends, which frees the slot
+    for a new client.
+
+    Returns:
+        bool: True if a connection was closed, False if none was idle
+    """
+    if not idle_connections:
+        return False
+    writer = idle_connections.pop(0)
+    stats["evicted"] += 1
+    try:
+        writer.close()
+    except OSError:
+        pass
+    return True
+
+
+async def wait_idle(parser, writer):
+    """
+    Wait for the next request on a keep-alive connection.
+
+    While it waits, the connection is listed in idle_connections so that
+    a new client can take its slot when the server is full.
+
+    Args:
+        parser (RequestParser): Parser of the connection
+        writer: Stream of the client connection
+
+    Returns:
+        bool: True if a request has started, False if the connection was
+            closed by the client or evicted
+
+    Raises:
+        asyncio.TimeoutError: If no request starts within KEEPALIVE_TIMEOUT
+    """
+    idle_connections.append(writer)
+    try:
+        return await parser.wait(KEEPALIVE_TIMEOUT)
+    except OSError:
+        # Reading from a connection closed by evict_idle_connection()
+        return False
+    finally:
+        if writer in idle_connections:
+            idle_connections.remove(writer)
+
+
+async def handle_client(reader, writer):
+    """
+    Serve one client connection, possibly several requests over keep-alive.
+
+    Args:
+        reader: Stream to read the requests from
+        writer: Stream to write the responses to
+    """
+    stats["connections"] += 1
+    connection_number = stats["connections"]
+
+    if stats["active"] >= MAX_CONNECTIONS and evict_idle_connection():
+        # The evicted handler gives its slot back once it has noticed
+        print(f"[Connection #{connection_number}] Closed an idle keep-alive connection")
+    elif stats["active"] >= MAX_CONNECTIONS:
+        # Out of sockets: answer at once instead of letting them queue
+        stats["rejected"] += 1
+        try:
+            await send_response(writer, "503 Service Unavailable", HTML, (BUSY_PAGE,), False)
+        finally:
+            await close_connection(writer)
+        return
+
+    stats["active"] += 1
+    client_address = writer.get_extra_info("peername")
+    print(f"\n[Connection #{connection_number}] Client: {client_address[0]}:{client_address[1]}")
+
+    parser = RequestParser(reader)
+
+    try:
+        for request_count in range(KEEPALIVE_MAX):
+            # The first request must arrive promptly; later ones may wait
+            # for the keep-alive timeout, unless a new client needs the slot
+            if request_count and not await wait_idle(parser, writer):
+                break
+            try:
+                if not await parser.read(REQUEST_TIMEOUT):
+                    break
+            except BadRequest as error:
+                stats["bad_requests"] += 1
+                print(f"[Connection #{connection_number}] Refused: {error.status}")
+                await send_response(writer, error.status, HTML, error_page(error.status), False)
+                break
+
+            stats["requests"] += 1
+            keep_alive = parser.keep_alive and request_count < KEEPALIVE_MAX - 1
 
-        # Generate response
-        html = generate_html()
-        response = f"""HTTP/1.1 200 OK
-Content-Type: text/html
-Content-Length: {len(html)}
-Connection: close
+            status, content_type, body = handle_request(parser.method, parser.path, parser.body)
+            parser.consume()
+            await send_response(writer, status, content_type, body, keep_alive)
 
-{html}"""
+            if not keep_alive:
+                break
 
-        client_socket.send(response.encode())
+    except asyncio.TimeoutError:
+        stats["timeouts"] += 1
+        print(f"[Connection #{connection_number}] Timed out")
 
     except Exception as error:
-        print(f"Error handling request: {error}")
+        print(f"Error processing request: {error}")
+
+    finally:
+        stats["active"] -= 1
+        await close_connection(writer)
 
-        error_html = "<html><body><h1>Error</h1><p>Bad request</p></body></html>"
-        response = f"""HTTP/1.1 400 Bad Request
-Content-Type: text/html
-Content-Length: {len(error_html)}
-Connection: close
 
-{error_html}"""
-        client_socket.send(response.encode())
+async def status_blinker(interval=HEARTBEAT_INTERVAL):
+    """
+    Task: blink the LED briefly to show that the server is running.
 
+    The LED is inverted for 50 ms and then set back to the state chosen
+    on the web page.
 
-def start_web_server(ip_address, port=80):
+    Args:
+        interval (float): Time between heartbeat blinks in seconds
     """
-    Start HTTP server to handle web requests.
+    while True:
+        await asyncio.sleep(interval)
+        led.value(not led_state)
+        await asyncio.sleep(0.05)
+        led.value(led_state)
+
+
+async def serve(ip_address, port):
+    """
+    Run the web server and the heartbeat blink concurrently.
 
     Args:
         ip_address (str): IP address to bind to
-        port (int): Port number (default 80)
+        port (int): Port number
     """
-    print(f"\nStarting web server on {ip_address}:{port}")
-    print("=" * 60)
-
-    # Create socket
-    server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-    server_socket.bind((ip_address, port))
-    server_socket.listen(5)
+    await asyncio.start_server(handle_client, ip_address, port)
 
     print(f"Web server running!")
     print(f"Connect to WiFi: {AP_SSID}")
@@ -311,37 +986,34 @@ def start_web_server(ip_address, port=80):
     print("=" * 60)
     print("\nWaiting for connections...\n")
 
-    try:
-        connection_count = 0
+    # Connections are served by their own tasks; this keeps the loop alive
+    await status_blinker()
 
-        while True:
-            # Accept connection
-            client_socket, client_address = server_socket.accept()
-            connection_count += 1
 
-            print(f"\n[Connection #{connection_count}] Client: {client_address[0]}:{client_address[1]}")
-
-            try:
-                # Receive request
-                request = client_socket.recv(1024).decode()
-
-                if request:
-                    # Handle request
-                    handle_request(client_socket, request)
+def start_web_server(ip_address, port=WEB_PORT):
+    """
+    Start HTTP server to handle web requests.
 
-            except Exception as error:
-                print(f"Error processing request: {error}")
+    Args:
+        ip_address (str): IP address to bind to
+        port (int): Port number (default 80)
+    """
+    print(f"\nStarting web server on {ip_address}:{port}")
+    print("=" * 60)
 
-            finally:
-                # Close connection
-                client_socket.close()
+    try:
+        asyncio.run(serve(ip_address, port))
 
     except KeyboardInterrupt:
         print(f"\n\nServer stopped by user")
-        print(f"Total connections handled: {connection_count}")
+        print(f"Total connections handled: {stats['connections']}")
+        print(f"Requests: {stats['requests']}")
+        print(f"Rejected (busy): {stats['rejected']}")
+        print(f"Idle connections closed for new clients: {stats['evicted']}")
+        print(f"Timed out: {stats['timeouts']}")
+        print(f"Refused (bad request): {stats['bad_requests']}")
 
     finally:
-        server_socket.close()
         led.off()
 
 
@@ -0,0 +1,331 @@
+"""
+Keep-Alive HTTP Client for Raspberry Pi Pico W
+
+A small HTTP/1.1 client built directly on sockets and uasyncio streams.
+Unlike urequests it keeps the connection to the server open between
+requests, so repeated polls of the same server skip DNS resolution, the
+TCP handshake and the socket allocation.
+
+Features:
+- One persistent connection, reopened automatically when the server
+  closes it or a reused connection turns out to be dead
+- Server address resolved once and cached until a connect fails, so a
+  server that moves to a new address is found again
+- Request lines encoded once per path and cached
+- Responses read into one preallocated buffer, no per-request allocation
+  of response objects, header dicts or body strings
+
+Only what the Number Transmitter API needs is supported: GET requests and
+responses with a Content-Length header that fit into the buffer.
+
+Usage:
+    Copy this file to the /lib folder of your Pico. It also runs under
+    CPython, which is how examples/pico_client_benchmark.py uses it.
+
+    client = HTTPClient("192.168.1.100", 5001)
+    status, body = await client.get("/api/number")
+    data = json.loads(body)
+"""
+
+import sys
+import socket
+
+try:
+    import uasyncio as asyncio
+except ImportError:
+    import asyncio
+
+MICROPYTHON = sys.implementation.name == "micropython"
+
+# errno values of a non-blocking connect() that is still in progress
+_EINPROGRESS = (115, 119)
+
+_CONTENT_LENGTH = b"content-length:"
+_CONNECTION = b"connection:"
+_CLOSE = b"close"
+
+
+def _starts_with(buf, pos, end, prefix):
+    """
+    Case-insensitive check for a lowercase ASCII prefix at buf[pos:end].
+
+    Args:
+        buf: Buffer to search
+        pos (int): Start position
+        end (int): End of the valid data in buf
+        prefix (bytes): Lowercase prefix
+
+    Returns:
+        bool: True if the prefix is found at pos
+    """
+    if end - pos < len(prefix):
+        return False
+    for i in range(len(prefix)):
+        # OR-ing 0x20 lowercases letters and keeps digits, '-' and ':'
+        if buf[pos + i] | 0x20 != prefix[i]:
+            return False
+    return True
+
+
+def _find_crlf(buf, pos, end):
+    """
+    Find the next CRLF in buf[pos:end].
+
+    Returns:
+        int: Position of the CR, or -1 if there is none
+    """
+    for i in range(pos, end - 1):
+        if buf[i] == 13 and buf[i + 1] == 10:
+            return i
+    return -1
+
+
+def _skip_spaces(buf, pos, end):
+    while pos < end and buf[pos] in (32, 9):
+        pos += 1
+    return pos
+
+
+def _parse_int(buf, pos, end):
+    """
+    Parse a decimal number at buf[pos:end], ignoring leading whitespace.
+
+    Returns:
+        int: Parsed value, or -1 if there are no digits
+    """
+    pos = _skip_spaces(buf, pos, end)
+    value = -1
+    while pos < end and 48 <= buf[pos] <= 57:
+        value = (0 if value < 0 else value * 10) + buf[pos] - 48
+        pos += 1
+    return value
+
+
+class HTTPError(OSError):
+    """Raised for responses the client cannot handle."""
+
+
+class HTTPClient:
+    """
+    HTTP/1.1 keep-alive client for one server.
+
+    The body returned by get() is a memoryview into the client's receive
+    buffer. It is only valid until the next request.
+    """
+
+    def __init__(self, host, port=80, timeout=5, buffer_size=1024):
+        """
+        Args:
+            host (str): Server host name or IP address
+            port (int): Server port
+            timeout (float): Timeout for connecting and each read in seconds
+            buffer_size (int): Size of the receive buffer in bytes; headers
+                and body of a response must fit into it
+        """
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.buffer = bytearray(buffer_size)
+        self._view = memoryview(self.buffer)
+
+        self._address = None
+        self._requests = {}
+        self._reader = None
+        self._writer = None
+
+        # Statistics
+        self.request_count = 0
+        self.connect_count = 0
+
+    @property
+    def connected(self):
+        return self._writer is not None
+
+    def _resolve(self):
+        """Resolve the server address once and cache it until a connect fails."""
+        if self._address is None:
+            self._address = socket.getaddrinfo(
+                self.host, self.port, 0, socket.SOCK_STREAM
+            )[0][-1]
+        return self._address
+
+    def _request_bytes(self, path):
+        """Encode the request for a path once and cache it."""
+        request = self._requests.get(path)
+        if request is None:
+            request = (
+                f"GET {path} HTTP/1.1\r\n"
+                f"Host: {self.host}\r\n"
+                "Connection: keep-alive\r\n\r\n"
+            ).encode()
+            self._requests[path] = request
+        return request
+
+    async def _open(self):
+        """Open a connection to the cached server address."""
+        address = self._resolve()
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setblocking(False)
+
+        if MICROPYTHON:
+            try:
+                sock.connect(address)
+            except OSError as error:
+                if error.errno not in _EINPROGRESS:
+                    sock.close()
+                    self._address = None
+                    raise
+            # uasyncio waits until the socket is writable before the first
+            # write, which is when the connect has completed
+            stream = asyncio.StreamReader(sock)
+            self._reader = self._writer = stream
+        else:
+            try:
+                loop = asyncio.get_running_loop()
+                await asyncio.wait_for(loop.sock_connect(sock, address), self.timeout)
+                self._reader, self._writer = await asyncio.open_connection(sock=sock)
+            except BaseException:
+                sock.close()
+                self._address = None
+                raise
+
+        self.connect_count += 1
+
+    async def close(self):
+        """Close the connection. The next request opens a new one."""
+        writer = self._writer
+        self._reader = self._writer = None
+        if writer is not None:
+            try:
+                writer.close()
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+    async def _readinto(self, start):
+        """
+        Read more response data into the buffer at `start`.
+
+        Returns:
+            int: Number of bytes read, 0 when the server closed the connection
+        """
+        view = self._view[start:]
+        if not len(view):
+            raise HTTPError("Response does not fit into the receive buffer")
+
+        if MICROPYTHON:
+            return await asyncio.wait_for(self._reader.readinto(view), self.timeout)
+
+        # CPython streams have no readinto()
+        data = await asyncio.wait_for(self._reader.read(len(view)), self.timeout)
+        view[:len(data)] = data
+        return len(data)
+
+    async def _exchange(self, request):
+        """
+        Send a request and read the whole response into the buffer.
+
+        Returns:
+            tuple: (status, body_start, body_end, keep_alive)
+        """
+        self._writer.write(request)
+        await asyncio.wait_for(self._writer.drain(), self.timeout)
+
+        buf = self.buffer
+        received = 0
+        header_end = -1
+        status = -1
+        content_length = -1
+        keep_alive = True
+        line_start = 0
+
+        # Read until the blank line that ends the headers, parsing each
+        # header line as soon as it is complete
+        while header_end < 0:
+            count = await self._readinto(received)
+            if not count:
+                raise OSError("Connection closed by server")
+            received += count
+
+            while True:
+                line_end = _find_crlf(buf, line_start, received)
+                if line_end < 0:
+                    break
+
+                if line_start == 0:
+                    # Status line: HTTP/1.x NNN Reason
+                    keep_alive = buf[7] == 49  # '1': HTTP/1.1
+                    status = _parse_int(buf, 8, line_end)
+                elif line_end == line_start:
+                    header_end = line_end + 2
+                    break
+                elif _starts_with(buf, line_start, line_end, _CONTENT_LENGTH):
+                    content_length = _parse_int(
+                        buf, line_start + len(_CONTENT_LENGTH), line_end
+                    )
+                elif _starts_with(buf, line_start, line_end, _CONNECTION):
+                    value = _skip_spaces(buf, line_start + len(_CONNECTION), line_end)
+                    if _starts_with(buf, value, line_end, _CLOSE):
+                        keep_alive = False
+
+                line_start = line_end + 2
+
+        if content_length < 0:
+            raise HTTPError("Response has no Content-Length")
+
+        body_end = header_end + content_length
+        if body_end > len(buf):
+            raise HTTPError("Response does not fit into the receive buffer")
+
+        while received < body_end:
+            count = await self._readinto(received)
+            if not count:
+                raise OSError("Connection closed by server")
+            received += count
+
+        return status, header_end, body_end, keep_alive
+
+    async def get(self, path):
+        """
+        Send a GET request over the persistent connection.
+
+        A request on a reused connection that fails is retried once on a
+        fresh connection, since the server may have closed an idle
+        connection in the meantime.
+
+        Args:
+            path (str): Request path, e.g. "/api/number"
+
+        Returns:
+            tuple: (status, body) where body is a memoryview into the
+                receive buffer
+
+        Raises:
+            OSError: If the request fails
+        """
+        request = self._request_bytes(path)
+
+        for attempt in range(2):
+            reused = self.connected
+            if not reused:
+                await self._open()
+
+            try:
+                status, start, end, keep_alive = await self._exchange(request)
+            except HTTPError:
+                await self.close()
+                raise
+            except Exception:
+                await self.close()
+                if reused and attempt == 0:
+                    continue
+                if not reused:
+                    # On MicroPython a failed connect only shows up here.
+                    # Resolve again next time in case the server has moved.
+                    self._address = None
+                raise
+
+            self.request_count += 1
+            if not keep_alive:
+                await self.close()
+            return status, self._view[start:end]
@@ -0,0 +1,71 @@
+"""
+LED Helpers for Raspberry Pi Pico W
+
+TimerBlinker blinks an LED from a periodic machine.Timer callback, so the
+blink timing does not depend on what the main program is doing.
+
+Usage:
+    Copy this file to the /lib folder of your Pico.
+
+    blinker = TimerBlinker(machine.Pin("LED", machine.Pin.OUT))
+    blinker.set_interval(0.5)  # one on/off cycle every 0.5 s
+    ...
+    blinker.stop()
+"""
+
+import machine
+
+
+class TimerBlinker:
+    """
+    Blink an LED from a periodic machine.Timer callback.
+
+    The timer toggles the LED every half interval, independent of what the
+    main program is doing. The onboard LED of the Pico W is driven through
+    the WiFi chip and cannot be used with PWM, so a timer is used instead.
+    """
+
+    def __init__(self, pin, timer=None):
+        """
+        Args:
+            pin: machine.Pin of the LED
+            timer: machine.Timer to use; a new one by default
+        """
+        self.pin = pin
+        self.timer = timer if timer is not None else machine.Timer()
+        self.interval = None
+        self.toggle_count = 0
+        # Bound once, so starting the timer does not allocate a new method
+        # object each time
+        self._callback = self._toggle
+
+    def _toggle(self, timer):
+        self.pin.toggle()
+        self.toggle_count += 1
+
+    @property
+    def blink_count(self):
+        """Number of completed on/off cycles."""
+        return self.toggle_count // 2
+
+    def set_interval(self, interval):
+        """
+        Blink with a new interval. Does nothing if it is unchanged, so the
+        current blink is not cut short.
+
+        Args:
+            interval (float): Seconds per on/off cycle
+        """
+        if interval == self.interval:
+            return
+        self.interval = interval
+        self.timer.deinit()
+        self.timer.init(mode=machine.Timer.PERIODIC,
+                        period=max(1, int(interval * 500)),
+                        callback=self._callback)
+
+    def stop(self):
+        """Stop blinking and turn the LED off."""
+        self.timer.deinit()
+        self.interval = None
+        self.pin.off()
@@ -0,0 +1,215 @@
+"""
+Allocation-Free Parser for Number Transmitter API Responses
+
+Extracts the fields the Pico needs from an /api/number response body
+without building a dict, decoding strings or creating float objects:
+
+- number          -> reading.number (int)
+- total_cycles    -> reading.total_cycles (int)
+- next_change_in  -> reading.next_change_ms (int, milliseconds)
+
+The body is scanned in place, directly in the receive buffer of
+http_client.HTTPClient, and the results are written into a preallocated
+NumberReading. Only small integers are created, which MicroPython stores
+without touching the heap, so polling has a fixed memory footprint no
+matter how long the device runs.
+
+Usage:
+    Copy this file to the /lib folder of your Pico.
+
+    reading = NumberReading()
+    status, body = await client.get("/api/number")
+    if parse_number_response(body, reading):
+        print(reading.number, reading.next_change_ms)
+
+tests/test_number_parser.py checks the parser against the json module.
+"""
+
+_NUMBER = b"number"
+_TOTAL_CYCLES = b"total_cycles"
+_NEXT_CHANGE_IN = b"next_change_in"
+
+_FOUND_NUMBER = 1
+_FOUND_TOTAL_CYCLES = 2
+_FOUND_NEXT_CHANGE = 4
+_FOUND_ALL = 7
+
+# Significant digits kept when parsing a number; more would not fit into a
+# MicroPython small int
+_MAX_DIGITS = 9
+
+
+class NumberReading:
+    """
+    Fields of one /api/number response.
+
+    Create it once and pass it to every parse_number_response() call.
+    """
+
+    def __init__(self):
+        self.number = 0
+        self.total_cycles = 0
+        self.next_change_ms = 0
+
+
+def _key_equals(buf, start, end, key):
+    """Check whether buf[start:end] equals key, byte by byte."""
+    if end - start != len(key):
+        return False
+    for i in range(len(key)):
+        if buf[start + i] != key[i]:
+            return False
+    return True
+
+
+def _skip_string(buf, pos, end):
+    """
+    Skip a JSON string starting after its opening quote.
+
+    Returns:
+        int: Position of the closing quote, or end if it is missing
+    """
+    while pos < end:
+        char = buf[pos]
+        if char == 34:  # '"'
+            return pos
+        if char == 92:  # '\\' escapes the next character
+            pos += 1
+        pos += 1
+    return end
+
+
+def _skip_spaces(buf, pos, end):
+    while pos < end and buf[pos] in (32, 9, 10, 13):
+        pos += 1
+    return pos
+
+
+def _parse_scaled(buf, pos, end, scale):
+    """
+    Parse a JSON number and return it multiplied by 10 ** scale.
+
+    The result is truncated towards zero. Digits beyond _MAX_DIGITS
+    significant ones are ignored.
+
+    Args:
+        buf: Buffer holding the number
+        pos (int): Position of the first character of the number
+        end (int): End of the valid data in buf
+        scale (int): Decimal exponent to apply, e.g. 3 for milliseconds
+
+    Returns:
+        int: Scaled value, or None if there is no number at pos
+    """
+    negative = pos < end and buf[pos] == 45  # '-'
+    if negative:
+        pos += 1
+
+    mantissa = 0
+    digits = 0
+    exponent = scale
+    seen_digit = False
+
+    # Integer part
+    while pos < end and 48 <= buf[pos] <= 57:
+        seen_digit = True
+        if digits < _MAX_DIGITS:
+            if mantissa or buf[pos] != 48:
+                digits += 1
+            mantissa = mantissa * 10 + buf[pos] - 48
+        else:
+            exponent += 1
+        pos += 1
+
+    # Fraction
+    if pos < end and buf[pos] == 46:  # '.'
+        pos += 1
+        while pos < end and 48 <= buf[pos] <= 57:
+            seen_digit = True
+            if digits < _MAX_DIGITS:
+                if mantissa or buf[pos] != 48:
+                    digits += 1
+                mantissa = mantissa * 10 + buf[pos] - 48
+                exponent -= 1
+            pos += 1
+
+    if not seen_digit:
+        return None
+
+    # Exponent, e.g. 5e-07
+    if pos < end and buf[pos] in (101, 69):  # 'e', 'E'
+        pos += 1
+        sign = 1
+        if pos < end and buf[pos] in (43, 45):  # '+', '-'
+            if buf[pos] == 45:
+                sign = -1
+            pos += 1
+        value = 0
+        while pos < end and 48 <= buf[pos] <= 57:
+            if value < 1000:
+                value = value * 10 + buf[pos] - 48
+            pos += 1
+        exponent += sign * value
+
+    if exponent >= 0:
+        if exponent > _MAX_DIGITS:
+            return None
+        while exponent:
+            mantissa *= 10
+            exponent -= 1
+    else:
+        while exponent and mantissa:
+            mantissa //= 10
+            exponent += 1
+
+    return -mantissa if negative else mantissa
+
+
+def parse_number_response(body, reading):
+    """
+    Extract number, total_cycles and next_change_in from a response body.
+
+    Args:
+        body: Response body (bytes, bytearray or memoryview)
+        reading (NumberReading): Object that receives the values
+
+    Returns:
+        bool: True if all three fields were found. Fields that were
+            found are stored in `reading` either way.
+    """
+    end = len(body)
+    pos = 0
+    found = 0
+
+    while pos < end and found != _FOUND_ALL:
+        if body[pos] != 34:  # '"'
+            pos += 1
+            continue
+
+        # A string: it is a key if a ':' follows
+        start = pos + 1
+        pos = _skip_string(body, start, end)
+        key_end = pos
+        pos = _skip_spaces(body, pos + 1, end)
+        if pos >= end or body[pos] != 58:  # ':'
+            continue
+        pos = _skip_spaces(body, pos + 1, end)
+
+        if _key_equals(body, start, key_end, _NUMBER):
+            value = _parse_scaled(body, pos, end, 0)
+            if value is not None:
+                reading.number = value
+                found |= _FOUND_NUMBER
+        elif _key_equals(body, start, key_end, _TOTAL_CYCLES):
+            value = _parse_scaled(body, pos, end, 0)
+            if value is not None:
+                reading.total_cycles = value
+                found |= _FOUND_TOTAL_CYCLES
+        elif _key_equals(body, start, key_end, _NEXT_CHANGE_IN):
+            value = _parse_scaled(body, pos, end, 3)
+            if value is not None:
+                reading.next_change_ms = value
+                found |= _FOUND_NEXT_CHANGE
+
+    return found == _FOUND_ALL
+
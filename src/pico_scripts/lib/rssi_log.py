@@ -0,0 +1,264 @@
+"""
+Binary RSSI Log for Raspberry Pi Pico W
+
+Stores signal strength samples on the Pico's flash in a compact binary
+format, so a site survey survives the Pico losing its USB connection.
+
+File format (little endian):
+- Header, 10 bytes: magic b"RSSI", format version (uint16) and time.time()
+  when the file was started (uint32)
+- Records, 3 bytes each: milliseconds since the previous sample, or since
+  the file was started for the first record (uint16), and RSSI in dBm (int8)
+- A record with delta GAP_DELTA and RSSI GAP_RSSI is a gap record: that
+  many milliseconds passed without a sample. Longer pauses are written as
+  several gap records.
+- Two records with RSSI RESTART_RSSI mark a restart of the Pico: their
+  deltas are the low and high 16 bits of time.time() at the restart, and
+  the following record counts from that time.
+
+Writing:
+- Records are packed into a RAM buffer of one flash page and appended to
+  the file in a single write when the buffer is full, instead of touching
+  the flash for every sample
+- A new run appends to the current file after a restart marker, so a Pico
+  that browns out a few times during a survey keeps its data. Only a file
+  that cannot be continued (full, damaged or of another format version)
+  is rotated at start-up.
+- When a file reaches max_file_size it is rotated like
+  logging.handlers.RotatingFileHandler does it: rssi.bin becomes
+  rssi.bin.1, rssi.bin.1 becomes rssi.bin.2 and so on, and the oldest
+  file is deleted. The log never uses more than
+  (backup_count + 1) * max_file_size bytes of flash.
+
+Usage:
+    Copy this file and ticks.py to the /lib folder of your Pico.
+
+    log = RssiLogger("rssi.bin")
+    log.add(wlan.status("rssi"))
+    ...
+    log.close()
+
+    On a computer, examples/rssi_log_decoder.py reads the files back.
+"""
+
+import os
+import struct
+import time
+
+from ticks import ticks_ms, ticks_diff
+
+MAGIC = b"RSSI"
+VERSION = 2
+HEADER_FORMAT = "<4sHI"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+RECORD_FORMAT = "<Hb"
+RECORD_SIZE = struct.calcsize(RECORD_FORMAT)
+
+# Gap record: GAP_DELTA milliseconds without a sample. RSSI is never positive.
+GAP_DELTA = 0xFFFF
+GAP_RSSI = 127
+
+# Restart marker: two records with this RSSI carry the restart time
+RESTART_RSSI = 126
+
+# Size of a flash page on the Pico
+PAGE_SIZE = 256
+
+
+def _replace(source, target):
+    """Rename source to target, replacing target. Missing files are ignored."""
+    try:
+        os.remove(target)
+    except OSError:
+        pass
+    try:
+        os.rename(source, target)
+    except OSError:
+        pass
+
+
+class RssiLogger:
+    """
+    Append RSSI samples to a rotating binary log on flash.
+    """
+
+    def __init__(self, path="rssi.bin", max_file_size=65536, backup_count=3,
+                 page_size=PAGE_SIZE):
+        """
+        Args:
+            path (str): Path of the current log file
+            max_file_size (int): Rotate the file once it would grow beyond
+                this many bytes
+            backup_count (int): Number of rotated files to keep
+            page_size (int): Size of the RAM buffer written in one go; it
+                holds page_size // RECORD_SIZE records
+        """
+        self.path = path
+        self.max_file_size = max_file_size
+        self.backup_count = backup_count
+
+        self.buffer = bytearray(page_size - page_size % RECORD_SIZE)
+        self._view = memoryview(self.buffer)
+        self.used = 0
+
+        self._file = None
+        self._file_size = 0
+        self._last_ticks = 0
+
+        # Statistics
+        self.sample_count = 0
+        self.write_count = 0
+
+    def _rotate(self):
+        """Shift the existing files by one and drop the oldest."""
+        for index in range(self.backup_count - 1, 0, -1):
+            _replace(f"{self.path}.{index}", f"{self.path}.{index + 1}")
+        if self.backup_count:
+            _replace(self.path, f"{self.path}.1")
+        else:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+    def _resume(self, now):
+        """
+        Continue the existing log file after a restart.
+
+        Returns:
+            bool: False if there is no file that can be continued
+        """
+        try:
+            size = os.stat(self.path)[6]
+            with open(self.path, "rb") as log_file:
+                header = log_file.read(HEADER_SIZE)
+        except OSError:
+            return False
+        # A power loss during a write can leave half a record behind,
+        # which would shift every record appended after it
+        if len(header) < HEADER_SIZE or (size - HEADER_SIZE) % RECORD_SIZE:
+            return False
+        magic, version, _ = struct.unpack(HEADER_FORMAT, header)
+        if magic != MAGIC or version != VERSION:
+            return False
+        if size + 4 * RECORD_SIZE > self.max_file_size:
+            return False
+
+        self._file = open(self.path, "ab")
+        self._file_size = size
+        restart_time = int(time.time())
+        self._append(restart_time & 0xFFFF, RESTART_RSSI)
+        self._append(restart_time >> 16, RESTART_RSSI)
+        self._last_ticks = now
+        return True
+
+    def _start_file(self, now):
+        """Close the current file, rotate and start a new one at `now`."""
+        if self._file is not None:
+            self.flush()
+            self._file.close()
+            self._file = None
+        self._rotate()
+
+        self._file = open(self.path, "wb")
+        self._file.write(struct.pack(HEADER_FORMAT, MAGIC, VERSION, int(time.time())))
+        self._file.flush()
+        self._file_size = HEADER_SIZE
+        self._last_ticks = now
+
+    def _append(self, delta, rssi):
+        """Pack one record into the buffer, flushing it when it is full."""
+        if self.used == len(self.buffer):
+            self.flush()
+        buf = self.buffer
+        pos = self.used
+        buf[pos] = delta & 0xFF
+        buf[pos + 1] = delta >> 8
+        buf[pos + 2] = rssi & 0xFF
+        self.used = pos + RECORD_SIZE
+
+    def add(self, rssi):
+        """
+        Log one sample, timestamped with the current tick count.
+
+        Args:
+            rssi (int): Signal strength in dBm, clamped to -128..0
+        """
+        now = ticks_ms()
+        if self._file is None:
+            if not self._resume(now):
+                self._start_file(now)
+        elif self._file_size + self.used + 2 * RECORD_SIZE > self.max_file_size:
+            self._start_file(now)
+
+        delta = ticks_diff(now, self._last_ticks)
+        self._last_ticks = now
+        while delta >= GAP_DELTA:
+            self._append(GAP_DELTA, GAP_RSSI)
+            delta -= GAP_DELTA
+        self._append(delta, min(max(rssi, -128), 0))
+        self.sample_count += 1
+
+    def flush(self):
+        """Write the buffered records to flash."""
+        if not self.used or self._file is None:
+            return
+        self._file.write(self._view[:self.used])
+        self._file.flush()
+        self._file_size += self.used
+        self.used = 0
+        self.write_count += 1
+
+    def close(self):
+        """Write the buffered records and close the file."""
+        if self._file is not None:
+            self.flush()
+            self._file.close()
+            self._file = None
+
+
+def read_log(data):
+    """
+    Decode the contents of one log file.
+
+    A truncated last record, left by a power loss during a write, is
+    ignored. Version 1 files, which have no restart markers, are read too.
+
+    Args:
+        data (bytes): File contents
+
+    Returns:
+        tuple: (start_time, samples) where start_time is the header's
+            time.time() value and samples is a list of
+            (seconds since start_time, rssi) tuples
+
+    Raises:
+        ValueError: If the data is not an RSSI log
+    """
+    if len(data) < HEADER_SIZE:
+        raise ValueError("File is too short for an RSSI log header")
+    magic, version, start_time = struct.unpack_from(HEADER_FORMAT, data, 0)
+    if magic != MAGIC:
+        raise ValueError("Not an RSSI log")
+    if not 1 <= version <= VERSION:
+        raise ValueError(f"Unsupported RSSI log version {version}")
+
+    samples = []
+    elapsed_ms = 0
+    restart_low = None
+    end = len(data) - (len(data) - HEADER_SIZE) % RECORD_SIZE
+    for pos in range(HEADER_SIZE, end, RECORD_SIZE):
+        delta, rssi = struct.unpack_from(RECORD_FORMAT, data, pos)
+        if rssi == RESTART_RSSI:
+            if restart_low is None:
+                restart_low = delta
+            else:
+                restart_time = restart_low | delta << 16
+                elapsed_ms = (restart_time - start_time) * 1000
+                restart_low = None
+            continue
+        elapsed_ms += delta
+        if delta == GAP_DELTA and rssi == GAP_RSSI:
+            continue
+        samples.append((elapsed_ms / 1000, rssi))
+    return start_time, samples
@@ -0,0 +1,31 @@
+"""
+Millisecond Tick Functions for MicroPython and CPython
+
+MicroPython's time module has ticks_ms(), ticks_add() and ticks_diff() for
+timing with a wrapping millisecond counter. CPython has none of them, so
+scripts that also run on a computer (for testing, or in the host-side
+examples) import them from here instead of from time.
+
+On CPython, ticks_ms() counts milliseconds of time.monotonic(), the clock
+asyncio uses as well. These ticks do not wrap, so plain addition and
+subtraction replace ticks_add() and ticks_diff().
+
+Usage:
+    Copy this file to the /lib folder of your Pico.
+
+    from ticks import ticks_ms, ticks_add, ticks_diff
+"""
+
+try:
+    from time import ticks_ms, ticks_add, ticks_diff
+except ImportError:
+    import time
+
+    def ticks_ms():
+        return int(time.monotonic() * 1000)
+
+    def ticks_add(ticks, delta):
+        return ticks + delta
+
+    def ticks_diff(ticks1, ticks2):
+        return ticks1 - ticks2
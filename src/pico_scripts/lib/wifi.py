@@ -0,0 +1,315 @@
+"""
+Shared WiFi Connection Module for Raspberry Pi Pico W
+
+Connects the Pico W to a WiFi network and keeps it connected:
+
+- Fast rejoin: the BSSID and channel of the last access point that worked
+  are remembered, also across reboots in a small file, and that access
+  point is tried first
+- Strongest access point: otherwise the network is scanned and the
+  strongest access point with the configured SSID is used, which matters
+  when several access points (e.g. a mesh) share one SSID
+- Fail fast: the connection status is polled every 50 ms, and a wrong
+  password or a missing access point ends an attempt at once instead of
+  after the timeout
+- Automatic reconnect: reconnect() and reconnect_async() retry with
+  exponential backoff and jitter until the network is back, so a script
+  recovers from an access point reboot by itself within seconds
+
+Usage:
+    Copy this file and ticks.py to the /lib folder of your Pico.
+
+    wifi = WiFi(WIFI_SSID, WIFI_PASSWORD, led=led)
+    if wifi.connect():
+        ...
+    # When wifi.isconnected() turns False:
+    wifi.reconnect()
+"""
+
+import binascii
+import json
+import random
+import time
+
+import network
+
+try:
+    import uasyncio as asyncio
+except ImportError:
+    import asyncio
+
+from ticks import ticks_ms, ticks_diff
+
+# File with the last access point that worked
+STATE_FILE = "wifi_state.json"
+
+# Connection status poll interval and LED toggle interval while connecting
+POLL_INTERVAL_MS = 50
+LED_TOGGLE_MS = 200
+
+# Timeout for rejoining the remembered access point, in seconds
+FAST_JOIN_TIMEOUT = 5
+
+# Delay between reconnect attempts: doubles after each failed attempt
+MIN_BACKOFF = 1
+MAX_BACKOFF = 16
+
+# Status codes that end a connection attempt. Not every port defines all.
+_FAILED = tuple(
+    getattr(network, name)
+    for name in ("STAT_WRONG_PASSWORD", "STAT_NO_AP_FOUND", "STAT_CONNECT_FAIL")
+    if hasattr(network, name)
+)
+
+
+def _format_bssid(bssid):
+    return ":".join("%02x" % b for b in bssid)
+
+
+class WiFi:
+    """
+    WiFi station connection with fast rejoin and automatic reconnect.
+    """
+
+    def __init__(self, ssid, password, led=None, state_file=STATE_FILE):
+        """
+        Args:
+            ssid (str): WiFi network name
+            password (str): WiFi password
+            led: machine.Pin that blinks while connecting, or None
+            state_file (str): File that remembers the last access point,
+                or None to remember it only while the script runs
+        """
+        self.wlan = network.WLAN(network.STA_IF)
+        self.ssid = ssid
+        self.password = password
+        self.led = led
+        self.state_file = state_file
+
+        # Last access point that worked
+        self.bssid = None
+        self.channel = None
+
+        # Statistics
+        self.failures = 0
+        self.connect_count = 0
+        self.last_connect_ms = None
+
+        self._polls = 0
+        self._load_state()
+
+    def isconnected(self):
+        return self.wlan.isconnected()
+
+    def _load_state(self):
+        if self.state_file is None:
+            return
+        try:
+            with open(self.state_file) as f:
+                state = json.load(f)
+            if state["ssid"] == self.ssid:
+                self.bssid = binascii.unhexlify(state["bssid"])
+                self.channel = state["channel"]
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+    def _save_state(self):
+        if self.state_file is None:
+            return
+        try:
+            with open(self.state_file, "w") as f:
+                json.dump({
+                    "ssid": self.ssid,
+                    "bssid": binascii.hexlify(self.bssid).decode(),
+                    "channel": self.channel,
+                }, f)
+        except OSError as error:
+            print(f"WiFi: could not save access point: {error}")
+
+    def scan(self):
+        """
+        Scan for access points of the configured network.
+
+        Returns:
+            list: (rssi, bssid, channel) tuples, strongest first
+        """
+        try:
+            results = self.wlan.scan()
+        except OSError as error:
+            print(f"WiFi: scan failed: {error}")
+            return []
+
+        target = self.ssid.encode()
+        # Scan results are (ssid, bssid, channel, rssi, security, hidden)
+        matches = [(result[3], result[1], result[2])
+                   for result in results if result[0] == target]
+        matches.sort(key=lambda match: match[0], reverse=True)
+        return matches
+
+    def _candidates(self, timeout):
+        """
+        Yield the access points to try, best guess first.
+
+        The scan only runs if the remembered access point does not work.
+
+        Yields:
+            tuple: (bssid, channel, timeout); bssid None lets the driver
+                choose
+        """
+        if self.bssid is not None:
+            yield self.bssid, self.channel, FAST_JOIN_TIMEOUT
+
+        matches = self.scan()
+        for rssi, bssid, channel in matches:
+            if bssid != self.bssid:
+                print(f"WiFi: found {_format_bssid(bssid)} on channel {channel} ({rssi} dBm)")
+                yield bssid, channel, timeout
+
+        if not matches and self.bssid is None:
+            # Never seen in a scan: possibly a hidden network
+            yield None, None, timeout
+
+    def _start_join(self, bssid):
+        self._polls = 0
+        self.wlan.active(True)
+        # Cancel a join that may still be in progress
+        self.wlan.disconnect()
+        if bssid is None:
+            self.wlan.connect(self.ssid, self.password)
+            return
+        try:
+            self.wlan.connect(self.ssid, self.password, bssid=bssid)
+        except TypeError:
+            # Port without the bssid argument
+            self.wlan.connect(self.ssid, self.password)
+
+    def _join_result(self, started, timeout):
+        """
+        Check a join in progress.
+
+        Returns:
+            bool: True when connected, False when it failed or timed out,
+                None while it is still pending
+        """
+        if self.wlan.isconnected():
+            return True
+        if self.wlan.status() in _FAILED:
+            return False
+        if ticks_diff(ticks_ms(), started) > timeout * 1000:
+            return False
+        self._polls += 1
+        if self.led is not None and self._polls % (LED_TOGGLE_MS // POLL_INTERVAL_MS) == 0:
+            self.led.toggle()
+        return None
+
+    def _joined(self, bssid, channel, started):
+        self.failures = 0
+        self.connect_count += 1
+        self.last_connect_ms = ticks_diff(ticks_ms(), started)
+        if self.led is not None:
+            self.led.off()
+
+        where = ""
+        if bssid is not None:
+            where = f" via {_format_bssid(bssid)}"
+            if bssid != self.bssid or channel != self.channel:
+                self.bssid = bssid
+                self.channel = channel
+                self._save_state()
+        print(f"WiFi: connected to {self.ssid}{where} in {self.last_connect_ms} ms")
+
+    def _failed(self):
+        if self.led is not None:
+            self.led.off()
+        self.wlan.disconnect()
+
+    def connect(self, timeout=15):
+        """
+        Make one connection attempt: the remembered access point first,
+        then the scanned ones, strongest first.
+
+        Args:
+            timeout (int): Timeout per scanned access point in seconds
+
+        Returns:
+            bool: True if connected
+        """
+        if self.wlan.isconnected():
+            return True
+        self.wlan.active(True)
+        print(f"Connecting to {self.ssid}...")
+
+        started = ticks_ms()
+        for bssid, channel, join_timeout in self._candidates(timeout):
+            self._start_join(bssid)
+            join_started = ticks_ms()
+            result = None
+            while result is None:
+                time.sleep(POLL_INTERVAL_MS / 1000)
+                result = self._join_result(join_started, join_timeout)
+            if result:
+                self._joined(bssid, channel, started)
+                return True
+
+        self._failed()
+        return False
+
+    async def connect_async(self, timeout=15):
+        """
+        Same as connect(), but lets other uasyncio tasks run while waiting.
+        The scan itself still blocks for about two seconds.
+        """
+        if self.wlan.isconnected():
+            return True
+        self.wlan.active(True)
+        print(f"Connecting to {self.ssid}...")
+
+        started = ticks_ms()
+        for bssid, channel, join_timeout in self._candidates(timeout):
+            self._start_join(bssid)
+            join_started = ticks_ms()
+            result = None
+            while result is None:
+                await asyncio.sleep(POLL_INTERVAL_MS / 1000)
+                result = self._join_result(join_started, join_timeout)
+            if result:
+                self._joined(bssid, channel, started)
+                return True
+
+        self._failed()
+        return False
+
+    def backoff_delay(self):
+        """
+        Delay before the next attempt: exponential in the number of failed
+        attempts, capped at MAX_BACKOFF, with random jitter so that many
+        devices do not retry in lockstep after an access point reboot.
+
+        Returns:
+            float: Delay in seconds
+        """
+        delay = min(MAX_BACKOFF, MIN_BACKOFF * 2 ** max(0, self.failures - 1))
+        return delay / 2 + random.random() * delay / 2
+
+    def reconnect(self, timeout=15):
+        """
+        Connect, retrying with backoff until it works.
+
+        Args:
+            timeout (int): Timeout per scanned access point in seconds
+        """
+        while not self.connect(timeout):
+            self.failures += 1
+            delay = self.backoff_delay()
+            print(f"WiFi: attempt {self.failures} failed, retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+    async def reconnect_async(self, timeout=15):
+        """
+        Same as reconnect(), for uasyncio tasks.
+        """
+        while not await self.connect_async(timeout):
+            self.failures += 1
+            delay = self.backoff_delay()
+            print(f"WiFi: attempt {self.failures} failed, retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
@@ -10,7 +10,7 @@ import logging
 import socket
 import time
 from datetime import datetime
-from flask import Flask, render_template, jsonify
+from flask import Flask, render_template, jsonify, request
 from flask_cors import CORS
 
 # Configure logging
@@ -137,6 +137,9 @@ def get_sequence():
     """
     Get information about the number sequence.
 
+    Supports conditional requests: the response carries an ETag, and a
+    matching If-None-Match header is answered with 304 Not Modified.
+
     Returns:
         JSON response with sequence configuration
 
@@ -155,7 +158,11 @@ def get_sequence():
         "description": "Numbers 1-9 rotating every second"
     }
 
-    return jsonify(response)
+    # The sequence never changes, so clients can revalidate with If-None-Match
+    # and get an empty 304 response
+    result = jsonify(response)
+    result.add_etag()
+    return result.make_conditional(request)
 
 
 @app.route('/api/status', methods=['GET'])
@@ -22,6 +22,38 @@ class NumberTransmitter {
         this.rotationCount = 0;
         this.serverSyncMode = false;
 
+        // Server sync timing (all times from performance.now(), in ms)
+        this.tickIntervalMs = 1000;      // Server changes the number every second
+        this.resyncIntervalMs = 10000;   // Routine resync with the server
+        this.driftThresholdMs = 50;      // Re-anchor when prediction is off by more
+        this.nextBoundaryAt = null;      // Predicted local time of next number change
+        this.tickTimeoutId = null;
+        this.syncTimeoutId = null;
+
+        // Cross-tab sharing: one visible tab (the leader) talks to the server
+        // and rebroadcasts its schedule to the other tabs of this origin
+        this.channel = 'BroadcastChannel' in window
+            ? new BroadcastChannel('number-transmitter')
+            : null;
+        // Web Locks only exist in secure contexts (HTTPS or localhost); over
+        // plain HTTP on the LAN the tabs elect a leader with heartbeats
+        this.useLocks = this.channel !== null && 'locks' in navigator;
+        this.isLeader = false;
+        this.leaderRequest = null;       // AbortController for the pending lock request
+        this.releaseLeadership = null;   // Resolves the held leader lock
+
+        // Heartbeat election: the leader announces itself every second; a
+        // tab that hears nothing for 3 seconds claims leadership, and of
+        // competing claims the lowest tab id wins
+        this.tabId = `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`;
+        this.heartbeatIntervalMs = 1000;
+        this.leaderTimeoutMs = 3000;
+        this.claimWindowMs = 250;
+        this.leaderSeenAt = null;        // performance.now() of the last heartbeat
+        this.claiming = false;
+        this.claimTimeoutId = null;
+        this.electionIntervalId = null;
+
         // Bind event listeners
         this.initEventListeners();
     }
@@ -38,6 +70,20 @@ class NumberTransmitter {
         if (this.syncToggle) {
             this.syncToggle.addEventListener('change', (e) => this.toggleSyncMode(e.target.checked));
         }
+
+        if (this.channel) {
+            this.channel.addEventListener('message', (e) => this.onChannelMessage(e.data));
+        }
+
+        // Hidden tabs take no part in syncing at all
+        document.addEventListener('visibilitychange', () => this.onVisibilityChange());
+
+        // A closing leader hands over at once instead of timing out
+        window.addEventListener('pagehide', () => {
+            if (this.serverSyncMode) {
+                this.stopServerSync();
+            }
+        });
     }
 
     /**
@@ -186,15 +232,47 @@ class NumberTransmitter {
 
     /**
      * Start synchronizing with the server API
+     *
+     * The server is only asked for the current number every few seconds.
+     * In between, the display advances locally at the boundaries predicted
+     * from next_change_in and the measured round-trip time. With several
+     * tabs open, only the leader tab asks the server; the others follow
+     * the schedule it broadcasts. Nothing happens while the tab is hidden.
      */
     startServerSync() {
-        // Fetch immediately
-        this.fetchFromServer();
+        this.nextBoundaryAt = null;
+        if (document.visibilityState === 'hidden') {
+            return;
+        }
 
-        // Set up interval to fetch from server every 500ms
-        this.intervalId = setInterval(() => {
-            this.fetchFromServer();
-        }, 500);
+        if (!this.channel) {
+            this.becomeLeader();
+            return;
+        }
+
+        // Ask a running leader for its schedule
+        this.channel.postMessage({ type: 'hello', id: this.tabId });
+
+        if (!this.useLocks) {
+            this.startElection();
+            return;
+        }
+
+        // Queue up for leadership
+        this.leaderRequest = new AbortController();
+        navigator.locks.request(
+            'number-transmitter-leader',
+            { signal: this.leaderRequest.signal },
+            () => {
+                this.leaderRequest = null;
+                this.becomeLeader();
+                return new Promise((resolve) => {
+                    this.releaseLeadership = resolve;
+                });
+            }
+        ).catch(() => {
+            // Request aborted because the tab left sync mode or was hidden
+        });
     }
 
     /**
@@ -205,34 +283,372 @@ class NumberTransmitter {
             clearInterval(this.intervalId);
             this.intervalId = null;
         }
+        if (this.tickTimeoutId) {
+            clearTimeout(this.tickTimeoutId);
+            this.tickTimeoutId = null;
+        }
+        if (this.syncTimeoutId) {
+            clearTimeout(this.syncTimeoutId);
+            this.syncTimeoutId = null;
+        }
+        this.nextBoundaryAt = null;
+
+        // Give up leadership so that a visible tab can take over
+        if (this.electionIntervalId) {
+            clearInterval(this.electionIntervalId);
+            this.electionIntervalId = null;
+        }
+        if (this.claimTimeoutId) {
+            clearTimeout(this.claimTimeoutId);
+            this.claimTimeoutId = null;
+        }
+        this.claiming = false;
+        if (this.isLeader && this.channel && !this.useLocks) {
+            this.channel.postMessage({ type: 'resign', id: this.tabId });
+        }
+        if (this.leaderRequest) {
+            this.leaderRequest.abort();
+            this.leaderRequest = null;
+        }
+        if (this.releaseLeadership) {
+            this.releaseLeadership();
+            this.releaseLeadership = null;
+        }
+        this.isLeader = false;
+    }
+
+    /**
+     * Pause syncing while the tab is hidden and resume when it is shown
+     */
+    onVisibilityChange() {
+        if (!this.serverSyncMode) {
+            return;
+        }
+
+        this.stopServerSync();
+        if (document.visibilityState === 'visible') {
+            this.startServerSync();
+        }
+    }
+
+    /**
+     * Take part in the heartbeat election until sync mode ends
+     *
+     * A leader that answers the hello stops the claim; otherwise this tab
+     * claims leadership after a short wait.
+     */
+    startElection() {
+        this.leaderSeenAt = null;
+        this.electionIntervalId = setInterval(() => this.onElectionTimer(), this.heartbeatIntervalMs);
+        this.claimTimeoutId = setTimeout(() => {
+            this.claimTimeoutId = null;
+            if (this.leaderSeenAt === null) {
+                this.claimLeadership();
+            }
+        }, this.claimWindowMs);
+    }
+
+    /**
+     * Send the leader's heartbeat, or claim leadership when it stopped
+     */
+    onElectionTimer() {
+        if (this.isLeader) {
+            this.channel.postMessage({ type: 'heartbeat', id: this.tabId });
+            return;
+        }
+
+        const silentFor = this.leaderSeenAt === null
+            ? Infinity
+            : performance.now() - this.leaderSeenAt;
+        if (silentFor > this.leaderTimeoutMs) {
+            this.claimLeadership();
+        }
+    }
+
+    /**
+     * Announce a claim and become leader unless a leader or a tab with a
+     * lower id objects within the claim window
+     */
+    claimLeadership() {
+        if (this.claiming || this.isLeader) {
+            return;
+        }
+
+        this.claiming = true;
+        this.channel.postMessage({ type: 'claim', id: this.tabId });
+        this.claimTimeoutId = setTimeout(() => {
+            this.claimTimeoutId = null;
+            if (this.claiming) {
+                this.claiming = false;
+                this.becomeLeader();
+            }
+        }, this.claimWindowMs);
+    }
+
+    /**
+     * Follow another tab's leadership
+     */
+    followLeader() {
+        this.leaderSeenAt = performance.now();
+        this.claiming = false;
+        if (this.isLeader) {
+            // Two leaders after a race: the one with the higher id steps down
+            this.isLeader = false;
+            if (this.syncTimeoutId) {
+                clearTimeout(this.syncTimeoutId);
+                this.syncTimeoutId = null;
+            }
+            console.log('This tab is no longer the server sync leader');
+        }
+    }
+
+    /**
+     * Take over talking to the server for all tabs
+     */
+    becomeLeader() {
+        this.isLeader = true;
+        console.log('This tab is now the server sync leader');
+        if (this.channel && !this.useLocks) {
+            this.channel.postMessage({ type: 'heartbeat', id: this.tabId });
+        }
+        this.syncWithServer();
+    }
+
+    /**
+     * Handle a message from another tab
+     *
+     * @param {Object} message - Message posted on the broadcast channel
+     */
+    onChannelMessage(message) {
+        if (!this.serverSyncMode || document.visibilityState === 'hidden') {
+            return;
+        }
+
+        if (!this.useLocks) {
+            this.onElectionMessage(message);
+        }
+
+        if (message.type === 'hello' && this.isLeader && this.nextBoundaryAt !== null) {
+            this.broadcastSchedule();
+        } else if (message.type === 'schedule' && !this.isLeader) {
+            // Epoch milliseconds are comparable across tabs, performance.now() is not
+            const boundaryAt = message.boundaryEpochMs - performance.timeOrigin;
+            this.adoptSchedule(message.number, message.totalCycles, boundaryAt);
+            this.updateStatus('Syncing with Server');
+        }
+    }
+
+    /**
+     * Handle the heartbeat election messages of another tab
+     *
+     * @param {Object} message - Message posted on the broadcast channel
+     */
+    onElectionMessage(message) {
+        switch (message.type) {
+            case 'hello':
+            case 'claim':
+                // An existing leader objects to new claims by announcing itself
+                if (this.isLeader) {
+                    this.channel.postMessage({ type: 'heartbeat', id: this.tabId });
+                } else if (message.type === 'claim' && this.claiming && message.id < this.tabId) {
+                    // Yield to the lower id and wait for its heartbeat
+                    this.claiming = false;
+                    this.leaderSeenAt = performance.now();
+                }
+                break;
+            case 'heartbeat':
+                if (!this.isLeader || message.id < this.tabId) {
+                    this.followLeader();
+                }
+                break;
+            case 'resign':
+                if (!this.isLeader) {
+                    this.leaderSeenAt = null;
+                    this.claimLeadership();
+                }
+                break;
+        }
+    }
+
+    /**
+     * Send the current local schedule to the other tabs
+     */
+    broadcastSchedule() {
+        if (!this.channel) {
+            return;
+        }
+
+        this.channel.postMessage({
+            type: 'schedule',
+            number: this.currentNumber,
+            totalCycles: this.rotationCount,
+            boundaryEpochMs: performance.timeOrigin + this.nextBoundaryAt,
+        });
+    }
+
+    /**
+     * Fetch from the server and schedule the next routine resync
+     */
+    async syncWithServer() {
+        if (this.syncTimeoutId) {
+            clearTimeout(this.syncTimeoutId);
+            this.syncTimeoutId = null;
+        }
+
+        const ok = await this.fetchFromServer();
+        if (!this.serverSyncMode || !this.isLeader) {
+            return;
+        }
+
+        if (ok) {
+            this.broadcastSchedule();
+        }
+
+        // Retry sooner after an error, otherwise only resync occasionally
+        const delay = ok ? this.resyncIntervalMs : this.tickIntervalMs;
+        this.syncTimeoutId = setTimeout(() => this.syncWithServer(), delay);
+    }
+
+    /**
+     * Get a fresh schedule after the local one turned out to be unreliable
+     */
+    requestResync() {
+        this.nextBoundaryAt = null;
+        if (this.isLeader) {
+            this.syncWithServer();
+        } else if (this.channel) {
+            this.channel.postMessage({ type: 'hello' });
+        }
     }
 
     /**
      * Fetch current number from the server API
+     *
+     * @returns {Promise<boolean>} True if the server answered successfully
      */
     async fetchFromServer() {
         try {
-            const response = await fetch('/api/number');
+            const sentAt = performance.now();
+            const response = await fetch('/api/number', { cache: 'no-store' });
             if (!response.ok) {
                 throw new Error(`HTTP error! status: ${response.status}`);
             }
 
             const data = await response.json();
-            const serverNumber = data.number;
-            const totalCycles = data.total_cycles;
-
-            // Update display if number changed
-            if (this.currentNumber !== serverNumber) {
-                this.currentNumber = serverNumber;
-                this.rotationCount = totalCycles;
-                this.updateDisplay();
-                this.updateRotationCount();
-                console.log(`Server number: ${this.currentNumber}, Cycles: ${totalCycles}`);
+            const receivedAt = performance.now();
+            if (!this.serverSyncMode) {
+                return true;
+            }
+
+            // The server computed next_change_in roughly half a round trip ago
+            const rtt = receivedAt - sentAt;
+            const boundaryAt = receivedAt - rtt / 2 + data.next_change_in * 1000;
+            if (this.adoptSchedule(data.number, data.total_cycles, boundaryAt)) {
+                console.log(`Server number: ${this.currentNumber}, RTT: ${rtt.toFixed(1)}ms`);
             }
+
+            if (this.statusDisplay.textContent !== 'Syncing with Server') {
+                this.updateStatus('Syncing with Server');
+            }
+            return true;
         } catch (error) {
             console.error('Error fetching from server:', error);
             this.updateStatus('Server Error');
+            return false;
+        }
+    }
+
+    /**
+     * Re-anchor the local schedule if it disagrees with a reported one
+     *
+     * @param {number} number - Number shown until the boundary (1-9)
+     * @param {number} totalCycles - Completed cycles at that number
+     * @param {number} boundaryAt - performance.now() time of the next change
+     * @returns {boolean} True if the local schedule was replaced
+     */
+    adoptSchedule(number, totalCycles, boundaryAt) {
+        // A slow answer may already be out of date; roll it forward
+        const now = performance.now();
+        while (boundaryAt <= now) {
+            boundaryAt += this.tickIntervalMs;
+            number = (number % 9) + 1;
+            if (number === 1) {
+                totalCycles++;
+            }
+        }
+
+        // Compare against the local schedule at the matching boundary;
+        // the report may be one tick older or newer than the display
+        let expectedNumber = null;
+        let drift = Infinity;
+        if (this.nextBoundaryAt !== null) {
+            const ticks = Math.round((boundaryAt - this.nextBoundaryAt) / this.tickIntervalMs);
+            expectedNumber = (((this.currentNumber - 1 + ticks) % 9) + 9) % 9 + 1;
+            drift = Math.abs(boundaryAt - (this.nextBoundaryAt + ticks * this.tickIntervalMs));
+        }
+
+        // Keep the current schedule unless it is wrong or has drifted
+        if (expectedNumber === number && drift <= this.driftThresholdMs) {
+            return false;
+        }
+
+        this.applyServerNumber(number, totalCycles);
+        this.scheduleTick(boundaryAt);
+        return true;
+    }
+
+    /**
+     * Show a number and cycle count reported by the server
+     *
+     * @param {number} number - Current server number (1-9)
+     * @param {number} totalCycles - Completed cycles reported by the server
+     */
+    applyServerNumber(number, totalCycles) {
+        const changed = this.currentNumber !== number;
+        this.currentNumber = number;
+        this.rotationCount = totalCycles;
+        if (changed) {
+            this.updateDisplay();
         }
+        this.updateRotationCount();
+    }
+
+    /**
+     * Schedule the next local number change at a predicted boundary
+     *
+     * @param {number} boundaryAt - performance.now() time of the next change
+     */
+    scheduleTick(boundaryAt) {
+        if (this.tickTimeoutId) {
+            clearTimeout(this.tickTimeoutId);
+        }
+
+        this.nextBoundaryAt = boundaryAt;
+        const delay = Math.max(0, boundaryAt - performance.now());
+        this.tickTimeoutId = setTimeout(() => this.onPredictedTick(), delay);
+    }
+
+    /**
+     * Advance the display at a predicted boundary and schedule the next one
+     */
+    onPredictedTick() {
+        this.tickTimeoutId = null;
+        if (!this.serverSyncMode) {
+            return;
+        }
+
+        // A timer that fires very late cannot be trusted; ask for a fresh
+        // schedule instead of guessing the missed boundaries
+        const lateBy = performance.now() - this.nextBoundaryAt;
+        if (lateBy > this.driftThresholdMs) {
+            this.requestResync();
+            return;
+        }
+
+        this.rotateNumber();
+        // Schedule from the predicted boundary, not from now, so that
+        // timer latency does not accumulate
+        this.scheduleTick(this.nextBoundaryAt + this.tickIntervalMs);
     }
 }
 
@@ -0,0 +1,75 @@
+"""
+Shared fixtures for the host-side tests.
+
+The examples and the Pico library are plain scripts rather than an
+installed package, so their folders are put on sys.path here, together
+with stand-ins for the MicroPython modules machine and network.
+"""
+
+import importlib.util
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+from werkzeug.serving import make_server
+
+ROOT = Path(__file__).resolve().parent.parent
+
+PICO_SCRIPTS = ROOT / 'src' / 'pico_scripts'
+
+for folder in (ROOT / 'examples', PICO_SCRIPTS / 'lib', ROOT / 'tests' / 'pico_stubs'):
+    if str(folder) not in sys.path:
+        sys.path.insert(0, str(folder))
+
+
+def load_module(name, path):
+    """Import a script that is not on sys.path under its own module name."""
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def number_api():
+    """The standalone API (src/api/app.py), freshly imported for each test."""
+    return load_module('number_api', ROOT / 'src' / 'api' / 'app.py')
+
+
+@pytest.fixture
+def api_consumer():
+    """05_api_consumer.py, freshly imported for each test."""
+    return load_module('api_consumer', PICO_SCRIPTS / '05_api_consumer.py')
+
+
+@pytest.fixture
+def signal_to_blink():
+    """04_wifi_signal_to_blink.py, freshly imported for each test."""
+    return load_module('signal_to_blink', PICO_SCRIPTS / '04_wifi_signal_to_blink.py')
+
+
+@pytest.fixture
+def access_point_web():
+    """06_access_point_web.py, freshly imported for each test."""
+    return load_module('access_point_web', PICO_SCRIPTS / '06_access_point_web.py')
+
+
+@pytest.fixture
+def serve():
+    """
+    Start Flask apps on free local ports in background threads.
+
+    Returns a function that takes an app and returns its base URL.
+    """
+    servers = []
+
+    def start(app):
+        server = make_server('127.0.0.1', 0, app, threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f'http://127.0.0.1:{server.server_port}'
+
+    yield start
+    for server in servers:
+        server.shutdown()
@@ -0,0 +1,85 @@
+"""
+Stand-in for MicroPython's machine module, for running Pico scripts on a
+computer. Pins remember their value and count how often they were
+switched on; timers call their callback when a test fires them.
+"""
+
+
+class Pin:
+    IN = 0
+    OUT = 1
+
+    def __init__(self, pin_id, mode=-1, value=None):
+        self.pin_id = pin_id
+        self._value = 0
+        self.on_count = 0
+
+    def value(self, value=None):
+        if value is None:
+            return self._value
+        if value and not self._value:
+            self.on_count += 1
+        self._value = 1 if value else 0
+
+    def on(self):
+        self.value(1)
+
+    def off(self):
+        self.value(0)
+
+    def toggle(self):
+        self.value(not self._value)
+
+
+class Timer:
+    """
+    Timer whose callback runs only when a test calls fire().
+
+    Every timer created is appended to `timers`.
+    """
+
+    ONE_SHOT = 0
+    PERIODIC = 1
+
+    def __init__(self, timer_id=-1, **kwargs):
+        self.mode = None
+        self.period = None
+        self.callback = None
+        self.init_count = 0
+        timers.append(self)
+        if kwargs:
+            self.init(**kwargs)
+
+    def init(self, mode=PERIODIC, period=-1, callback=None, **kwargs):
+        self.mode = mode
+        self.period = period
+        self.callback = callback
+        self.init_count += 1
+
+    def deinit(self):
+        self.callback = None
+
+    @property
+    def running(self):
+        return self.callback is not None
+
+    def fire(self, count=1):
+        """Run the callback as if `count` periods had passed."""
+        for _ in range(count):
+            callback = self.callback
+            if callback is None:
+                return
+            if self.mode == self.ONE_SHOT:
+                self.callback = None
+            callback(self)
+
+
+timers = []
+
+
+def reset():
+    pass
+
+
+def unique_id():
+    return b'\x00\x01\x02\x03\x04\x05\x06\x07'
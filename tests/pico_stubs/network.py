@@ -0,0 +1,49 @@
+"""
+Stand-in for MicroPython's network module, for running Pico scripts on a
+computer. The station interface is always connected.
+"""
+
+STA_IF = 0
+AP_IF = 1
+
+STAT_IDLE = 0
+STAT_CONNECTING = 1
+STAT_GOT_IP = 3
+STAT_CONNECT_FAIL = -1
+STAT_NO_AP_FOUND = -2
+STAT_WRONG_PASSWORD = -3
+
+
+class WLAN:
+    def __init__(self, interface=STA_IF):
+        self.interface = interface
+        self._active = False
+        self.connected = True
+
+    def active(self, active=None):
+        if active is None:
+            return self._active
+        self._active = active
+
+    def connect(self, ssid=None, key=None, **kwargs):
+        pass
+
+    def disconnect(self):
+        pass
+
+    def isconnected(self):
+        return self.connected
+
+    def status(self, param=None):
+        if param == 'rssi':
+            return -55
+        return STAT_GOT_IP if self.connected else STAT_IDLE
+
+    def scan(self):
+        return []
+
+    def config(self, *args, **kwargs):
+        return 0
+
+    def ifconfig(self):
+        return ('127.0.0.1', '255.255.255.0', '127.0.0.1', '127.0.0.1')
@@ -0,0 +1,207 @@
+"""
+Tests for the uasyncio web server of 06_access_point_web.py, run on the
+host with the stand-in machine and network modules from tests/pico_stubs.
+"""
+
+import asyncio
+
+import pytest
+
+STATUS_REQUEST = b"GET /api/status HTTP/1.1\r\nHost: pico\r\n\r\n"
+
+
+async def start(module):
+    server = await asyncio.start_server(module.handle_client, '127.0.0.1', 0)
+    return server, server.sockets[0].getsockname()[1]
+
+
+async def read_response(reader):
+    """Read one response and return its status line and body."""
+    head = await reader.readuntil(b"\r\n\r\n")
+    length = 0
+    for line in head.split(b"\r\n"):
+        if line.lower().startswith(b"content-length:"):
+            length = int(line.split(b":")[1])
+    body = await reader.readexactly(length)
+    return head.split(b"\r\n")[0], body
+
+
+async def open_full_server(module, send_request):
+    """Fill every connection slot; optionally complete one request on each."""
+    server, port = await start(module)
+    clients = []
+    for _ in range(module.MAX_CONNECTIONS):
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        if send_request:
+            writer.write(STATUS_REQUEST)
+            status, _ = await read_response(reader)
+            assert status == b"HTTP/1.1 200 OK"
+        clients.append((reader, writer))
+    await asyncio.sleep(0.05)
+    assert module.stats["active"] == module.MAX_CONNECTIONS
+    return server, port, clients
+
+
+async def close_all(server, clients):
+    for _, writer in clients:
+        writer.close()
+    server.close()
+    await server.wait_closed()
+
+
+def test_idle_keep_alive_connection_makes_room(access_point_web):
+    async def scenario():
+        server, port, clients = await open_full_server(access_point_web, True)
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(STATUS_REQUEST)
+        status, _ = await read_response(reader)
+
+        # The longest idle connection was closed by the server
+        oldest_closed = await asyncio.wait_for(clients[0][0].read(), 1) == b""
+        clients.append((reader, writer))
+        await asyncio.sleep(0.05)
+        active = access_point_web.stats["active"]
+        await close_all(server, clients)
+        return status, oldest_closed, active
+
+    status, oldest_closed, active = asyncio.run(scenario())
+
+    assert status == b"HTTP/1.1 200 OK"
+    assert oldest_closed
+    assert access_point_web.stats["evicted"] == 1
+    assert active == access_point_web.MAX_CONNECTIONS
+
+
+def test_busy_server_refuses_new_connections(access_point_web):
+    async def scenario():
+        # Connections that have not sent their first request are not idle
+        server, port, clients = await open_full_server(access_point_web, False)
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        status, _ = await read_response(reader)
+        clients.append((reader, writer))
+        await close_all(server, clients)
+        return status
+
+    assert asyncio.run(scenario()) == b"HTTP/1.1 503 Service Unavailable"
+    assert access_point_web.stats["evicted"] == 0
+    assert access_point_web.stats["rejected"] == 1
+
+
+def test_led_api_accepts_only_booleans(access_point_web):
+    handle = access_point_web.handle_api_request
+
+    status, _, body = handle("POST", "/api/led", memoryview(b'{"led": true}'))
+    assert (status, body) == ("200 OK", (b'{"led": true}',))
+
+    # 1 == True and 0 == False, but they are not booleans
+    for value in (b"1", b"0", b"1.0", b'"on"', b"null"):
+        status, _, _ = handle("POST", "/api/led", memoryview(b'{"led": ' + value + b'}'))
+        assert status == "400 Bad Request", value
+    assert access_point_web.led_state is True
+
+
+async def parse(module, data, chunk_size=None):
+    """
+    Feed data to a RequestParser and read every request in it.
+
+    Returns:
+        list: (method, path, body, keep_alive) per request, ending with the
+            status of a refused request if there is one
+    """
+    reader = asyncio.StreamReader()
+    chunk_size = chunk_size or len(data)
+
+    async def feed():
+        for start in range(0, len(data), chunk_size):
+            reader.feed_data(data[start:start + chunk_size])
+            await asyncio.sleep(0)
+        reader.feed_eof()
+
+    feeder = asyncio.ensure_future(feed())
+    parser = module.RequestParser(reader)
+    results = []
+    try:
+        while await parser.read(1):
+            results.append((parser.method, parser.path, bytes(parser.body), parser.keep_alive))
+            parser.consume()
+    except module.BadRequest as error:
+        results.append(error.status)
+    await feeder
+    return results
+
+
+POST_REQUEST = b"POST /api/led HTTP/1.1\r\nContent-Length: 13\r\n\r\n{\"led\": true}"
+
+
+def test_parser_reads_pipelined_requests(access_point_web):
+    data = STATUS_REQUEST + POST_REQUEST + b"GET / HTTP/1.0\r\n\r\n"
+    assert asyncio.run(parse(access_point_web, data)) == [
+        ("GET", "/api/status", b"", True),
+        ("POST", "/api/led", b'{"led": true}', True),
+        ("GET", "/", b"", False),
+    ]
+
+
+def test_parser_reads_a_request_byte_by_byte(access_point_web):
+    results = asyncio.run(parse(access_point_web, POST_REQUEST + STATUS_REQUEST, chunk_size=1))
+    assert results == [
+        ("POST", "/api/led", b'{"led": true}', True),
+        ("GET", "/api/status", b"", True),
+    ]
+
+
+@pytest.mark.parametrize("data, status", [
+    (b"GET / HTTP/1.1\r\nX-Fill: " + b"a" * 2000 + b"\r\n\r\n", "431 Request Header Fields Too Large"),
+    (b"GET / HTTP/1.1\r\n" + b"X: y\r\n" * 40 + b"\r\n", "431 Request Header Fields Too Large"),
+    (b"POST / HTTP/1.1\r\nContent-Length: 5000\r\n\r\n", "413 Payload Too Large"),
+    (b"POST / HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n", "501 Not Implemented"),
+    (b"PUT / HTTP/1.1\r\n\r\n", "501 Not Implemented"),
+    (b"GET / HTTP/1.1\r\nHost pico\r\n\r\n", "400 Bad Request"),
+    (b"POST / HTTP/1.1\r\nContent-Length: 1x\r\n\r\n", "400 Bad Request"),
+    (b"POST / HTTP/1.1\r\nContent-Length: -1\r\n\r\n", "400 Bad Request"),
+    (b"GET /\xff\xfe HTTP/1.1\r\n\r\n", "400 Bad Request"),
+    (b"POST / HTTP/1.1\r\nContent-Length: 5\r\nContent-Length: 5\r\n\r\nhello", "400 Bad Request"),
+    (b"GET / HTTP/1.1\nHost: pico\n\n", "400 Bad Request"),
+    (b"GET / HTTP/1.1\r\nHost: pico\n\r\n", "400 Bad Request"),
+    (b"GET / HTTP/1.1\r\nHost: a\rb\r\n\r\n", "400 Bad Request"),
+    (b"GET / HTTP/2.0\r\n\r\n", "400 Bad Request"),
+    (b"GET index.html HTTP/1.1\r\n\r\n", "400 Bad Request"),
+])
+def test_parser_refuses_bad_requests(access_point_web, data, status):
+    assert asyncio.run(parse(access_point_web, data)) == [status]
+    # Delivered in pieces, the same request is refused the same way
+    assert asyncio.run(parse(access_point_web, data, chunk_size=7)) == [status]
+
+
+def test_parser_refuses_a_bare_lf_at_once(access_point_web):
+    async def scenario():
+        # The client keeps the connection open after the bad line
+        reader = asyncio.StreamReader()
+        reader.feed_data(b"GET / HTTP/1.1\n")
+        parser = access_point_web.RequestParser(reader)
+        try:
+            await parser.read(1)
+        except access_point_web.BadRequest as error:
+            return error.status
+
+    assert asyncio.run(scenario()) == "400 Bad Request"
+
+
+def test_content_length_counts_bytes(access_point_web):
+    async def scenario():
+        server, port = await start(access_point_web)
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(b"GET / HTTP/1.0\r\n\r\n")
+        head = await reader.readuntil(b"\r\n\r\n")
+        body = await asyncio.wait_for(reader.read(), 2)
+        await close_all(server, [(reader, writer)])
+        return head, body
+
+    head, body = asyncio.run(scenario())
+    length = int(head.split(b"Content-Length: ")[1].split(b"\r\n")[0])
+    text = body.decode()
+
+    # The page has non-ASCII text, so characters and bytes differ
+    assert "\N{ELECTRIC PLUG}" in text
+    assert length == len(text.encode()) == len(body)
+    assert length > len(text)
@@ -0,0 +1,439 @@
+"""
+Tests for examples/api_client.py, against locally started servers.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+import api_client
+from api_client import (AsyncNumberTransmitterClient, CaptureWriter, NumberInfo,
+                        NumberTransmitterClient, ResponseCache, SequenceInfo)
+
+NUMBER_BODY = json.dumps({
+    'number': 3,
+    'timestamp': '2025-01-15T10:30:45.123456',
+    'unix_timestamp': 1736935845.123456,
+    'next_change_in': 0.5,
+    'cycle_position': 3,
+    'total_cycles': 7,
+}).encode()
+
+
+class KeepAliveServer:
+    """
+    Minimal HTTP/1.1 server that answers every request with a fixed body
+    and closes connections that are idle for longer than idle_timeout.
+    """
+
+    def __init__(self, body, content_type='application/json', idle_timeout=5.0):
+        self.body = body
+        self.content_type = content_type
+        self.idle_timeout = idle_timeout
+        self.connections = 0
+        self.requests = 0
+        self.server = None
+
+    async def __aenter__(self):
+        self.server = await asyncio.start_server(self._handle, '127.0.0.1', 0)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.server.close()
+        await self.server.wait_closed()
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.server.sockets[0].getsockname()[1]}'
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                try:
+                    await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), self.idle_timeout)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError):
+                    break
+                self.requests += 1
+                writer.write(
+                    b'HTTP/1.1 200 OK\r\n'
+                    + f'Content-Type: {self.content_type}\r\n'.encode()
+                    + f'Content-Length: {len(self.body)}\r\n\r\n'.encode()
+                    + self.body
+                )
+                await writer.drain()
+        finally:
+            writer.close()
+
+
+class ScriptedHandler(BaseHTTPRequestHandler):
+    """Keep-alive handler that follows the server's script, one step per request."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self):
+        with self.server.lock:
+            self.server.requests += 1
+            step = self.server.script.pop(0) if self.server.script else 200
+        if step == 'drop':
+            # Close the connection without an answer
+            self.close_connection = True
+            return
+        self.send_response(step)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(self.server.body)))
+        self.end_headers()
+        self.wfile.write(self.server.body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ScriptedServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP/1.1 server for the synchronous client. Each request takes
+    the next step of the script: a status code to answer with, or 'drop'
+    to close the connection. When the script runs out it answers 200.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, script=(), body=NUMBER_BODY):
+        super().__init__(('127.0.0.1', 0), ScriptedHandler)
+        self.script = list(script)
+        self.body = body
+        self.connections = 0
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+        self.server_close()
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.server_port}'
+
+
+def test_connection_closed_while_idle_is_reopened():
+    async def run():
+        async with KeepAliveServer(NUMBER_BODY, idle_timeout=0.2) as server:
+            async with AsyncNumberTransmitterClient(server.url, retries=0) as client:
+                first = await client.get_current_number()
+                # The server closes the pooled connection in the meantime
+                await asyncio.sleep(0.5)
+                second = await client.get_current_number()
+            return first, second, server.connections
+
+    first, second, connections = asyncio.run(run())
+    assert first.number == second.number == 3
+    assert connections == 2
+
+
+def test_monitor_many_counts_errors_per_instance():
+    async def run():
+        async with KeepAliveServer(NUMBER_BODY, idle_timeout=0.2) as good, \
+                KeepAliveServer(b'<html>Hello</html>', 'text/html') as html, \
+                KeepAliveServer(b'{"number": 3}') as incomplete:
+            dead = 'http://127.0.0.1:9'
+            urls = [good.url, html.url, incomplete.url, dead]
+            results = await AsyncNumberTransmitterClient.monitor_many(
+                urls, duration=1.5, interval=0.3, timeout=1
+            )
+            return urls, results
+
+    (good, html, incomplete, dead), results = asyncio.run(run())
+
+    # Polled every 0.3 s, the good instance outlives its 0.2 s idle timeout
+    # every time without a single error
+    assert results[good]['errors'] == 0
+    assert results[good]['samples'] >= 3
+    assert results[good]['last_number'] == 3
+
+    assert results[html]['samples'] == 0
+    assert 'JSONDecodeError' in results[html]['last_error']
+    assert 'KeyError' in results[incomplete]['last_error']
+    assert results[dead]['errors'] > 0
+
+
+def test_monitor_many_keeps_recent_latencies_only(monkeypatch):
+    monkeypatch.setattr(api_client, 'MONITOR_MANY_LATENCY_SAMPLES', 3)
+
+    async def run():
+        async with KeepAliveServer(NUMBER_BODY) as server:
+            return server.url, await AsyncNumberTransmitterClient.monitor_many(
+                [server.url], duration=1, interval=0.05
+            )
+
+    url, results = asyncio.run(run())
+    assert results[url]['samples'] > 3
+    assert len(results[url]['latencies']) == 3
+
+
+def test_monitor_many_against_api_app(number_api, serve):
+    urls = [serve(number_api.app), serve(number_api.app)]
+    results = asyncio.run(AsyncNumberTransmitterClient.monitor_many(
+        urls, duration=1, interval=0.2
+    ))
+    for url in urls:
+        assert results[url]['errors'] == 0
+        assert 1 <= results[url]['last_number'] <= 9
+
+
+def sample(i):
+    return (1000.0 + i, 1000.05 + i, 1000.02 + i, i % 9 + 1, i // 9, 0.5, 0.05)
+
+
+def test_capture_rotates_into_bounded_segments(tmp_path):
+    writer = CaptureWriter(tmp_path / 'soak.csv', max_bytes=200, flush_interval=0.05)
+    for i in range(50):
+        writer.write(*sample(i))
+    writer.close()
+
+    segments = sorted(tmp_path.iterdir())
+    assert len(segments) == writer.segment_count > 1
+    assert writer.segment in segments
+
+    rows = []
+    for path in segments:
+        lines = path.read_text().splitlines()
+        assert lines[0] == ','.join(CaptureWriter.FIELDS)
+        # A segment is closed once it holds max_bytes
+        assert len(path.read_bytes()) < 200 + 2 * len(lines[1]) + len(lines[0])
+        rows += lines[1:]
+    assert len(rows) == 50
+    assert sorted(float(row.split(',')[0]) for row in rows) == [1000.0 + i for i in range(50)]
+
+
+def test_capture_reports_a_bad_path_at_once(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        CaptureWriter(tmp_path / 'missing' / 'soak.ndjson')
+
+
+def test_capture_writer_failure_reaches_the_caller(tmp_path):
+    writer = CaptureWriter(tmp_path / 'soak.ndjson', queue_size=1, flush_interval=0.05)
+    writer.write(object(), 0, 0, 0, 0, 0, 0)  # not JSON serializable
+    writer._thread.join(2)
+
+    with pytest.raises(TypeError):
+        writer.write(*sample(1))
+    # The dead thread no longer empties the full queue; close() must not hang
+    writer._queue.put_nowait(sample(2))
+    with pytest.raises(TypeError):
+        writer.close()
+
+
+def run_threads(count, target):
+    """Run target in several threads at once and return their results."""
+    results = [None] * count
+    barrier = threading.Barrier(count)
+
+    def run(index):
+        barrier.wait()
+        try:
+            results[index] = target()
+        except Exception as error:
+            results[index] = error
+
+    threads = [threading.Thread(target=run, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_cache_coalesces_concurrent_loads():
+    cache = ResponseCache()
+    calls = []
+
+    def load(stale):
+        calls.append(stale)
+        time.sleep(0.1)
+        return api_client._CacheEntry('value', time.monotonic(), time.monotonic() + 60)
+
+    results = run_threads(8, lambda: cache.get_or_load('key', load))
+
+    assert calls == [None]
+    assert len({id(entry) for entry in results}) == 1
+
+
+def test_cache_shares_a_failed_load():
+    cache = ResponseCache()
+    calls = []
+
+    def load(stale):
+        calls.append(stale)
+        time.sleep(0.1)
+        raise ConnectionError('server down')
+
+    started = time.monotonic()
+    results = run_threads(8, lambda: cache.get_or_load('key', load))
+
+    assert len(calls) == 1
+    assert all(isinstance(result, ConnectionError) for result in results)
+    # Nobody ran the load again after the first one failed
+    assert time.monotonic() - started < 0.19
+
+
+def test_cache_reloads_an_expired_entry():
+    cache = ResponseCache()
+    stale_entries = []
+
+    def load(stale):
+        stale_entries.append(stale)
+        now = time.monotonic()
+        return api_client._CacheEntry(len(stale_entries), now, now + 0.05)
+
+    assert cache.get_or_load('key', load).value == 1
+    assert cache.get_or_load('key', load).value == 1
+    time.sleep(0.06)
+    assert cache.get_or_load('key', load).value == 2
+    assert stale_entries[0] is None
+    assert stale_entries[1].value == 1
+
+
+def test_sequence_is_revalidated_with_its_etag(number_api, serve):
+    statuses = []
+    with NumberTransmitterClient(serve(number_api.app), sequence_ttl=0) as client:
+        client.session.hooks['response'].append(
+            lambda response, *args, **kwargs: statuses.append(
+                (response.status_code, response.request.headers.get('If-None-Match'))))
+        first = client.get_sequence_info()
+        second = client.get_sequence_info()
+
+    assert first == second
+    assert statuses[0][0] == 200
+    assert statuses[1][0] == 304
+    assert statuses[1][1] is not None
+
+
+def test_client_reuses_one_pooled_connection():
+    with ScriptedServer() as server, \
+            NumberTransmitterClient(server.url, cache=False) as client:
+        numbers = [client.get_current_number().number for _ in range(5)]
+
+    assert numbers == [3] * 5
+    assert server.requests == 5
+    assert server.connections == 1
+
+
+def test_client_retries_a_dropped_connection():
+    with ScriptedServer(['drop', 'drop']) as server, \
+            NumberTransmitterClient(server.url, backoff=0.01, cache=False) as client:
+        assert client.get_current_number().number == 3
+
+    assert server.requests == 3
+
+
+def test_client_backs_off_with_full_jitter(monkeypatch):
+    bounds = []
+    delays = []
+    monkeypatch.setattr(api_client.random, 'uniform',
+                        lambda low, high: bounds.append((low, high)) or high / 2)
+    monkeypatch.setattr(api_client.time, 'sleep', delays.append)
+
+    with ScriptedServer(['drop'] * 4) as server, \
+            NumberTransmitterClient(server.url, retries=3, backoff=0.1, cache=False) as client:
+        with pytest.raises(requests.ConnectionError):
+            client.get_current_number()
+
+    assert server.requests == 4
+    # Each delay is drawn from zero up to the doubled exponential bound
+    assert bounds == [(0, 0.1), (0, 0.2), (0, 0.4)]
+    assert delays == [0.05, 0.1, 0.2]
+
+
+def test_client_does_not_retry_http_errors():
+    with ScriptedServer([500]) as server, \
+            NumberTransmitterClient(server.url, backoff=0.01, cache=False) as client:
+        with pytest.raises(requests.HTTPError):
+            client.get_current_number()
+
+    assert server.requests == 1
+
+
+def test_monitor_counts_missed_duplicate_and_restarted_ticks(monkeypatch):
+    # (number, total_cycles) of each answer; None is a failed request
+    answers = iter([(9, 0), (1, 1), (1, 1), None, (4, 1), (5, 1), (2, 0)])
+
+    def load_number(timeout):
+        answer = next(answers, 'end')
+        if answer == 'end':
+            raise KeyboardInterrupt
+        if answer is None:
+            raise requests.ConnectionError('refused')
+        number, total_cycles = answer
+        info = NumberInfo(number, '', 0.0, 0.9, number, total_cycles)
+        return api_client._CacheEntry(info, 0.0, 0.0)
+
+    monkeypatch.setattr(api_client.time, 'sleep', lambda seconds: None)
+    client = NumberTransmitterClient()
+    monkeypatch.setattr(client, 'get_sequence_info',
+                        lambda: SequenceInfo(list(range(1, 10)), 9, 1.0, 'test'))
+    monkeypatch.setattr(client, '_load_number', load_number)
+
+    summary = client.monitor(duration=60)
+
+    assert summary['requests'] == 7
+    assert summary['errors'] == 1
+    assert summary['ticks'] == 5
+    assert summary['duplicates'] == 1
+    assert summary['missed'] == 2
+    assert summary['restarts'] == 1
+    assert summary['lateness'].count == 4
+    assert summary['lateness'].mean == pytest.approx(0.1)
+
+
+def test_monitor_sees_every_tick_of_the_api_app(number_api, serve):
+    with NumberTransmitterClient(serve(number_api.app)) as client:
+        summary = client.monitor(duration=2.5)
+
+    assert summary['errors'] == 0
+    assert summary['ticks'] >= 3
+    assert summary['missed'] == 0
+    assert summary['duplicates'] == 0
+
+
+def test_benchmark_reuses_pooled_connections():
+    with ScriptedServer() as server, NumberTransmitterClient(server.url) as client:
+        report = api_client.run_benchmark(client, 'number', workers=2, total=20)
+
+    assert report['requests'] == server.requests == 20
+    assert report['errors'] == 0
+    assert 1 <= report['connections_opened'] == server.connections <= 2
+    assert report['connection_reuse'] >= 0.9
+    assert set(report['latency_ms']) == {'p50', 'p90', 'p99', 'max'}
+
+
+def test_benchmark_counts_errors_and_reconnects():
+    with ScriptedServer([500] * 3 + ['drop']) as server, \
+            NumberTransmitterClient(server.url) as client:
+        report = api_client.run_benchmark(client, 'number', workers=1, total=10)
+
+    assert report['requests'] == 10
+    assert report['errors_by_kind'] == {'HTTP 500': 3, 'ConnectionError': 1}
+    assert report['error_rate'] == 0.4
+    assert report['connections_opened'] == server.connections == 2
+
+
+def test_benchmark_against_api_app(number_api, serve):
+    with NumberTransmitterClient(serve(number_api.app)) as client:
+        report = api_client.run_benchmark(client, 'status', workers=2, total=10)
+
+    assert report['requests'] == 10
+    assert report['errors'] == 0
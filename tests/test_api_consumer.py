@@ -0,0 +1,126 @@
+"""
+Tests for the uasyncio tasks of 05_api_consumer.py, run on the host with
+the stand-in machine and network modules from tests/pico_stubs.
+"""
+
+import asyncio
+import time
+from urllib.parse import urlsplit
+
+from http_client import HTTPClient
+from number_parser import NumberReading
+from ticks import ticks_add, ticks_ms
+
+
+async def run_for(seconds, *tasks):
+    """Run endless tasks side by side for a while, then cancel them."""
+    try:
+        await asyncio.wait_for(asyncio.gather(*tasks), seconds)
+    except asyncio.TimeoutError:
+        pass
+
+
+def test_apply_sync_rolls_a_late_answer_forward(api_consumer):
+    async def scenario():
+        state = api_consumer.ConsumerState()
+        reading = NumberReading()
+        reading.number = 9
+        reading.total_cycles = 2
+        reading.next_change_ms = 40
+
+        # The answer took 200 ms, so its boundary passed before it arrived
+        correction = api_consumer.apply_sync(state, reading, 1000, 1200)
+        return state, correction
+
+    state, correction = asyncio.run(scenario())
+
+    assert correction is None
+    assert (state.number, state.total_cycles) == (1, 3)
+    assert state.boundary_at == 1200 + 40 - 100 + api_consumer.TICK_MS
+
+
+def test_number_ticker_follows_the_schedule(api_consumer):
+    async def scenario():
+        state = api_consumer.ConsumerState()
+        state.tick = 8
+        state.boundary_at = ticks_add(ticks_ms(), 100)
+        await run_for(1.3, api_consumer.number_ticker(state))
+        return state
+
+    state = asyncio.run(scenario())
+
+    # Boundaries at +100 ms and +1100 ms
+    assert state.tick == 10
+    assert (state.number, state.total_cycles) == (2, 1)
+
+
+def test_clock_sync_matches_the_api(api_consumer, number_api, serve):
+    url = urlsplit(serve(number_api.app))
+
+    async def scenario():
+        state = api_consumer.ConsumerState()
+        state.connected = True
+        client = HTTPClient(url.hostname, url.port)
+        try:
+            await run_for(
+                2.6,
+                api_consumer.clock_sync(state, client, '/api/number', interval=1),
+                api_consumer.number_ticker(state),
+            )
+        finally:
+            await client.close()
+        return state
+
+    state = asyncio.run(scenario())
+    elapsed = time.time() - number_api.START_TIME
+
+    assert state.query_count >= 2
+    assert state.error_count == 0
+    # Allow for a number change between the end of the run and now
+    assert int(elapsed) - 1 <= state.tick <= int(elapsed)
+    assert state.number == state.tick % 9 + 1
+
+
+def test_led_renderer_blinks_the_number(api_consumer):
+    async def scenario():
+        state = api_consumer.ConsumerState()
+        state.connected = True
+        state.number = 3
+        await run_for(1.2, api_consumer.led_renderer(state))
+
+    asyncio.run(scenario())
+
+    assert api_consumer.led.on_count == 3
+    assert api_consumer.led.value() == 0
+
+
+def test_led_renderer_restarts_on_a_new_number(api_consumer):
+    async def scenario():
+        state = api_consumer.ConsumerState()
+        state.connected = True
+        state.number = 9
+
+        async def change_number():
+            await asyncio.sleep(0.15)
+            api_consumer.set_tick(state, 1)
+
+        await run_for(1.5, api_consumer.led_renderer(state), change_number())
+
+    asyncio.run(scenario())
+
+    # Part of the 9 blinks, then the full pattern for 2
+    assert 3 <= api_consumer.led.on_count < 9
+
+
+def test_led_renderer_flashes_on_a_failed_request(api_consumer):
+    async def scenario():
+        state = api_consumer.ConsumerState()
+        state.connected = True
+        state.request_failed = True
+        await run_for(0.9, api_consumer.led_renderer(state))
+        return state
+
+    state = asyncio.run(scenario())
+
+    assert api_consumer.led.on_count == 3
+    assert not state.request_failed
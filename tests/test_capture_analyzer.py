@@ -0,0 +1,112 @@
+"""
+Tests for loading monitor captures in capture_analyzer.py.
+"""
+
+import json
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from api_client import CaptureWriter  # noqa: E402
+from capture_analyzer import analyze, load_captures  # noqa: E402
+
+SAMPLES = [
+    (1000.0 + i, 1000.02 + i, 1000.01 + i, i % 9 + 1, i // 9, 0.5, 0.02)
+    for i in range(30)
+]
+
+
+@pytest.mark.parametrize('name', ['capture.ndjson', 'capture.csv', 'capture.ndjson.gz'])
+def test_loads_what_capture_writer_writes(tmp_path, name):
+    with CaptureWriter(tmp_path / name) as writer:
+        for sample in SAMPLES:
+            writer.write(*sample)
+
+    data = load_captures([writer.segment])
+    for index, field in enumerate(CaptureWriter.FIELDS):
+        assert data[field] == pytest.approx([sample[index] for sample in SAMPLES])
+
+
+def test_ndjson_ignores_key_order_and_extra_fields(tmp_path):
+    path = tmp_path / 'capture.ndjson'
+    with open(path, 'w') as capture:
+        for sample in SAMPLES:
+            record = dict(zip(CaptureWriter.FIELDS, sample))
+            record['note'] = 'host: pico-01, {retry}'
+            capture.write(json.dumps(dict(reversed(record.items()))) + '\n')
+
+    data = load_captures([path])
+    assert 'note' not in data
+    assert data['sent_at'] == pytest.approx([sample[0] for sample in SAMPLES])
+    assert data['number'] == pytest.approx([sample[3] for sample in SAMPLES])
+
+
+def test_ndjson_skips_a_truncated_last_line(tmp_path):
+    path = tmp_path / 'capture.ndjson'
+    with open(path, 'w') as capture:
+        for sample in SAMPLES:
+            capture.write(json.dumps(dict(zip(CaptureWriter.FIELDS, sample))) + '\n')
+        capture.write('{"sent_at": 2000.0, "received_')
+
+    data = load_captures([path])
+    assert len(data['sent_at']) == len(SAMPLES)
+
+
+def write_csv(path, rows, tail=''):
+    with open(path, 'w') as capture:
+        capture.write(','.join(CaptureWriter.FIELDS) + '\n')
+        for row in rows:
+            capture.write(','.join('' if value is None else repr(value) for value in row) + '\n')
+        capture.write(tail)
+
+
+def test_csv_skips_a_truncated_last_line(tmp_path):
+    path = tmp_path / 'capture.csv'
+    # Cut off inside the last field, so the field count is still right
+    write_csv(path, SAMPLES, tail='2000.0,2000.02,2000.01,1,9,0.5,0.0')
+
+    data = load_captures([path])
+    assert data['sent_at'] == pytest.approx([sample[0] for sample in SAMPLES])
+    assert data['rtt'] == pytest.approx([sample[6] for sample in SAMPLES])
+
+
+def test_csv_keeps_missing_values_as_nan(tmp_path):
+    path = tmp_path / 'capture.csv'
+    rows = [list(sample) for sample in SAMPLES]
+    rows[5][3] = None
+    write_csv(path, rows + [[1.0, 2.0]])
+
+    data = load_captures([path])
+    assert len(data['number']) == len(SAMPLES)
+    assert np.isnan(data['number'][5])
+
+
+def test_analyze_leaves_out_incomplete_samples(tmp_path):
+    path = tmp_path / 'capture.csv'
+    rows = [list(sample) for sample in SAMPLES]
+    rows[5][3] = None
+    rows[12][4] = None
+    write_csv(path, rows)
+
+    report = analyze(load_captures([path]))
+    summary = report['summary']
+    assert summary['samples'] == len(SAMPLES) - 2
+    assert summary['incomplete_samples'] == 2
+    # The remaining ticks are consecutive apart from the two left out
+    assert summary['missed_ticks'] == 2
+    assert summary['server_restarts'] == 0
+
+
+def test_hours_are_utc(tmp_path):
+    path = tmp_path / 'capture.csv'
+    # 2025-01-15 10:59:50 to 11:00:19 UTC
+    start = 1736938790.0
+    write_csv(path, [(start + i, start + i + 0.02, start + i + 0.01) + sample[3:]
+                     for i, sample in enumerate(SAMPLES)])
+
+    hours = analyze(load_captures([path]))['hours']
+    assert [(row['hour'], row['samples']) for row in hours] == [
+        ('2025-01-15 10:00', 10),
+        ('2025-01-15 11:00', 20),
+    ]
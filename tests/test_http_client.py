@@ -0,0 +1,96 @@
+"""
+Tests for the keep-alive HTTP client (src/pico_scripts/lib/http_client.py),
+run under CPython against a local server.
+"""
+
+import asyncio
+import socket
+
+import pytest
+
+import http_client
+from http_client import HTTPClient
+
+BODY = b'{"number": 3}'
+
+
+async def answer(reader, writer):
+    """Answer every request on a connection with BODY."""
+    try:
+        while True:
+            try:
+                await reader.readuntil(b'\r\n\r\n')
+            except asyncio.IncompleteReadError:
+                break
+            writer.write(b'HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n' % len(BODY) + BODY)
+            await writer.drain()
+    finally:
+        writer.close()
+
+
+def free_port():
+    """A local port that nothing listens on."""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def lookups(monkeypatch):
+    """
+    Replace the DNS lookup. Append ports to the returned list; every lookup
+    takes the next one.
+    """
+    ports = []
+    calls = []
+
+    def getaddrinfo(host, port, family, type):
+        calls.append(host)
+        return [(socket.AF_INET, type, 0, '', ('127.0.0.1', ports.pop(0)))]
+
+    monkeypatch.setattr(http_client.socket, 'getaddrinfo', getaddrinfo)
+    return ports, calls
+
+
+def test_address_is_resolved_once(lookups):
+    ports, calls = lookups
+
+    async def scenario():
+        server = await asyncio.start_server(answer, '127.0.0.1', 0)
+        ports.append(server.sockets[0].getsockname()[1])
+        client = HTTPClient('pico-api.local', 80)
+        try:
+            bodies = [bytes((await client.get('/api/number'))[1]) for _ in range(3)]
+        finally:
+            await client.close()
+            server.close()
+            await server.wait_closed()
+        return bodies, client.connect_count
+
+    bodies, connect_count = asyncio.run(scenario())
+
+    assert bodies == [BODY] * 3
+    assert connect_count == 1
+    assert calls == ['pico-api.local']
+
+
+def test_failed_connect_resolves_the_address_again(lookups):
+    ports, calls = lookups
+
+    async def scenario():
+        server = await asyncio.start_server(answer, '127.0.0.1', 0)
+        # The first lookup returns an address where nothing listens any more
+        ports.extend([free_port(), server.sockets[0].getsockname()[1]])
+        client = HTTPClient('pico-api.local', 80, timeout=1)
+        try:
+            with pytest.raises(OSError):
+                await client.get('/api/number')
+            status, body = await client.get('/api/number')
+            return status, bytes(body)
+        finally:
+            await client.close()
+            server.close()
+            await server.wait_closed()
+
+    assert asyncio.run(scenario()) == (200, BODY)
+    assert len(calls) == 2
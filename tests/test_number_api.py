@@ -0,0 +1,149 @@
+"""
+Tests for the standalone Number Transmitter API (src/api/app.py). Relay
+mode is tested against an origin running in a separate process.
+"""
+
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+import requests
+
+API_DIR = Path(__file__).resolve().parent.parent / 'src' / 'api'
+
+# A recent sample time, as sent by a device with a synced clock
+RECENT = time.time() - 60
+
+
+@pytest.mark.parametrize('sample', [
+    [10 ** 400, -60, 40.0],
+    [RECENT, -60, -(10 ** 400)],
+    [RECENT, -60, -1.0],
+    [RECENT, -200, 40.0],
+    [RECENT, True, 40.0],
+    [RECENT, -60, '40'],
+    [1e18, -60, 40.0],
+    [RECENT + 3600, -60, 40.0],
+    [RECENT - 30 * 86400, -60, 40.0],
+    [0, -60, 40.0],
+])
+def test_telemetry_rejects_bad_samples(number_api, sample):
+    client = number_api.app.test_client()
+    response = client.post('/api/telemetry', json={'device': 'pico-01', 'samples': [sample]})
+
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Bad request'
+
+
+def test_telemetry_stores_samples(number_api):
+    client = number_api.app.test_client()
+    samples = [[int(RECENT), -58, 42], [RECENT + 1.5, -60, 40.5]]
+    response = client.post('/api/telemetry', json={'device': 'pico-01', 'samples': samples})
+
+    assert response.status_code == 200
+    assert response.get_json() == {'device': 'pico-01', 'stored': 2, 'dropped': 0}
+
+
+def test_future_timestamp_does_not_block_the_device(number_api):
+    client = number_api.app.test_client()
+    response = client.post('/api/telemetry', json={'device': 'pico-01', 'samples': [[1e18, -60, 40]]})
+    assert response.status_code == 400
+
+    response = client.post('/api/telemetry', json={'device': 'pico-01', 'samples': [[RECENT, -60, 40]]})
+    assert response.get_json()['stored'] == 1
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class Origin:
+    """The API running as an origin transmitter in its own process."""
+
+    def __init__(self):
+        self.port = free_port()
+        self.url = f'http://127.0.0.1:{self.port}'
+        self.process = None
+
+    def start(self):
+        script = ('import sys; sys.path.insert(0, sys.argv[1]); from app import app; '
+                  'app.run(host="127.0.0.1", port=int(sys.argv[2]))')
+        self.process = subprocess.Popen(
+            [sys.executable, '-c', script, str(API_DIR), str(self.port)],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            try:
+                requests.get(self.url + '/api/status', timeout=1)
+                return
+            except requests.ConnectionError:
+                time.sleep(0.05)
+        raise RuntimeError('origin did not start')
+
+    def stop(self):
+        self.process.terminate()
+        self.process.wait(5)
+
+    def start_time(self):
+        """Start of the origin's rotation, from its own /api/number."""
+        return rotation_start(requests.get(self.url + '/api/number', timeout=1).json())
+
+
+def rotation_start(data):
+    position = data['total_cycles'] * 9 + data['number'] - 1
+    return data['unix_timestamp'] - (position + 1 - data['next_change_in'])
+
+
+@pytest.fixture
+def origin():
+    origin = Origin()
+    origin.start()
+    yield origin
+    origin.stop()
+
+
+def test_relay_serves_the_origin_schedule(number_api, origin):
+    number_api.enable_relay(origin.url)
+    client = number_api.app.test_client()
+
+    relayed = client.get('/api/number').get_json()
+    status = client.get('/api/status').get_json()
+    origin_status = requests.get(origin.url + '/api/status', timeout=1).json()
+
+    assert abs(rotation_start(relayed) - origin.start_time()) < 0.01
+    assert status['mode'] == 'relay'
+    assert status['relay']['syncs'] == 1
+    assert abs(status['relay']['upstream_uptime_seconds'] - origin_status['uptime_seconds']) < 0.05
+
+
+def test_relay_follows_an_origin_restart(number_api, origin):
+    number_api.relay = relay = number_api.UpstreamSchedule(origin.url, check_interval=0.2)
+    old_start = relay.get_start_time()
+
+    origin.stop()
+    time.sleep(1.5)
+    origin.start()
+    new_start = origin.start_time()
+    assert new_start - old_start > 1
+
+    # The first check after check_interval notices the restart
+    deadline = time.monotonic() + 5
+    while abs(relay.get_start_time() - new_start) > 0.01 and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+    assert abs(relay.get_start_time() - new_start) < 0.01
+    assert relay.status()['syncs'] == 2
+    assert relay.status()['checks'] >= 1
+
+
+def test_relay_without_upstream_answers_503(number_api):
+    number_api.relay = number_api.UpstreamSchedule(f'http://127.0.0.1:{free_port()}', timeout=1)
+    response = number_api.app.test_client().get('/api/number')
+
+    assert response.status_code == 503
+    assert response.get_json()['error'] == 'Upstream unavailable'
@@ -0,0 +1,118 @@
+"""
+Tests for the allocation-free /api/number parser
+(src/pico_scripts/lib/number_parser.py), checked against the json module.
+"""
+
+import json
+import random
+import tracemalloc
+from decimal import Decimal
+
+import pytest
+
+from number_parser import NumberReading, parse_number_response
+
+API_BODY = (
+    b'{"cycle_position":5,"next_change_in":0.876544,"number":5,'
+    b'"timestamp":"2025-01-15T10:30:45.123456","total_cycles":12345,'
+    b'"unix_timestamp":1736935845.123456}'
+)
+
+
+def parse(body):
+    """Parse body from a receive buffer the way HTTPClient hands it over."""
+    reading = NumberReading()
+    complete = parse_number_response(memoryview(bytearray(body)), reading)
+    return complete, (reading.number, reading.total_cycles, reading.next_change_ms)
+
+
+def expected(body):
+    """The three values from json.loads, next_change_in in whole milliseconds."""
+    data = json.loads(body)
+    next_change_ms = int(Decimal(repr(data['next_change_in'])) * 1000)
+    return data['number'], data['total_cycles'], next_change_ms
+
+
+def random_bodies(count):
+    rng = random.Random(0)
+    for _ in range(count):
+        data = {
+            'cycle_position': rng.randint(1, 9),
+            'next_change_in': round(rng.random(), 6),
+            'number': rng.randint(1, 9),
+            'timestamp': '2025-01-15T10:30:45.123456',
+            'total_cycles': rng.randint(0, 10 ** 7),
+            'unix_timestamp': rng.random() * 2e9,
+        }
+        yield json.dumps(data, separators=(',', ':')).encode()
+
+
+@pytest.mark.parametrize('body', [
+    API_BODY,
+    b'{"timestamp": "x", "next_change_in": 1.0, "total_cycles": 4000000000, "number": 1}',
+    b'{"number": 2, "next_change_in": 5e-07, "total_cycles": 0}',
+    b'{"number": 2, "next_change_in": 1.5E+2, "total_cycles": 0}',
+])
+def test_parses_like_json(body):
+    assert parse(body) == (True, expected(body))
+
+
+def test_random_bodies_parse_like_json():
+    for body in random_bodies(10000):
+        assert parse(body) == (True, expected(body)), body
+
+
+@pytest.mark.parametrize('body', [
+    b'{ "number" : 9 , "next_change_in" : 0.5 , "total_cycles" : 3 }',
+    b'{\r\n\t"number":\t9,\r\n\t"next_change_in":\r\n 0.5,\n"total_cycles"  :3\n}\n',
+])
+def test_extra_whitespace(body):
+    assert parse(body) == (True, (9, 3, 500))
+
+
+def test_keys_inside_strings_are_ignored():
+    body = b'{"note": "\\"number\\": 3", "number": 9, "next_change_in": 0.5, "total_cycles": 3}'
+    assert parse(body) == (True, (9, 3, 500))
+
+
+def test_negative_values():
+    body = b'{"number": -3, "next_change_in": -0.2509, "total_cycles": -1}'
+    assert parse(body) == (True, (-3, -1, -250))
+
+
+@pytest.mark.parametrize('body, values', [
+    (b'{"number": 3, "total_cycles": 7}', (3, 7, 0)),
+    (b'{"next_change_in": 0.5}', (0, 0, 500)),
+    (b'{"number": 3, "next_change_in": null, "total_cycles": 7}', (3, 7, 0)),
+    (b'{"number": "3", "next_change_in": 0.5, "total_cycles": 7}', (0, 7, 500)),
+    (b'{"error": "Not found"}', (0, 0, 0)),
+    (b'', (0, 0, 0)),
+])
+def test_missing_fields(body, values):
+    # Fields that were found are stored even though the answer is incomplete
+    assert parse(body) == (False, values)
+
+
+def test_truncated_bodies():
+    # total_cycles is the last of the three fields in the body
+    last_value = API_BODY.index(b'"total_cycles":') + len(b'"total_cycles":')
+    for cut in range(len(API_BODY)):
+        complete, _ = parse(API_BODY[:cut])
+        assert complete == (cut > last_value), API_BODY[:cut]
+
+
+def test_parsing_does_not_grow_the_heap():
+    reading = NumberReading()
+    body = memoryview(bytearray(API_BODY))
+    tracemalloc.start()
+    try:
+        for _ in range(10000):
+            parse_number_response(body, reading)
+        before = tracemalloc.get_traced_memory()[0]
+        for _ in range(10000):
+            parse_number_response(body, reading)
+        growth = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+    assert growth <= 0
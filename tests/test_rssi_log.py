@@ -0,0 +1,137 @@
+"""
+Tests for the binary RSSI log (src/pico_scripts/lib/rssi_log.py) and its
+decoder (examples/rssi_log_decoder.py).
+"""
+
+import struct
+
+import pytest
+
+import rssi_log
+import rssi_log_decoder
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Drive the logger's tick count and wall clock by hand."""
+
+    class Clock:
+        ticks = 0
+        time = 1_700_000_000
+
+        def advance(self, ms):
+            self.ticks += ms
+            self.time += ms // 1000
+
+    clock = Clock()
+    monkeypatch.setattr(rssi_log, 'ticks_ms', lambda: clock.ticks)
+    monkeypatch.setattr(rssi_log.time, 'time', lambda: clock.time)
+    return clock
+
+
+def log_samples(logger, clock, samples):
+    """Add (milliseconds after the previous sample, rssi) pairs."""
+    for delay, rssi in samples:
+        clock.advance(delay)
+        logger.add(rssi)
+
+
+def test_round_trip(tmp_path, clock):
+    path = tmp_path / 'rssi.bin'
+    start_time = clock.time
+    logger = rssi_log.RssiLogger(str(path), page_size=12)
+    # Includes a pause longer than one record can hold and clamped values
+    log_samples(logger, clock, [(0, -40), (1500, -55), (200_000, -90), (250, -200), (250, 5)])
+    logger.close()
+
+    assert logger.write_count > 1
+    assert rssi_log.read_log(path.read_bytes()) == (start_time, [
+        (0.0, -40),
+        (1.5, -55),
+        (201.5, -90),
+        (201.75, -128),
+        (202.0, 0),
+    ])
+
+    logs = rssi_log_decoder.load_logs([str(path)])
+    summary = rssi_log_decoder.summarize(logs[0], gap_threshold=10.0)
+    assert summary['gaps'] == 1
+    assert summary['longest_gaps'][0]['seconds'] == 200.0
+
+
+def test_restart_appends_to_the_current_file(tmp_path, clock):
+    path = tmp_path / 'rssi.bin'
+    start_time = clock.time
+    logger = rssi_log.RssiLogger(str(path), backup_count=1)
+    log_samples(logger, clock, [(0, -50), (1000, -51)])
+    logger.close()
+
+    # Power comes back a minute later with the tick count reset
+    clock.advance(60_000)
+    clock.ticks = 0
+    logger = rssi_log.RssiLogger(str(path), backup_count=1)
+    log_samples(logger, clock, [(0, -60), (2000, -61)])
+    logger.close()
+
+    assert not (tmp_path / 'rssi.bin.1').exists()
+    assert rssi_log.read_log(path.read_bytes()) == (start_time, [
+        (0.0, -50),
+        (1.0, -51),
+        (61.0, -60),
+        (63.0, -61),
+    ])
+
+
+def test_restart_after_a_torn_write_starts_a_new_file(tmp_path, clock):
+    path = tmp_path / 'rssi.bin'
+    logger = rssi_log.RssiLogger(str(path), backup_count=1)
+    log_samples(logger, clock, [(0, -50), (1000, -51)])
+    logger.close()
+    with open(path, 'ab') as log_file:
+        log_file.write(b'\x10')
+
+    clock.advance(5000)
+    logger = rssi_log.RssiLogger(str(path), backup_count=1)
+    log_samples(logger, clock, [(0, -70)])
+    logger.close()
+
+    assert rssi_log.read_log((tmp_path / 'rssi.bin.1').read_bytes())[1] == [(0.0, -50), (1.0, -51)]
+    assert rssi_log.read_log(path.read_bytes()) == (clock.time, [(0.0, -70)])
+
+
+def test_rotates_only_at_the_size_limit(tmp_path, clock):
+    path = tmp_path / 'rssi.bin'
+    max_file_size = rssi_log.HEADER_SIZE + 10 * rssi_log.RECORD_SIZE
+    for _ in range(3):
+        logger = rssi_log.RssiLogger(str(path), max_file_size=max_file_size, backup_count=2)
+        log_samples(logger, clock, [(1000, -50)] * 3)
+        logger.close()
+
+    # The second run appends a restart marker and 3 records; the third
+    # finds no room for more and rotates
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['rssi.bin', 'rssi.bin.1']
+    assert (tmp_path / 'rssi.bin.1').stat().st_size == rssi_log.HEADER_SIZE + 8 * rssi_log.RECORD_SIZE
+    samples = [
+        sample
+        for name in ('rssi.bin.1', 'rssi.bin')
+        for sample in rssi_log.read_log((tmp_path / name).read_bytes())[1]
+    ]
+    assert len(samples) == 9
+
+
+def test_reads_version_1_files():
+    data = struct.pack(rssi_log.HEADER_FORMAT, rssi_log.MAGIC, 1, 1000)
+    data += struct.pack(rssi_log.RECORD_FORMAT, 0, -40)
+    data += struct.pack(rssi_log.RECORD_FORMAT, 500, -41)
+
+    assert rssi_log.read_log(data) == (1000, [(0.0, -40), (0.5, -41)])
+
+
+@pytest.mark.parametrize('data', [
+    b'RSSI',
+    struct.pack(rssi_log.HEADER_FORMAT, b'JUNK', 2, 0),
+    struct.pack(rssi_log.HEADER_FORMAT, rssi_log.MAGIC, 3, 0),
+])
+def test_rejects_other_files(data):
+    with pytest.raises(ValueError):
+        rssi_log.read_log(data)
@@ -0,0 +1,141 @@
+"""
+Tests for TimerBlinker (lib/led.py) and blink_with_signal() of
+04_wifi_signal_to_blink.py, with the stand-in machine module from
+tests/pico_stubs. Timer callbacks run when a test fires the timer.
+"""
+
+import machine
+import pytest
+from led import TimerBlinker
+
+
+def make_blinker():
+    pin = machine.Pin("LED", machine.Pin.OUT)
+    return TimerBlinker(pin, machine.Timer()), pin
+
+
+def test_blinker_toggles_the_led_every_half_interval():
+    blinker, pin = make_blinker()
+    blinker.set_interval(0.5)
+
+    assert blinker.timer.mode == machine.Timer.PERIODIC
+    assert blinker.timer.period == 250
+
+    blinker.timer.fire(6)
+    assert blinker.blink_count == 3
+    assert pin.on_count == 3
+    assert pin.value() == 0
+
+    blinker.timer.fire()
+    assert pin.value() == 1
+    assert blinker.blink_count == 3
+
+
+def test_stop_turns_the_led_off_and_stops_the_timer():
+    blinker, pin = make_blinker()
+    blinker.set_interval(0.2)
+    blinker.timer.fire(3)
+    assert pin.value() == 1
+
+    blinker.stop()
+    assert pin.value() == 0
+    assert not blinker.timer.running
+    assert blinker.interval is None
+
+    blinker.timer.fire(4)
+    assert pin.on_count == 2
+
+
+def test_rearming_keeps_or_changes_the_running_sequence():
+    blinker, pin = make_blinker()
+    blinker.set_interval(1.0)
+    blinker.timer.fire(3)
+
+    # The same interval does not restart the timer, so the blink goes on
+    blinker.set_interval(1.0)
+    assert blinker.timer.init_count == 1
+    assert pin.value() == 1
+
+    # A new interval re-arms the timer and continues from the LED state
+    blinker.set_interval(0.1)
+    assert blinker.timer.init_count == 2
+    assert blinker.timer.period == 50
+    blinker.timer.fire()
+    assert pin.value() == 0
+    assert blinker.blink_count == 2
+
+    # Starting again after stop() re-arms as well
+    blinker.stop()
+    blinker.set_interval(0.1)
+    assert blinker.timer.running
+    assert blinker.timer.init_count == 3
+
+
+class FakeWLAN:
+    def __init__(self, readings):
+        self.readings = readings
+
+    def status(self, param=None):
+        return self.readings[0]
+
+
+class FakeWiFi:
+    """WiFi whose signal and connection follow a script, one step per check."""
+
+    def __init__(self, steps):
+        self.steps = list(steps)
+        self.wlan = FakeWLAN(self.steps)
+        self.reconnects = 0
+
+    def isconnected(self):
+        return self.steps[0] is not None
+
+    def reconnect(self):
+        self.reconnects += 1
+
+    def advance(self):
+        self.steps.pop(0)
+        if not self.steps:
+            raise KeyboardInterrupt
+
+
+def run_blink_with_signal(module, monkeypatch, steps, fires_per_sleep=4):
+    wifi = FakeWiFi(steps)
+    intervals = []
+    timers_before = len(machine.timers)
+
+    def sleep(seconds):
+        timer = machine.timers[timers_before]
+        intervals.append(timer.period if timer.running else None)
+        timer.fire(fires_per_sleep)
+        wifi.advance()
+
+    monkeypatch.setattr(module.time, 'sleep', sleep)
+    module.blink_with_signal(wifi)
+    return wifi, intervals, machine.timers[timers_before]
+
+
+def test_blink_rate_follows_the_signal(signal_to_blink, monkeypatch):
+    wifi, periods, timer = run_blink_with_signal(
+        signal_to_blink, monkeypatch, [-45, -45, -75, -75, -90])
+
+    assert periods == [50, 50, 500, 500, 1000]
+    # Re-armed only when the level changed
+    assert timer.init_count == 3
+    # Stopped by Ctrl+C: timer off, LED dark
+    assert not timer.running
+    assert signal_to_blink.led.value() == 0
+
+
+def test_disconnect_flashes_and_reconnects(signal_to_blink, monkeypatch):
+    wifi, periods, timer = run_blink_with_signal(
+        signal_to_blink, monkeypatch, [-65, None, -65])
+
+    assert wifi.reconnects == 1
+    # Fair signal, fast flashing while disconnected, Fair again
+    assert periods == [250, 50, 250]
+
+
+@pytest.mark.parametrize('rssi, interval', [(-40, 0.1), (-60, 0.3), (-70, 0.5), (-80, 1.0), (-81, 2.0)])
+def test_rssi_to_blink_interval(signal_to_blink, rssi, interval):
+    assert signal_to_blink.rssi_to_blink_interval(rssi)[0] == interval